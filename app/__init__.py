@@ -3,9 +3,6 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_migrate import Migrate
 from flask_wtf.csrf import CSRFProtect
 from flask_limiter import Limiter
-import logging
-from logging.handlers import RotatingFileHandler
-import os
 
 
 
@@ -25,11 +22,25 @@ def create_app(config_name='development'):
     from config import config
     app.config.from_object(config[config_name])
 
+    # Request ids first (so every hook can log them); queued JSON-lines file
+    # logging outside debug/testing
+    from app.utils.log import init_logging
+    init_logging(app)
+
     # Initialize extensions
     db.init_app(app)
+    from app.utils.database import configure_sqlite
+    configure_sqlite(app, db)
+    from app.utils.instrumentation import init_instrumentation
+    init_instrumentation(app, db)
     migrate.init_app(app, db)
     csrf.init_app(app)
+    from app.utils.ratelimit import SQLiteStorage  # noqa: F401 (registers sqlite:// storage scheme)
     limiter.init_app(app)
+    from app.utils.metrics import init_metrics
+    init_metrics(app, limiter)
+    from app.utils.images import init_images
+    init_images(app)
 
     # Import models (for Flask-Migrate to detect them)
     from app.blueprints.landscaping import models as landscaping_models
@@ -61,18 +72,4 @@ def create_app(config_name='development'):
         db.session.rollback()
         return render_template('errors/500.html'), 500
 
-    # Logging setup for production
-    if not app.debug and not app.testing:
-        if not os.path.exists('logs'):
-            os.mkdir('logs')
-        file_handler = RotatingFileHandler('logs/powers-land.log',
-                                          maxBytes=10240, backupCount=10)
-        file_handler.setFormatter(logging.Formatter(
-            '%(asctime)s %(levelname)s: %(message)s [in %(pathname)s:%(lineno)d]'
-        ))
-        file_handler.setLevel(logging.INFO)
-        app.logger.addHandler(file_handler)
-        app.logger.setLevel(logging.INFO)
-        app.logger.info('powers-land startup')
-
     return app
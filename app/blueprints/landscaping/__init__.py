@@ -3,3 +3,6 @@ from flask import Blueprint
 landscaping_bp = Blueprint('landscaping', __name__, template_folder='templates')
 
 from app.blueprints.landscaping import routes
+from app.blueprints.landscaping.services import register_events
+
+landscaping_bp.record_once(lambda state: register_events())
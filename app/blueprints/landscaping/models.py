@@ -1,10 +1,20 @@
 from datetime import datetime, date
+from sqlalchemy import DDL, event
+from sqlalchemy.orm import validates
 from app import db
+from app.blueprints.landscaping.sizes import parse_size_range
 from app.models.base import Base
 
 class Plant(Base):
     """Plant database model for Texas native plants"""
     __tablename__ = 'plants'
+    __table_args__ = (
+        # Facet filters and grouped facet counts (plant browser sidebar)
+        db.Index('ix_plants_sun_water_type', 'sun_exposure', 'water_needs', 'plant_type'),
+        db.Index('ix_plants_water_needs', 'water_needs'),
+        db.Index('ix_plants_plant_type', 'plant_type'),
+        db.Index('ix_plants_flags', 'drought_tolerant', 'deer_resistant'),
+    )
 
     # Core identification
     id = db.Column(db.Integer, primary_key=True)
@@ -17,6 +27,13 @@ class Plant(Base):
     height_range = db.Column(db.String(50))
     spread_range = db.Column(db.String(50))
 
+    # height_range / spread_range parsed to inches (kept in sync on assignment,
+    # and after bulk UPDATEs by services.register_events)
+    height_min_in = db.Column(db.Float, index=True)
+    height_max_in = db.Column(db.Float, index=True)
+    spread_min_in = db.Column(db.Float, index=True)
+    spread_max_in = db.Column(db.Float, index=True)
+
     # Growing conditions
     sun_exposure = db.Column(db.String(50))
     water_needs = db.Column(db.String(50))
@@ -39,10 +56,62 @@ class Plant(Base):
     date_planted = db.Column(db.Date, nullable=True)
     location_in_yard = db.Column(db.String(100))
 
+    @validates('height_range', 'spread_range')
+    def _parse_size(self, key, value):
+        prefix = key.split('_')[0]
+        low, high = parse_size_range(value)
+        setattr(self, f'{prefix}_min_in', low)
+        setattr(self, f'{prefix}_max_in', high)
+        return value
+
     def __repr__(self):
         return f'<Plant {self.common_name}>'
 
 
+# Full-text search (SQLite FTS5, external content over plants). Triggers keep
+# the index in sync with every INSERT/UPDATE/DELETE, ORM or bulk.
+PLANTS_FTS_COLUMNS = (
+    'common_name', 'scientific_name', 'care_instructions', 'notes', 'wildlife_value', 'bloom_color'
+)
+
+PLANTS_FTS_DDL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS plants_fts USING fts5(
+        {', '.join(PLANTS_FTS_COLUMNS)},
+        content='plants', content_rowid='id',
+        tokenize='porter unicode61 remove_diacritics 2'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS plants_fts_ai AFTER INSERT ON plants BEGIN
+        INSERT INTO plants_fts(rowid, {', '.join(PLANTS_FTS_COLUMNS)})
+        VALUES (new.id, {', '.join('new.' + c for c in PLANTS_FTS_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS plants_fts_ad AFTER DELETE ON plants BEGIN
+        INSERT INTO plants_fts(plants_fts, rowid, {', '.join(PLANTS_FTS_COLUMNS)})
+        VALUES ('delete', old.id, {', '.join('old.' + c for c in PLANTS_FTS_COLUMNS)});
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS plants_fts_au AFTER UPDATE OF {', '.join(PLANTS_FTS_COLUMNS)} ON plants BEGIN
+        INSERT INTO plants_fts(plants_fts, rowid, {', '.join(PLANTS_FTS_COLUMNS)})
+        VALUES ('delete', old.id, {', '.join('old.' + c for c in PLANTS_FTS_COLUMNS)});
+        INSERT INTO plants_fts(rowid, {', '.join(PLANTS_FTS_COLUMNS)})
+        VALUES (new.id, {', '.join('new.' + c for c in PLANTS_FTS_COLUMNS)});
+    END
+    """,
+]
+
+for _statement in PLANTS_FTS_DDL:
+    event.listen(Plant.__table__, 'after_create', DDL(_statement).execute_if(dialect='sqlite'))
+event.listen(
+    Plant.__table__, 'before_drop',
+    DDL('DROP TABLE IF EXISTS plants_fts').execute_if(dialect='sqlite')
+)
+
+
 class PlantResource(Base):
     """Plant resources - websites, guides, nurseries"""
     __tablename__ = 'plant_resources'
@@ -61,6 +130,10 @@ class PlantResource(Base):
 class CareLog(Base):
     """Care log for tracking plant maintenance"""
     __tablename__ = 'care_logs'
+    __table_args__ = (
+        # A plant's timeline, newest first, keyset-paginated on (log_date, id)
+        db.Index('ix_care_logs_plant_date', 'plant_id', 'log_date', 'id'),
+    )
 
     id = db.Column(db.Integer, primary_key=True)
     plant_id = db.Column(db.Integer, db.ForeignKey('plants.id'), nullable=False)
@@ -68,7 +141,48 @@ class CareLog(Base):
     activity_type = db.Column(db.String(50))
     notes = db.Column(db.Text)
 
-    plant = db.relationship('Plant', backref=db.backref('care_logs', lazy=True))
+    # write_only: never load a plant's whole history; query it page by page.
+    # Deleting a plant deletes its logs (landscaping.services.register_events)
+    plant = db.relationship('Plant', backref=db.backref('care_logs', lazy='write_only', passive_deletes=True))
+
+    def to_dict(self):
+        return {
+            'id': self.id,
+            'plant_id': self.plant_id,
+            'log_date': self.log_date.isoformat(),
+            'activity_type': self.activity_type,
+            'notes': self.notes,
+        }
 
     def __repr__(self):
         return f'<CareLog {self.activity_type} on {self.log_date}>'
+
+
+class PlantCareSummary(db.Model):
+    """Per-plant care log aggregates, refreshed whenever a plant's logs change"""
+    __tablename__ = 'plant_care_summaries'
+
+    plant_id = db.Column(db.Integer, db.ForeignKey('plants.id'), primary_key=True)
+    log_count = db.Column(db.Integer, nullable=False, default=0)
+    first_log_date = db.Column(db.Date)
+    last_log_date = db.Column(db.Date)
+    last_watered = db.Column(db.Date)
+    last_pruned = db.Column(db.Date)
+    last_fertilized = db.Column(db.Date)
+
+    def to_dict(self):
+        def iso(value):
+            return value.isoformat() if value else None
+
+        return {
+            'plant_id': self.plant_id,
+            'log_count': self.log_count,
+            'first_log_date': iso(self.first_log_date),
+            'last_log_date': iso(self.last_log_date),
+            'last_watered': iso(self.last_watered),
+            'last_pruned': iso(self.last_pruned),
+            'last_fertilized': iso(self.last_fertilized),
+        }
+
+    def __repr__(self):
+        return f'<PlantCareSummary plant={self.plant_id} logs={self.log_count}>'
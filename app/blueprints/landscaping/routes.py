@@ -1,5 +1,11 @@
-from flask import render_template
+from flask import abort, current_app, jsonify, render_template, request
+from app import db
 from app.blueprints.landscaping import landscaping_bp
+from app.blueprints.landscaping.models import Plant
+from app.blueprints.landscaping.services import (
+    filter_plants_by_criteria, facet_counts, normalize_criteria, FACET_COLUMNS, FLAG_COLUMNS, RANGE_FILTERS,
+    care_log_timeline, care_summary
+)
 
 @landscaping_bp.route('/')
 def index():
@@ -11,14 +17,83 @@ def resources():
     """Favorite plant resources"""
     return render_template('landscaping/resources.html')
 
-# Future routes (ready to activate):
-# @landscaping_bp.route('/plants')
-# def plants():
-#     """Interactive plant database with filtering"""
-#     from app.blueprints.landscaping.models import Plant
-#     plants = Plant.query.all()
-#     return render_template('landscaping/plants.html', plants=plants)
+@landscaping_bp.route('/plants')
+def plants():
+    """Plant database with full-text search and facet filters"""
+    query = request.args.get('q', '').strip()
+    page = request.args.get('page', 1, type=int)
+    # Size bounds are entered in feet; the service works in inches
+    sizes_ft = {name: request.args.get(name, type=float) for name in RANGE_FILTERS}
+    criteria = normalize_criteria({
+        **{facet: request.args.getlist(facet) for facet in FACET_COLUMNS},
+        **{flag: request.args.get(flag) == '1' for flag in FLAG_COLUMNS},
+        **{name: feet * 12 for name, feet in sizes_ft.items() if feet is not None and feet >= 0},
+    })
+
+    results = filter_plants_by_criteria(
+        query=query, page=page, per_page=current_app.config['PLANTS_PER_PAGE'], **criteria
+    )
+    # Current search + filters as URL args (for pagination links)
+    filter_args = {'q': query or None}
+    filter_args.update({facet: list(criteria[facet]) for facet in FACET_COLUMNS if facet in criteria})
+    filter_args.update({flag: '1' for flag in FLAG_COLUMNS if flag in criteria})
+    filter_args.update({name: f'{sizes_ft[name]:g}' for name in RANGE_FILTERS if name in criteria})
+
+    return render_template(
+        'landscaping/plants.html',
+        plants=results,
+        query=query,
+        criteria=criteria,
+        facets=facet_counts(query=query, **criteria),
+        sizes_ft=sizes_ft,
+        filter_args=filter_args
+    )
+
+@landscaping_bp.route('/plants/<int:plant_id>/care')
+def care_timeline(plant_id):
+    """A plant's care history, newest first, one keyset page at a time"""
+    plant = db.get_or_404(Plant, plant_id)
+    cursor = request.args.get('cursor')
+    try:
+        logs, next_cursor = care_log_timeline(
+            plant_id, cursor=cursor, limit=current_app.config['CARE_LOGS_PER_PAGE']
+        )
+    except ValueError:
+        abort(400)
 
+    return render_template(
+        'landscaping/care_timeline.html',
+        plant=plant,
+        logs=logs,
+        summary=care_summary(plant_id),
+        cursor=cursor,
+        next_cursor=next_cursor
+    )
+
+@landscaping_bp.route('/api/plants/<int:plant_id>/care-logs')
+def care_logs_api(plant_id):
+    """
+    JSON care log timeline. Pass the returned next_cursor as ?cursor= to
+    fetch older logs; ?limit= sets the page size (capped).
+    """
+    db.get_or_404(Plant, plant_id)
+    limit = request.args.get('limit', current_app.config['CARE_LOGS_PER_PAGE'], type=int)
+    limit = max(1, min(limit, current_app.config['CARE_LOGS_MAX_PER_PAGE']))
+    try:
+        logs, next_cursor = care_log_timeline(plant_id, cursor=request.args.get('cursor'), limit=limit)
+    except ValueError:
+        return jsonify({'success': False, 'error': 'Invalid cursor'}), 400
+
+    summary = care_summary(plant_id)
+    return jsonify({
+        'success': True,
+        'plant_id': plant_id,
+        'summary': summary.to_dict() if summary else None,
+        'logs': [log.to_dict() for log in logs],
+        'next_cursor': next_cursor
+    })
+
+# Future routes (ready to activate):
 # @landscaping_bp.route('/plants/<int:plant_id>')
 # def plant_detail(plant_id):
 #     """Individual plant detail page"""
@@ -1,16 +1,589 @@
-# Future: Service layer for plant filtering, search logic
-# This file is a placeholder for future functionality
+"""Landscaping service layer: plant search and filtering, care log timelines"""
+import operator
+import re
+import threading
+import time
+from datetime import date
+from flask import current_app
+from sqlalchemy import and_, case, event, func, inspect, literal, literal_column, or_, table, column, union_all
+from sqlalchemy.orm import Session, object_session
+from sqlalchemy.sql.elements import BindParameter, ClauseElement
+from app import db
+from app.blueprints.landscaping.models import CareLog, Plant, PlantCareSummary, PLANTS_FTS_COLUMNS
+from app.blueprints.landscaping.sizes import parse_size_range
 
-def filter_plants_by_criteria(**kwargs):
+# BM25 column weights, in PLANTS_FTS_COLUMNS order: name matches matter
+# most, then wildlife/bloom traits, then free-text care notes
+PLANTS_FTS_WEIGHTS = (10.0, 5.0, 1.0, 1.0, 2.0, 2.0)
+
+plants_fts = table('plants_fts', column('rowid'))
+
+_SEARCH_TERM_RE = re.compile(r'\w+', re.UNICODE)
+
+# Multi-value facets (match any selected value) and yes/no flags
+FACET_COLUMNS = ('sun_exposure', 'water_needs', 'plant_type')
+FLAG_COLUMNS = ('drought_tolerant', 'deer_resistant')
+
+# Size bounds in inches: the plant's whole parsed range must fall inside them
+RANGE_FILTERS = {
+    'min_height': ('height_min_in', operator.ge),
+    'max_height': ('height_max_in', operator.le),
+    'min_spread': ('spread_min_in', operator.ge),
+    'max_spread': ('spread_max_in', operator.le),
+}
+
+
+def fts_query(query):
+    """
+    Turn free text into a safe FTS5 MATCH expression.
+
+    Every word is quoted (so FTS operators and punctuation in user input
+    are inert) and the last word is a prefix match for search-as-you-type:
+    'turks ca' -> '"turks" "ca"*'
+
+    Returns:
+        MATCH string, or None if the query has no searchable words
+    """
+    terms = _SEARCH_TERM_RE.findall(query or '')
+    if not terms:
+        return None
+    quoted = [f'"{term}"' for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def _use_fts():
+    return db.session.get_bind().dialect.name == 'sqlite'
+
+
+def _text_condition(query):
+    """WHERE condition restricting plants to text matches (None if no query)"""
+    match = fts_query(query)
+    if match is None:
+        return None
+    if _use_fts():
+        matching_ids = db.select(plants_fts.c.rowid).where(literal_column('plants_fts').op('MATCH')(match))
+        return Plant.id.in_(matching_ids)
+
+    conditions = []
+    for term in _SEARCH_TERM_RE.findall(query):
+        pattern = f'%{term}%'
+        conditions.append(or_(*(getattr(Plant, name).ilike(pattern) for name in PLANTS_FTS_COLUMNS)))
+    return db.and_(*conditions)
+
+
+def normalize_criteria(criteria):
+    """
+    Keep only known filters, as {facet: sorted tuple of values},
+    {flag: True} and {range filter: float inches}, so equivalent filters
+    share a cache key.
+
+    Raises:
+        ValueError: If a range filter isn't a number
+    """
+    normalized = {}
+    for facet in FACET_COLUMNS:
+        values = criteria.get(facet)
+        if isinstance(values, str):
+            values = [values]
+        values = tuple(sorted({v for v in values or () if v}))
+        if values:
+            normalized[facet] = values
+    for flag in FLAG_COLUMNS:
+        if criteria.get(flag):
+            normalized[flag] = True
+    for name in RANGE_FILTERS:
+        value = criteria.get(name)
+        if value is not None and value != '':
+            normalized[name] = float(value)
+    return normalized
+
+
+def _criteria_conditions(criteria, exclude=None):
+    conditions = []
+    for name, value in criteria.items():
+        if name == exclude:
+            continue
+        if name in RANGE_FILTERS:
+            column_name, compare = RANGE_FILTERS[name]
+            conditions.append(compare(getattr(Plant, column_name), value))
+            continue
+        column_ = getattr(Plant, name)
+        conditions.append(column_.is_(True) if name in FLAG_COLUMNS else column_.in_(value))
+    return conditions
+
+
+def filter_plants_by_criteria(query=None, page=1, per_page=20, **criteria):
+    """
+    Filter plants by facets, optionally within a text search.
+
+    Args:
+        query: Free-text search (ranked by BM25 when given)
+        page: 1-based page number
+        per_page: Results per page
+        **criteria: sun_exposure / water_needs / plant_type (a value or a
+            list of values, any of which may match), drought_tolerant /
+            deer_resistant (truthy to require) and min_height / max_height /
+            min_spread / max_spread (inches; plants with an unparsed size
+            are excluded by these)
+
+    Returns:
+        Flask-SQLAlchemy Pagination of Plant objects
+    """
+    criteria = normalize_criteria(criteria)
+    stmt = db.select(Plant).where(*_criteria_conditions(criteria))
+
+    match = fts_query(query)
+    if match is not None and _use_fts():
+        rank = func.bm25(literal_column('plants_fts'), *PLANTS_FTS_WEIGHTS)
+        stmt = (
+            stmt.join(plants_fts, plants_fts.c.rowid == Plant.id)
+            .where(literal_column('plants_fts').op('MATCH')(match))
+            .order_by(rank, Plant.common_name)
+        )
+    else:
+        text_condition = _text_condition(query)
+        if text_condition is not None:
+            stmt = stmt.where(text_condition)
+        stmt = stmt.order_by(Plant.common_name, Plant.id)
+
+    return db.paginate(stmt, page=page, per_page=per_page, error_out=False)
+
+
+def search_plants(query, page=1, per_page=20):
+    """
+    Search plants by name or characteristics.
+
+    On SQLite this uses the plants_fts index ranked by BM25 (weighted
+    toward name matches); other databases fall back to a LIKE scan. An
+    empty query lists every plant by common name.
+
+    Returns:
+        Flask-SQLAlchemy Pagination of Plant objects
+    """
+    return filter_plants_by_criteria(query=query, page=page, per_page=per_page)
+
+
+# ==============================================================================
+# PLANT SIZES (parsed columns for bulk UPDATEs)
+# ==============================================================================
+
+PLANT_SIZE_ATTRIBUTES = ('height_min_in', 'height_max_in', 'spread_min_in', 'spread_max_in')
+
+
+def reparse_plant_sizes(session, plant_ids):
+    """
+    Recompute the parsed size columns of plants from their stored
+    height_range / spread_range (what Plant's @validates does on assignment).
+    """
+    rows = session.execute(
+        db.select(Plant.id, Plant.height_range, Plant.spread_range).where(Plant.id.in_(plant_ids))
+    )
+    params = []
+    for plant_id, height_range, spread_range in rows:
+        height_min, height_max = parse_size_range(height_range)
+        spread_min, spread_max = parse_size_range(spread_range)
+        params.append({
+            'plant_id': plant_id, 'height_min': height_min, 'height_max': height_max,
+            'spread_min': spread_min, 'spread_max': spread_max,
+        })
+    if not params:
+        return
+
+    plants = Plant.__table__
+    session.connection().execute(
+        plants.update().where(plants.c.id == db.bindparam('plant_id')).values(
+            height_min_in=db.bindparam('height_min'), height_max_in=db.bindparam('height_max'),
+            spread_min_in=db.bindparam('spread_min'), spread_max_in=db.bindparam('spread_max'),
+        ),
+        params
+    )
+    # Loaded plants would otherwise keep their old parsed values
+    plant_ids = {row['plant_id'] for row in params}
+    for obj in list(session.identity_map.values()):
+        if isinstance(obj, Plant) and obj.id in plant_ids:
+            session.expire(obj, PLANT_SIZE_ATTRIBUTES)
+
+
+def _reparse_sizes_on_bulk_update(orm_execute_state):
+    """
+    Bulk UPDATEs of Plant skip @validates, so the parsed size columns would
+    keep their old values: re-parse the rows the statement touched.
+    """
+    if not orm_execute_state.is_update:
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ is not Plant:
+        return None
+
+    plant_ids = _bulk_plant_ids(orm_execute_state, Plant)
+    result = orm_execute_state.invoke_statement()
+    if plant_ids:
+        reparse_plant_sizes(orm_execute_state.session, plant_ids)
+    return result
+
+
+# ==============================================================================
+# FACET COUNTS (cached until plant changes commit)
+# ==============================================================================
+
+class FacetCache:
     """
-    Future function to filter plants by various criteria
-    (sun exposure, water needs, plant type, etc.)
+    Facet counts keyed by (query, criteria), invalidated by a generation
+    counter that committed ORM writes to Plant bump. Other workers' writes
+    (and raw SQL) aren't seen here: their counts can be stale for up to
+    FACET_CACHE_TTL_SECONDS.
     """
-    pass
+
+    def __init__(self, max_entries=256):
+        self.max_entries = max_entries
+        self.generation = 0
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def invalidate(self):
+        with self._lock:
+            self.generation += 1
+            self._entries.clear()
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        generation, expires, value = entry
+        if generation != self.generation or time.monotonic() > expires:
+            return None
+        return value
+
+    def set(self, key, value, ttl, generation):
+        """Store value computed at `generation` (dropped if plants changed since)"""
+        with self._lock:
+            if generation != self.generation:
+                return
+            if len(self._entries) >= self.max_entries:
+                self._entries.clear()
+            self._entries[key] = (generation, time.monotonic() + ttl, value)
+
+
+facet_cache = FacetCache()
+
+
+def _mark_plants_changed(session):
+    session.info['plants_changed'] = True
+
+
+def _plant_written(mapper, connection, target):
+    _mark_plants_changed(object_session(target))
+
+
+def _mark_plants_changed_on_bulk_write(orm_execute_state):
+    """ORM-enabled bulk INSERT/UPDATE/DELETE skip the mapper events above"""
+    if orm_execute_state.is_select:
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ is Plant:
+        _mark_plants_changed(orm_execute_state.session)
+
+
+def _invalidate_facets_after_commit(session):
+    """Drop cached counts once plant changes are visible to other sessions"""
+    if session.info.pop('plants_changed', False):
+        facet_cache.invalidate()
+
+
+def _discard_plant_changes(session, transaction):
+    """A rolled-back transaction's plant writes never happened"""
+    if transaction.parent is None:
+        session.info.pop('plants_changed', None)
+
+
+def _compute_facet_counts(query, criteria):
+    text_condition = _text_condition(query)
+    base = [text_condition] if text_condition is not None else []
+
+    # Each facet is counted under every filter except its own, so the
+    # sidebar shows what selecting another value would add
+    branches = []
+    for facet in FACET_COLUMNS:
+        column_ = getattr(Plant, facet)
+        branches.append(
+            db.select(literal(facet).label('facet'), column_.label('value'), func.count().label('n'))
+            .where(column_.isnot(None), column_ != '', *base, *_criteria_conditions(criteria, exclude=facet))
+            .group_by(column_)
+        )
+    for flag in FLAG_COLUMNS:
+        branches.append(
+            db.select(literal(flag).label('facet'), literal('yes').label('value'), func.count().label('n'))
+            .where(getattr(Plant, flag).is_(True), *base, *_criteria_conditions(criteria, exclude=flag))
+        )
+
+    counts = {facet: {} for facet in FACET_COLUMNS}
+    counts.update({flag: 0 for flag in FLAG_COLUMNS})
+    for facet, value, n in db.session.execute(union_all(*branches)):
+        if facet in FLAG_COLUMNS:
+            counts[facet] = n
+        else:
+            counts[facet][value] = n
+    for facet in FACET_COLUMNS:
+        counts[facet] = dict(sorted(counts[facet].items()))
+    return counts
+
+
+def facet_counts(query=None, **criteria):
+    """
+    Plant counts per facet value under the current search and filters.
+
+    One UNION ALL statement computes every facet; results are cached until
+    a plant change is committed (or FACET_CACHE_TTL_SECONDS passes).
+
+    Returns:
+        {'sun_exposure': {value: count}, 'water_needs': {...},
+         'plant_type': {...}, 'drought_tolerant': count, 'deer_resistant': count}
+    """
+    criteria = normalize_criteria(criteria)
+    key = (fts_query(query), tuple(sorted(criteria.items())))
+    ttl = current_app.config.get('FACET_CACHE_TTL_SECONDS', 60)
+
+    # Counts that include this session's uncommitted plant writes aren't cached
+    dirty = db.session.info.get('plants_changed', False)
+    counts = None if dirty else facet_cache.get(key)
+    if counts is None:
+        generation = facet_cache.generation
+        counts = _compute_facet_counts(query, criteria)
+        if not dirty:
+            facet_cache.set(key, counts, ttl, generation)
+    return counts
+
+
+# ==============================================================================
+# CARE LOG TIMELINE (keyset pagination + per-plant summaries)
+# ==============================================================================
+
+# Summary column -> activity_type prefix (case-insensitive: "Watering", "watered")
+CARE_SUMMARY_ACTIVITIES = {
+    'last_watered': 'water',
+    'last_pruned': 'prun',
+    'last_fertilized': 'fertiliz',
+}
+
+
+def encode_cursor(log):
+    """Opaque position of a care log in its plant's timeline"""
+    return f'{log.log_date.isoformat()}.{log.id}'
+
+
+def decode_cursor(cursor):
+    """
+    Parse a cursor from encode_cursor().
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    log_date, _, log_id = cursor.partition('.')
+    return date.fromisoformat(log_date), int(log_id)
+
+
+def care_log_timeline(plant_id, cursor=None, limit=50):
+    """
+    One page of a plant's care logs, newest first.
+
+    Pages by (log_date, id) rather than OFFSET, so every page is a range
+    scan of ix_care_logs_plant_date no matter how far back it is.
+
+    Args:
+        plant_id: Plant to list logs for
+        cursor: next_cursor from the previous page (None for the newest)
+        limit: Logs per page
+
+    Returns:
+        (logs, next_cursor) - next_cursor is None on the last page
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    stmt = db.select(CareLog).where(CareLog.plant_id == plant_id)
+    if cursor:
+        log_date, log_id = decode_cursor(cursor)
+        stmt = stmt.where(or_(
+            CareLog.log_date < log_date,
+            and_(CareLog.log_date == log_date, CareLog.id < log_id)
+        ))
+    stmt = stmt.order_by(CareLog.log_date.desc(), CareLog.id.desc()).limit(limit + 1)
+
+    logs = db.session.scalars(stmt).all()
+    if len(logs) > limit:
+        return logs[:limit], encode_cursor(logs[limit - 1])
+    return logs, None
+
+
+def care_summary(plant_id):
+    """PlantCareSummary for a plant, or None if it has no care logs"""
+    return db.session.get(PlantCareSummary, plant_id)
+
+
+def refresh_care_summaries(connection, plant_ids=None):
+    """
+    Recompute plant_care_summaries rows from care_logs.
+
+    Args:
+        connection: Connection to run on (the flushing session's, from events)
+        plant_ids: Plants to refresh (None rebuilds every summary)
+    """
+    summaries = PlantCareSummary.__table__
+    activity = func.lower(CareLog.activity_type)
+    aggregates = db.select(
+        CareLog.plant_id,
+        func.count(),
+        func.min(CareLog.log_date),
+        func.max(CareLog.log_date),
+        *(
+            func.max(case((activity.like(f'{prefix}%'), CareLog.log_date)))
+            for prefix in CARE_SUMMARY_ACTIVITIES.values()
+        )
+    ).group_by(CareLog.plant_id)
+
+    delete = summaries.delete()
+    if plant_ids is not None:
+        plant_ids = list(plant_ids)
+        delete = delete.where(summaries.c.plant_id.in_(plant_ids))
+        aggregates = aggregates.where(CareLog.plant_id.in_(plant_ids))
+
+    connection.execute(delete)
+    connection.execute(summaries.insert().from_select(
+        ['plant_id', 'log_count', 'first_log_date', 'last_log_date', *CARE_SUMMARY_ACTIVITIES],
+        aggregates
+    ))
+
+
+def _delete_plant_care(connection, plant_ids):
+    """Delete plants' care logs and summaries (care_logs has no FK cascade)"""
+    summaries = PlantCareSummary.__table__
+    connection.execute(db.delete(CareLog.__table__).where(CareLog.plant_id.in_(plant_ids)))
+    connection.execute(summaries.delete().where(summaries.c.plant_id.in_(plant_ids)))
+
+
+def _pending_summary_ids(session):
+    return session.info.setdefault('care_summary_plant_ids', set())
+
+
+def _care_log_changed(mapper, connection, target):
+    """Note the plant(s) whose summary this CareLog write changes"""
+    plant_ids = _pending_summary_ids(object_session(target))
+    plant_ids.add(target.plant_id)
+    # A log moved to another plant changes the old plant's summary too
+    plant_ids.update(inspect(target).attrs.plant_id.history.deleted or ())
+
+
+def _plant_deleted(mapper, connection, target):
+    _delete_plant_care(connection, [target.id])
+
+
+def _refresh_care_summaries_after_flush(session, flush_context):
+    """One refresh per flush for the plants whose care logs changed"""
+    plant_ids = session.info.pop('care_summary_plant_ids', None)
+    if plant_ids:
+        plant_ids.discard(None)
+        if plant_ids:
+            refresh_care_summaries(session.connection(), plant_ids)
+
+
+def _statement_values(statement, key):
+    """
+    Values a DML statement's .values() gives column `key` (empty if it
+    doesn't set it); None if one is a SQL expression, known only once it runs.
+    """
+    # DELETE has none of these; an INSERT of several rows uses _multi_values
+    rows = [getattr(statement, '_values', None) or {}]
+    rows.append(dict(getattr(statement, '_ordered_values', None) or ()))
+    for multi_values in getattr(statement, '_multi_values', None) or ():
+        rows.extend(multi_values)
+
+    values = set()
+    for row in rows:
+        for column_, value in row.items():
+            if getattr(column_, 'key', column_) != key:
+                continue
+            if isinstance(value, BindParameter):
+                value = value.value
+            elif isinstance(value, ClauseElement):
+                return None
+            values.add(value)
+    return values
+
+
+def _bulk_plant_ids(orm_execute_state, model):
+    """
+    plant_ids a bulk INSERT/UPDATE/DELETE on `model` (CareLog or Plant)
+    touches, read before it runs; None if they can't be worked out.
+    """
+    statement = orm_execute_state.statement
+    key = 'plant_id' if model is CareLog else 'id'
+    parameters = orm_execute_state.parameters
+    rows = parameters if isinstance(parameters, list) else [parameters or {}]
+
+    # Set through .values() as well as (or instead of) execution parameters
+    set_values = _statement_values(statement, key)
+    if set_values is None:
+        return None
+
+    if statement.is_insert:
+        plant_ids = set_values or {row.get(key) for row in rows}
+        return None if None in plant_ids else plant_ids
+
+    # New plant_ids set by an UPDATE, plus the rows' current ones
+    plant_ids = set_values | {row[key] for row in rows if key in row}
+    current = db.select(getattr(model, key))
+    if statement.whereclause is not None:
+        current = current.where(statement.whereclause)
+    elif any('id' in row for row in rows):
+        # Bulk UPDATE by primary key: update(CareLog), [{'id': ..., ...}]
+        current = current.where(model.id.in_([row['id'] for row in rows if 'id' in row]))
+    plant_ids.update(orm_execute_state.session.scalars(current))
+    return plant_ids
+
+
+def _sync_care_on_bulk_write(orm_execute_state):
+    """
+    Bulk CareLog / Plant statements skip the mapper events: refresh the
+    summaries of the plants they touch (all of them if that's unknowable),
+    and remove care data for bulk-deleted plants.
+    """
+    if orm_execute_state.is_select:
+        return None
+    mapper = orm_execute_state.bind_mapper
+    if mapper is None or mapper.class_ not in (CareLog, Plant):
+        return None
+
+    if mapper.class_ is Plant:
+        if orm_execute_state.statement.is_delete:
+            plant_ids = _bulk_plant_ids(orm_execute_state, Plant)
+            if plant_ids:
+                _delete_plant_care(orm_execute_state.session.connection(), plant_ids)
+        return None
+
+    plant_ids = _bulk_plant_ids(orm_execute_state, CareLog)
+    result = orm_execute_state.invoke_statement()
+    if plant_ids is None or plant_ids:
+        refresh_care_summaries(orm_execute_state.session.connection(), plant_ids)
+    return result
 
 
-def search_plants(query):
+def register_events():
     """
-    Future function to search plants by name or characteristics
+    Keep plant_care_summaries in step with care_logs, drop a plant's care
+    data when it's deleted, re-parse sizes after bulk plant UPDATEs, and
+    invalidate facet counts when plant changes commit. Called once when the
+    blueprint is registered.
     """
-    pass
+    if event.contains(CareLog, 'after_insert', _care_log_changed):
+        return
+    for event_name in ('after_insert', 'after_update', 'after_delete'):
+        event.listen(CareLog, event_name, _care_log_changed)
+        event.listen(Plant, event_name, _plant_written)
+    event.listen(Plant, 'before_delete', _plant_deleted)
+    event.listen(Session, 'after_flush', _refresh_care_summaries_after_flush)
+    event.listen(Session, 'do_orm_execute', _sync_care_on_bulk_write)
+    event.listen(Session, 'do_orm_execute', _reparse_sizes_on_bulk_update)
+    event.listen(Session, 'do_orm_execute', _mark_plants_changed_on_bulk_write)
+    event.listen(Session, 'after_commit', _invalidate_facets_after_commit)
+    event.listen(Session, 'after_transaction_end', _discard_plant_changes)
@@ -0,0 +1,51 @@
+"""Parse free-text plant sizes ("2-3 ft", "18 in", "1 to 2 feet") into inches"""
+import re
+
+# Inches per unit; a bare number with no unit anywhere in the string is feet
+UNIT_INCHES = {
+    'in': 1.0, 'inch': 1.0, 'inches': 1.0, '"': 1.0, "''": 1.0,
+    'ft': 12.0, 'foot': 12.0, 'feet': 12.0, "'": 12.0,
+    'cm': 1 / 2.54, 'm': 100 / 2.54,
+}
+DEFAULT_UNIT = 'ft'
+
+# A number followed by an optional unit: 2, 1.5, 18in, 3', 6"
+_MEASURE_RE = re.compile(
+    r"""(\d+(?:\.\d+)?)\s*(inches|inch|in\b|''|"|feet|foot|ft\b|'|cm\b|m\b)?""",
+    re.IGNORECASE
+)
+_UP_TO_RE = re.compile(r'\b(up to|under|less than|below)\b|<', re.IGNORECASE)
+
+
+def parse_size_range(text):
+    """
+    Parse a height or spread string into a (min, max) range in inches.
+
+    Tolerant of the ways sizes get written: '2-3 ft', '2–3 feet', '18 in',
+    '12-18"', "3'", '1 ft - 18 in', '1 to 2 ft', 'up to 4 ft'. A unit
+    applies to the unitless numbers before it ('2-3 ft' is 24-36 in).
+    Only the first two numbers are used.
+
+    Args:
+        text: Free-text size, e.g. Plant.height_range
+
+    Returns:
+        (min_inches, max_inches) as floats, or (None, None) if the string
+        has no number in it
+    """
+    if not text:
+        return None, None
+
+    measures = [(float(number), (unit or '').lower()) for number, unit in _MEASURE_RE.findall(text)][:2]
+    if not measures:
+        return None, None
+
+    # '2-3 ft': the trailing unit covers the leading bare number too
+    units = [unit for _, unit in measures]
+    fallback = next((unit for unit in reversed(units) if unit), DEFAULT_UNIT)
+    values = [number * UNIT_INCHES[unit or fallback] for number, unit in measures]
+
+    low, high = min(values), max(values)
+    if len(values) == 1 and _UP_TO_RE.search(text):
+        low = 0.0
+    return round(low, 1), round(high, 1)
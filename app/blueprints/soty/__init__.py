@@ -2,4 +2,4 @@ from flask import Blueprint
 
 soty_bp = Blueprint('soty', __name__, template_folder='templates')
 
-from app.blueprints.soty import routes
+from app.blueprints.soty import routes, commands
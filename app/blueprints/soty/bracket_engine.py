@@ -0,0 +1,302 @@
+"""
+Pure-Python single-elimination bracket engine for Song of the Year
+
+No database access: works on compact __slots__ records so brackets can be
+seeded, paired and advanced in memory (and unit-tested or simulated at
+scale). SOTYTournamentService persists the results.
+
+Bracket rules:
+- Seeds are assigned by popularity (LOWER = better seed), then insertion order
+- Bracket size is the next power of 2; the best seeds get byes into Round 2
+- Round 1 pairs consecutive seeds among the non-bye songs
+- Round 2 lists byes (best to worst) followed by Round 1 winners (by position)
+- Later rounds pair winners of neighboring positions (0+1, 2+3, ...)
+- Every round avoids same-submitter matchups by swapping with nearby pairs
+- A tied matchup goes to the higher seed (LOWER seed number)
+"""
+import math
+import random
+
+# Furthest partner pair (in positions) a song may be swapped to when
+# removing same-submitter matchups
+DEFAULT_MAX_SWAP_DISTANCE = 4
+
+
+class SongRecord:
+    """Bracket entrant"""
+    __slots__ = ('id', 'submitter_id', 'popularity', 'order_key', 'seed')
+
+    def __init__(self, id, submitter_id, popularity=None, order_key=0, seed=None):
+        self.id = id
+        self.submitter_id = submitter_id
+        self.popularity = popularity
+        self.order_key = order_key
+        self.seed = seed
+
+    def __repr__(self):
+        return f'<SongRecord {self.id} seed={self.seed}>'
+
+
+class MatchupRecord:
+    """Pairing of two entrants at a position within a round"""
+    __slots__ = ('position', 'song1', 'song2', 'winner')
+
+    def __init__(self, position, song1, song2, winner=None):
+        self.position = position
+        self.song1 = song1
+        self.song2 = song2
+        self.winner = winner
+
+    def __repr__(self):
+        return f'<MatchupRecord P{self.position}: {self.song1!r} vs {self.song2!r}>'
+
+
+# ==============================================================================
+# BRACKET SHAPE
+# ==============================================================================
+
+def bracket_size(song_count):
+    """Next power of 2 at or above song_count"""
+    if song_count < 2:
+        return song_count
+    return 2 ** math.ceil(math.log2(song_count))
+
+
+def num_byes(song_count):
+    """Number of top seeds that skip Round 1"""
+    return bracket_size(song_count) - song_count
+
+
+def num_rounds(song_count):
+    """Rounds needed for a single-elimination bracket"""
+    if song_count < 2:
+        return 0
+    return math.ceil(math.log2(song_count))
+
+
+def round_name(round_num, total_rounds):
+    """Generate human-readable round names"""
+    rounds_from_end = total_rounds - round_num
+
+    if rounds_from_end == 0:
+        return "Finals"
+    elif rounds_from_end == 1:
+        return "Semifinals"
+    elif rounds_from_end == 2:
+        return "Quarterfinals"
+    else:
+        # Calculate participants in this round
+        participants = 2 ** (total_rounds - round_num + 1)
+        return f"Round of {participants}"
+
+
+# ==============================================================================
+# SEEDING AND PAIRING
+# ==============================================================================
+
+def seed(songs):
+    """
+    Assign seeds by popularity (NULL popularity counts as 100, the worst).
+
+    Returns:
+        New list of the same records ordered best seed first
+    """
+    seeded = sorted(
+        songs,
+        key=lambda s: (100 if s.popularity is None else s.popularity, s.order_key)
+    )
+    for idx, song in enumerate(seeded):
+        song.seed = idx + 1
+    return seeded
+
+
+def pair_consecutive(songs):
+    """Pair positions 0+1, 2+3, ... (an odd song out is dropped)"""
+    return [
+        [songs[i], songs[i + 1]]
+        for i in range(0, len(songs) - 1, 2)
+    ]
+
+
+class PairingReport:
+    """Same-submitter conflicts before and after diversity optimization"""
+    __slots__ = ('conflicts_before', 'conflicts_after')
+
+    def __init__(self, conflicts_before, conflicts_after):
+        self.conflicts_before = conflicts_before
+        self.conflicts_after = conflicts_after
+
+    @property
+    def conflicts_removed(self):
+        return self.conflicts_before - self.conflicts_after
+
+    def __repr__(self):
+        return f'<PairingReport {self.conflicts_before} -> {self.conflicts_after} conflicts>'
+
+
+def _is_conflict(song_a, song_b):
+    return song_a.submitter_id == song_b.submitter_id
+
+
+def optimize_for_submitter_diversity(pairs, max_distance=DEFAULT_MAX_SWAP_DISTANCE, max_passes=3):
+    """
+    Remove same-submitter matchups with a bounded local search over the round.
+
+    For every conflicting pair, partner pairs up to `max_distance` positions
+    away (nearest first) are tried with both cross swaps:
+        (a, b) + (c, d) -> (a, d) + (c, b)   or   (a, c) + (b, d)
+    A swap is taken only if neither resulting pair is a conflict, so every
+    accepted swap strictly lowers the conflict count. The distance bound
+    keeps songs within a few seeds / bracket slots of where they started.
+    Passes repeat until nothing improves (at most `max_passes`), so the
+    cost is O(pairs * max_distance) per pass.
+
+    Args:
+        pairs: List of [song1, song2] pairs
+        max_distance: Furthest partner pair (in positions) a song may move to
+        max_passes: Upper bound on full sweeps over the round
+
+    Returns:
+        (optimized pairs, PairingReport)
+    """
+    # Copy to avoid mutating the caller's pairs
+    optimized = [pair.copy() for pair in pairs]
+    conflicts_before = sum(1 for a, b in optimized if _is_conflict(a, b))
+
+    remaining = conflicts_before
+    for _ in range(max_passes):
+        if remaining == 0:
+            break
+        improved = False
+
+        for i in range(len(optimized)):
+            a, b = optimized[i]
+            if not _is_conflict(a, b):
+                continue
+
+            for offset in range(1, max_distance + 1):
+                swapped = False
+                for j in (i + offset, i - offset):
+                    if j < 0 or j >= len(optimized):
+                        continue
+                    c, d = optimized[j]
+                    partner_was_conflict = _is_conflict(c, d)
+
+                    if not _is_conflict(a, d) and not _is_conflict(c, b):
+                        optimized[i], optimized[j] = [a, d], [c, b]
+                    elif not _is_conflict(a, c) and not _is_conflict(b, d):
+                        optimized[i], optimized[j] = [a, c], [b, d]
+                    else:
+                        continue
+
+                    remaining -= 2 if partner_was_conflict else 1
+                    swapped = improved = True
+                    break
+                if swapped:
+                    break
+
+        if not improved:
+            break
+
+    return optimized, PairingReport(conflicts_before, remaining)
+
+
+def _to_matchups(pairs):
+    return [MatchupRecord(position, song1, song2) for position, (song1, song2) in enumerate(pairs)]
+
+
+def _pair_round(songs, max_distance):
+    pairs, report = optimize_for_submitter_diversity(pair_consecutive(songs), max_distance)
+    return _to_matchups(pairs), report
+
+
+def first_round(seeded, max_distance=DEFAULT_MAX_SWAP_DISTANCE):
+    """
+    Build Round 1 from seeded songs.
+
+    Returns:
+        (bye_songs, matchups, report): best seeds that skip Round 1, the
+        Round 1 MatchupRecords (consecutive seeds, adjusted for submitter
+        diversity) and the PairingReport
+    """
+    byes = num_byes(len(seeded))
+    matchups, report = _pair_round(seeded[byes:], max_distance)
+    return seeded[:byes], matchups, report
+
+
+def second_round(bye_songs, round_1_winners, max_distance=DEFAULT_MAX_SWAP_DISTANCE):
+    """
+    Build Round 2 from bye songs and Round 1 winners.
+
+    Byes fill the left side (best to worst seed), Round 1 winners the right
+    side in their Round 1 position order, then neighbors are paired.
+
+    Returns:
+        (matchups, report)
+    """
+    sorted_byes = sorted(bye_songs, key=lambda s: s.seed)
+    return _pair_round(sorted_byes + list(round_1_winners), max_distance)
+
+
+def next_round(winners, max_distance=DEFAULT_MAX_SWAP_DISTANCE):
+    """
+    Build the next round by pairing winners of neighboring positions.
+
+    Winners must be in position order; do NOT sort by seed or the bracket
+    structure breaks.
+
+    Returns:
+        (matchups, report)
+    """
+    return _pair_round(list(winners), max_distance)
+
+
+def pick_winner(matchup, song1_votes, song2_votes):
+    """Winner by votes; ties go to the higher seed (LOWER seed number)"""
+    if matchup.song1 is None or matchup.song2 is None:
+        return None
+    if song1_votes > song2_votes:
+        return matchup.song1
+    if song2_votes > song1_votes:
+        return matchup.song2
+    return matchup.song1 if matchup.song1.seed < matchup.song2.seed else matchup.song2
+
+
+# ==============================================================================
+# SIMULATION
+# ==============================================================================
+
+def simulate(songs, decide=None):
+    """
+    Play a whole bracket in memory.
+
+    Args:
+        songs: List of SongRecords (seeded in place)
+        decide: Optional callable(matchup) -> winning SongRecord. Defaults to
+            a random coin flip per matchup.
+
+    Returns:
+        List of rounds, each a list of MatchupRecords with winners set. The
+        champion is rounds[-1][0].winner.
+    """
+    if decide is None:
+        decide = lambda m: random.choice((m.song1, m.song2))
+
+    seeded = seed(songs)
+    if len(seeded) < 2:
+        return []
+
+    bye_songs, matchups, _ = first_round(seeded)
+    rounds = []
+    while matchups:
+        for matchup in matchups:
+            matchup.winner = decide(matchup)
+        rounds.append(matchups)
+
+        winners = [m.winner for m in matchups]
+        if len(rounds) == 1 and bye_songs:
+            matchups, _ = second_round(bye_songs, winners)
+        else:
+            matchups, _ = next_round(winners)
+
+    return rounds
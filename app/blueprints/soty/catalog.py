@@ -0,0 +1,115 @@
+"""
+SOTY song catalog
+
+Each season's entries live in data/songs_<season>.jsonl, one JSON object per
+line (written by utilities/spotify_data.py). Files are streamed and
+validated line by line, and only read by load_songs_into_db() and admin
+tooling, so the catalog is never held by web workers.
+"""
+import json
+import os
+import re
+
+CATALOG_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+
+_SEASON_FILE_RE = re.compile(r'^songs_(?P<season>[\w-]+)\.jsonl$')
+
+# Field -> accepted types (None allowed for optional fields)
+REQUIRED_FIELDS = {
+    'submitter_id': int,
+    'spotify_track_id': str,
+    'title': str,
+    'artist': str,
+}
+OPTIONAL_FIELDS = {
+    'apple_music_id': str,
+    'album': str,
+    'release_date': str,
+    'popularity': int,
+    'artwork_url': str,
+    'isrc_number': str,
+}
+
+
+def catalog_path(season, catalog_dir=CATALOG_DIR):
+    """Path of the JSONL file for a season"""
+    season = str(season)
+    if not re.fullmatch(r'[\w-]+', season):
+        raise ValueError(f"Invalid season: {season!r}")
+    return os.path.join(catalog_dir, f'songs_{season}.jsonl')
+
+
+def available_seasons(catalog_dir=CATALOG_DIR):
+    """Seasons with a catalog file, oldest first"""
+    try:
+        names = os.listdir(catalog_dir)
+    except FileNotFoundError:
+        return []
+    return sorted(m.group('season') for m in map(_SEASON_FILE_RE.match, names) if m)
+
+
+def validate_entry(entry):
+    """
+    Check one catalog entry.
+
+    Raises:
+        ValueError: Missing required fields or fields of the wrong type
+    """
+    if not isinstance(entry, dict):
+        raise ValueError("entry must be a JSON object")
+
+    for field, expected in REQUIRED_FIELDS.items():
+        value = entry.get(field)
+        if value is None or value == '':
+            raise ValueError(f"missing {field}")
+        # bool is an int subclass; reject it explicitly
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise ValueError(f"{field} must be {expected.__name__}")
+
+    for field, expected in OPTIONAL_FIELDS.items():
+        value = entry.get(field)
+        if value is not None and (not isinstance(value, expected) or isinstance(value, bool)):
+            raise ValueError(f"{field} must be {expected.__name__}")
+
+    return entry
+
+
+def iter_catalog(season, catalog_dir=CATALOG_DIR):
+    """
+    Stream validated entries for a season.
+
+    Args:
+        season: Season name, e.g. '2025'
+        catalog_dir: Directory holding songs_<season>.jsonl files
+
+    Yields:
+        Song entry dicts, in file order
+
+    Raises:
+        ValueError: Unknown season, invalid JSON or an invalid entry (the
+            message includes the line number)
+    """
+    path = catalog_path(season, catalog_dir)
+    if not os.path.exists(path):
+        raise ValueError(f"No song catalog for season {season} ({path})")
+
+    seen = set()
+    with open(path, encoding='utf-8') as f:
+        for line_number, line in enumerate(f, start=1):
+            if not line.strip():
+                continue
+            try:
+                entry = validate_entry(json.loads(line))
+            except ValueError as e:
+                raise ValueError(f"{os.path.basename(path)}:{line_number}: {e}") from None
+
+            track_id = entry['spotify_track_id']
+            if track_id in seen:
+                raise ValueError(f"{os.path.basename(path)}:{line_number}: duplicate track {track_id}")
+            seen.add(track_id)
+            yield entry
+
+
+def load_catalog(season, catalog_dir=CATALOG_DIR):
+    """All validated entries for a season as a list"""
+    return list(iter_catalog(season, catalog_dir))
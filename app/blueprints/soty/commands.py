@@ -0,0 +1,11 @@
+"""Song of the Year CLI commands (run as `flask soty <command>`)"""
+import click
+from app.blueprints.soty import soty_bp
+from app.blueprints.soty.services import reconcile_vote_tallies
+
+
+@soty_bp.cli.command('reconcile-tallies')
+def reconcile_tallies():
+    """Rebuild stored matchup vote tallies from Vote rows"""
+    corrected = reconcile_vote_tallies()
+    click.echo(f"Reconciled vote tallies ({corrected} matchup(s) corrected)")
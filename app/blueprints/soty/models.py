@@ -64,6 +64,10 @@ class Matchup(Base):
     is_tied = db.Column(db.Boolean, default=False)  # True if matchup resulted in vote tie
     tie_resolved_by_admin = db.Column(db.Boolean, default=False)  # True if admin manually selected winner
 
+    # Denormalized vote tallies (maintained on vote writes, rebuilt by `flask soty reconcile-tallies`)
+    song1_votes = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    song2_votes = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
     # Relationships
     song1 = db.relationship('Song', foreign_keys=[song1_id], backref='matchups_as_song1')
     song2 = db.relationship('Song', foreign_keys=[song2_id], backref='matchups_as_song2')
@@ -78,20 +82,21 @@ class Matchup(Base):
         if not self.song1_id or not self.song2_id:
             return None
 
-        song1_votes = self.votes.filter_by(song_id=self.song1_id).count()
-        song2_votes = self.votes.filter_by(song_id=self.song2_id).count()
-
-        if song1_votes > song2_votes:
+        if self.song1_votes > self.song2_votes:
             return self.song1
-        elif song2_votes > song1_votes:
+        elif self.song2_votes > self.song1_votes:
             return self.song2
         else:
             # Tie: higher seed wins (LOWER seed_number)
             return self.song1 if self.song1.seed_number < self.song2.seed_number else self.song2
 
     def get_vote_count(self, song_id):
-        """Get vote count for a specific song in this matchup"""
-        return self.votes.filter_by(song_id=song_id).count()
+        """Get vote count for a specific song in this matchup (from stored tallies)"""
+        if song_id is not None and song_id == self.song1_id:
+            return self.song1_votes or 0
+        if song_id is not None and song_id == self.song2_id:
+            return self.song2_votes or 0
+        return 0
 
     def __repr__(self):
         return f'<Matchup R{self.round_id}P{self.position_in_round}: {self.status}>'
@@ -118,3 +123,14 @@ class Vote(Base):
 
     def __repr__(self):
         return f'<Vote user={self.user_id} matchup={self.matchup_id} song={self.song_id}>'
+
+
+class TournamentState(db.Model):
+    """Single-row tournament state (data version used for page ETags)"""
+    __tablename__ = 'soty_tournament_state'
+
+    id = db.Column(db.Integer, primary_key=True)
+    data_version = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+
+    def __repr__(self):
+        return f'<TournamentState v{self.data_version}>'
@@ -1,17 +1,26 @@
 """Song of the Year tournament routes"""
-from flask import render_template, request, redirect, url_for, flash, session, jsonify
+from flask import (
+    render_template, request, redirect, url_for, flash, session, jsonify, abort,
+    current_app, Response, stream_with_context
+)
 from app.blueprints.soty import soty_bp
 from app.blueprints.soty.models import Song, Round, Matchup, Vote
 from app.blueprints.soty.services import (
     get_current_user, is_admin, login_required, admin_required,
-    SOTYTournamentService, verify_pin
+    SOTYTournamentService, verify_pin, build_bracket_view, submit_round_votes,
+    upsert_votes, user_directory, VOTE_INSERTED, VOTE_CHANGED, VOTE_UNCHANGED,
+    live_bracket_snapshot, diff_bracket_snapshots, vote_notifier, stream_slots,
+    get_data_version, bump_data_version, etag_cached
 )
 from app import db, limiter
+from app.utils.metrics import record_votes
+import json
 import time
 from datetime import datetime, timedelta
 
 
 @soty_bp.route('/')
+@etag_cached('index')
 def index():
     """
     Song of the Year Homepage
@@ -58,6 +67,7 @@ def logout():
 
 @soty_bp.route('/bracket')
 @login_required
+@etag_cached('bracket')
 def bracket():
     """
     Tournament bracket with tabs for each round
@@ -65,110 +75,10 @@ def bracket():
     - Vote buttons (active only if round is active)
     - Admin controls (finalize, extend)
     """
-    from app.blueprints.soty.services import load_users
-
-    rounds = Round.query.order_by(Round.round_number).all()
     current_user = get_current_user()
-    users = load_users()  # Load all users for voter names
-
-    # Build data for each round
-    rounds_data = []
-    for round_obj in rounds:
-        matchups = Matchup.query.filter_by(round_id=round_obj.id).order_by(Matchup.position_in_round).all()
-
-        # Get bye songs for Round 1
-        bye_songs = []
-        if round_obj.round_number == 1:
-            num_songs = Song.query.count()
-            if num_songs > 0:
-                import math
-                bracket_size = 2 ** math.ceil(math.log2(num_songs))
-                num_byes = bracket_size - num_songs
-
-                if num_byes > 0:
-                    bye_songs = Song.query.filter(
-                        Song.seed_number <= num_byes
-                    ).order_by(Song.seed_number).all()
-
-        matchups_data = []
-        for matchup in matchups:
-            # Get user's vote
-            user_vote = None
-            if current_user:
-                vote = Vote.query.filter_by(
-                    user_id=current_user['user_id'],
-                    matchup_id=matchup.id
-                ).first()
-                if vote:
-                    user_vote = vote.song_id
-
-            # Get voter names for each song (if round is completed or in tiebreaker mode)
-            song1_voters = []
-            song2_voters = []
-            if round_obj.status in ['completed', 'tiebreaker'] and matchup.song1_id and matchup.song2_id:
-                votes_song1 = Vote.query.filter_by(matchup_id=matchup.id, song_id=matchup.song1_id).all()
-                votes_song2 = Vote.query.filter_by(matchup_id=matchup.id, song_id=matchup.song2_id).all()
-
-                for vote in votes_song1:
-                    user = users.get(vote.user_id)
-                    if user:
-                        song1_voters.append(f"{user['first_name']} {user['last_name'][0]}.")
-
-                for vote in votes_song2:
-                    user = users.get(vote.user_id)
-                    if user:
-                        song2_voters.append(f"{user['first_name']} {user['last_name'][0]}.")
-
-            matchups_data.append({
-                'matchup': matchup,
-                'song1': matchup.song1,
-                'song2': matchup.song2,
-                'song1_votes': matchup.get_vote_count(matchup.song1_id) if matchup.song1_id else 0,
-                'song2_votes': matchup.get_vote_count(matchup.song2_id) if matchup.song2_id else 0,
-                'song1_voters': song1_voters,
-                'song2_voters': song2_voters,
-                'user_vote': user_vote,
-                'is_tied': matchup.is_tied,
-                'tie_resolved_by_admin': matchup.tie_resolved_by_admin
-            })
-
-        # Check if voting is open
-        now = int(time.time())
-        is_voting_open = (
-            round_obj.status == 'active' and
-            (not round_obj.end_date or now <= round_obj.end_date)
-        )
+    users = user_directory.users  # All users for voter names
 
-        # Determine which users have finished voting in this round
-        finished_voters = []
-        unfinished_voters = []
-
-        if round_obj.status in ['active', 'tiebreaker']:
-            total_matchups = len(matchups)
-
-            for user_id, user in users.items():
-                # Count how many matchups this user has voted on in this round
-                user_votes_in_round = Vote.query.filter(
-                    Vote.user_id == user_id,
-                    Vote.matchup_id.in_([m.id for m in matchups])
-                ).count()
-
-                user_display_name = f"{user['first_name']} {user['last_name'][0]}."
-
-                if user_votes_in_round >= total_matchups:
-                    finished_voters.append(user_display_name)
-                else:
-                    unfinished_voters.append(user_display_name)
-
-        rounds_data.append({
-            'round': round_obj,
-            'matchups': matchups_data,
-            'bye_songs': bye_songs,
-            'is_active': round_obj.status == 'active',
-            'is_voting_open': is_voting_open,
-            'finished_voters': finished_voters,
-            'unfinished_voters': unfinished_voters
-        })
+    rounds_data = build_bracket_view(current_user, users)
 
     return render_template('soty/bracket.html',
                           rounds_data=rounds_data,
@@ -176,6 +86,73 @@ def bracket():
                           is_admin=is_admin())
 
 
+@soty_bp.route('/bracket/stream')
+@login_required
+def bracket_stream():
+    """
+    Server-Sent Events stream of live bracket deltas
+
+    Each poll reads only the tournament data version (one primary-key
+    lookup); the snapshot (see live_bracket_snapshot) is rebuilt and diffed
+    only when the version moved, and only what changed is pushed: 'voters'
+    and 'round' events. Votes committed in this worker wake the stream
+    immediately; other workers' votes show up on the next poll. The stream
+    closes after SOTY_STREAM_MAX_SECONDS and the browser reconnects.
+
+    Open streams each hold a worker thread, so at most
+    SOTY_STREAM_MAX_PER_WORKER run per worker; beyond that the response is
+    503 with Retry-After.
+    """
+    config = current_app.config
+    if not stream_slots.acquire(config['SOTY_STREAM_MAX_PER_WORKER']):
+        return Response(
+            'Live updates are busy; try again shortly', status=503,
+            headers={'Retry-After': str(config['SOTY_STREAM_RETRY_AFTER_SECONDS'])}
+        )
+
+    poll_seconds = config['SOTY_STREAM_POLL_SECONDS']
+    max_seconds = config['SOTY_STREAM_MAX_SECONDS']
+    keepalive_seconds = 15
+    users = user_directory.users
+
+    def generate():
+        version = get_data_version()
+        previous = live_bracket_snapshot(users)
+        db.session.close()  # Don't hold a pooled connection between polls
+        yield 'retry: 2000\n\n'
+
+        started = last_sent = time.monotonic()
+        sequence = vote_notifier.sequence
+        while time.monotonic() - started < max_seconds:
+            sequence = vote_notifier.wait(sequence, poll_seconds)
+
+            current_version = get_data_version()
+            if current_version != version:
+                version = current_version
+                current = live_bracket_snapshot(users)
+                for event, data in diff_bracket_snapshots(previous, current):
+                    yield f'event: {event}\ndata: {json.dumps(data)}\n\n'
+                    last_sent = time.monotonic()
+                previous = current
+            db.session.close()
+
+            if time.monotonic() - last_sent >= keepalive_seconds:
+                yield ': keepalive\n\n'
+                last_sent = time.monotonic()
+
+    response = Response(
+        stream_with_context(generate()),
+        mimetype='text/event-stream',
+        headers={
+            'Cache-Control': 'no-cache',
+            'X-Accel-Buffering': 'no'  # Disable nginx proxy buffering
+        }
+    )
+    # Runs whether the stream ends, the client disconnects or it never started
+    response.call_on_close(stream_slots.release)
+    return response
+
+
 @soty_bp.route('/vote', methods=['POST'])
 @login_required
 def vote():
@@ -184,10 +161,14 @@ def vote():
     song_id = request.form.get('song_id', type=int)
     current_user = get_current_user()
 
-    # Validation
-    matchup = Matchup.query.get_or_404(matchup_id)
-    round_obj = Round.query.get(matchup.round_id)
-    
+    # Validation (matchup and its round in one query)
+    row = db.session.query(Matchup, Round).join(
+        Round, Round.id == Matchup.round_id
+    ).filter(Matchup.id == matchup_id).first()
+    if row is None:
+        abort(404)
+    matchup, round_obj = row
+
     if song_id not in [matchup.song1_id, matchup.song2_id]:
         return jsonify({'success': False, 'error': 'Invalid song for matchup'}), 400
     
@@ -198,29 +179,43 @@ def vote():
     if round_obj.end_date and now > round_obj.end_date:
         return jsonify({'success': False, 'error': 'Voting deadline passed'}), 400
 
-    # Check existing vote
-    existing_vote = Vote.query.filter_by(
-        user_id=current_user['user_id'],
-        matchup_id=matchup_id
-    ).first()
+    outcome = upsert_votes(current_user['user_id'], {matchup_id: song_id}, {matchup_id: matchup})
+    bump_data_version()
+    db.session.commit()
+    vote_notifier.notify()
+    record_votes(outcome)
 
-    if existing_vote:
-        if existing_vote.song_id != song_id:
-            existing_vote.song_id = song_id
-            existing_vote.is_vote_changed = True
-            db.session.commit()
-            return jsonify({'success': True, 'message': 'Vote updated'})
-        else:
-            return jsonify({'success': True, 'message': 'Vote already recorded'})
-    else:
-        new_vote = Vote(
-            user_id=current_user['user_id'],
-            matchup_id=matchup_id,
-            song_id=song_id
-        )
-        db.session.add(new_vote)
-        db.session.commit()
-        return jsonify({'success': True, 'message': 'Vote recorded'})
+    messages = {
+        VOTE_INSERTED: 'Vote recorded',
+        VOTE_CHANGED: 'Vote updated',
+        VOTE_UNCHANGED: 'Vote already recorded'
+    }
+    return jsonify({'success': True, 'message': messages[outcome[matchup_id]]})
+
+
+@soty_bp.route('/vote/batch', methods=['POST'])
+@login_required
+def vote_batch():
+    """
+    Submit or update votes for several matchups in one round at once
+
+    Expects JSON: {"round_id": 1, "votes": [{"matchup_id": 3, "song_id": 7}, ...]}
+    """
+    payload = request.get_json(silent=True) or {}
+    current_user = get_current_user()
+
+    try:
+        round_id = int(payload.get('round_id'))
+        selections = [(v['matchup_id'], v['song_id']) for v in payload.get('votes') or []]
+    except (TypeError, ValueError, KeyError):
+        return jsonify({'success': False, 'error': 'Invalid vote payload'}), 400
+
+    try:
+        result = submit_round_votes(current_user['user_id'], round_id, selections)
+    except (TypeError, ValueError) as e:
+        return jsonify({'success': False, 'error': str(e)}), 400
+
+    return jsonify({'success': True, **result})
 
 
 @soty_bp.route('/admin/build-bracket', methods=['GET', 'POST'])
@@ -248,9 +243,16 @@ def build_bracket():
             round_1.start_date = int(time.time())
             round_1.end_date = int(time.time() + (96 * 3600))  # 96 hours
 
+            bump_data_version()
+
             db.session.commit()
 
-            flash(f'Bracket built successfully! {result["total_matchups"]} matchups created with {result["num_byes"]} bye(s). Round 1 is now active.', 'success')
+            flash(
+                f'Bracket built successfully! {result["total_matchups"]} matchups created with '
+                f'{result["num_byes"]} bye(s) ({result["conflicts_removed"]} same-submitter '
+                f'matchup(s) avoided). Round 1 is now active.',
+                'success'
+            )
             return redirect(url_for('soty.bracket'))
 
         except Exception as e:
@@ -284,143 +286,32 @@ def finalize_round(round_id):
         return redirect(url_for('soty.bracket'))
 
     try:
-        # PHASE 1: Initial Finalization (from 'active')
-        if round_obj.status == 'active':
-            tied_matchups = []
-            non_tied_matchups = []
-
-            matchups = Matchup.query.filter_by(round_id=round_obj.id).all()
-
-            for matchup in matchups:
-                song1_votes = matchup.get_vote_count(matchup.song1_id) if matchup.song1_id else 0
-                song2_votes = matchup.get_vote_count(matchup.song2_id) if matchup.song2_id else 0
-
-                # Check for tie
-                if matchup.song1_id and matchup.song2_id and song1_votes == song2_votes:
-                    matchup.is_tied = True
-                    tied_matchups.append(matchup)
-                else:
-                    # Auto-determine winner for non-tied matchups
-                    winner = matchup.get_winner()
-                    if winner:
-                        matchup.winner_song_id = winner.id
-                        matchup.tie_resolved_by_admin = False
-                    matchup.status = 'completed'
-                    non_tied_matchups.append(matchup)
-
-            # Update max_round_reached for all songs in non-tied matchups
-            for matchup in non_tied_matchups:
-                if matchup.song1:
-                    matchup.song1.max_round_reached = max(
-                        matchup.song1.max_round_reached, round_obj.round_number
-                    )
-                if matchup.song2:
-                    matchup.song2.max_round_reached = max(
-                        matchup.song2.max_round_reached, round_obj.round_number
-                    )
-
-            # Update is_alive for losers in non-tied matchups
-            for matchup in non_tied_matchups:
-                if matchup.song1_id and matchup.winner_song_id != matchup.song1_id:
-                    matchup.song1.is_alive = False
-                if matchup.song2_id and matchup.winner_song_id != matchup.song2_id:
-                    matchup.song2.is_alive = False
-
-            # Determine next status
-            if tied_matchups:
-                round_obj.status = 'tiebreaker'
-                round_obj.tiebreaker_end_date = int(time.time() + (48 * 3600))  # 48 hours minimum
-                db.session.commit()
-                flash(
-                    f'{len(tied_matchups)} tie(s) detected in {round_obj.name}. '
-                    f'Please select winners for tied matchups below.',
-                    'warning'
-                )
-            else:
-                # No ties - proceed to complete
-                round_obj.status = 'completed'
-                round_obj.end_date = int(time.time())
-
-                # Build next round
-                next_matchups = SOTYTournamentService.build_next_round_matchups(round_obj)
-
-                if next_matchups is None:
-                    flash('Tournament completed!', 'success')
-                else:
-                    next_round = Round.query.filter_by(
-                        round_number=round_obj.round_number + 1
-                    ).first()
-                    next_round.status = 'active'
-                    next_round.start_date = int(time.time())
-                    next_round.end_date = int(time.time() + (96 * 3600))
-
-                    flash(
-                        f'{round_obj.name} finalized! {next_round.name} is now active.',
-                        'success'
-                    )
-
-                db.session.commit()
-
-        # PHASE 2: Finalize Tiebreaker (from 'tiebreaker')
-        elif round_obj.status == 'tiebreaker':
-            # Verify all tied matchups have admin-selected winners
-            tied_matchups = Matchup.query.filter_by(
-                round_id=round_obj.id,
-                is_tied=True
-            ).all()
-
-            unresolved = [m for m in tied_matchups if not m.winner_song_id]
-
-            if unresolved:
-                flash(
-                    f'Please select winners for all {len(unresolved)} remaining tied matchup(s)',
-                    'warning'
-                )
-                return redirect(url_for('soty.bracket'))
-
-            # All ties resolved - complete the round
-            for matchup in tied_matchups:
-                matchup.status = 'completed'
-
-                # Update max_round_reached
-                if matchup.song1:
-                    matchup.song1.max_round_reached = max(
-                        matchup.song1.max_round_reached, round_obj.round_number
-                    )
-                if matchup.song2:
-                    matchup.song2.max_round_reached = max(
-                        matchup.song2.max_round_reached, round_obj.round_number
-                    )
-
-                # Update is_alive for losers
-                if matchup.song1_id and matchup.winner_song_id != matchup.song1_id:
-                    matchup.song1.is_alive = False
-                if matchup.song2_id and matchup.winner_song_id != matchup.song2_id:
-                    matchup.song2.is_alive = False
-
-            # Mark round completed
-            round_obj.status = 'completed'
-            round_obj.end_date = int(time.time())
-
-            # Build next round
-            next_matchups = SOTYTournamentService.build_next_round_matchups(round_obj)
-
-            if next_matchups is None:
-                flash('Tournament completed!', 'success')
-            else:
-                next_round = Round.query.filter_by(
-                    round_number=round_obj.round_number + 1
-                ).first()
-                next_round.status = 'active'
-                next_round.start_date = int(time.time())
-                next_round.end_date = int(time.time() + (96 * 3600))
-
-                flash(
-                    f'Tiebreakers resolved! {next_round.name} is now active.',
-                    'success'
-                )
+        round_name = round_obj.name
+        result = SOTYTournamentService.finalize_round(round_obj)
 
-            db.session.commit()
+        if result['status'] == 'unresolved':
+            db.session.rollback()
+            flash(
+                f'Please select winners for all {result["unresolved"]} remaining tied matchup(s)',
+                'warning'
+            )
+            return redirect(url_for('soty.bracket'))
+
+        bump_data_version()
+        db.session.commit()
+
+        if result['status'] == 'tiebreaker':
+            flash(
+                f'{result["tied"]} tie(s) detected in {round_name}. '
+                f'Please select winners for tied matchups below.',
+                'warning'
+            )
+        elif result['next_round'] is None:
+            flash('Tournament completed!', 'success')
+        elif result['tied']:
+            flash(f'Tiebreakers resolved! {result["next_round"].name} is now active.', 'success')
+        else:
+            flash(f'{round_name} finalized! {result["next_round"].name} is now active.', 'success')
 
     except Exception as e:
         db.session.rollback()
@@ -467,6 +358,8 @@ def resolve_tie(matchup_id):
         matchup.winner_song_id = song_id
         matchup.tie_resolved_by_admin = True
 
+        bump_data_version()
+
         db.session.commit()
 
         return jsonify({
@@ -507,6 +400,8 @@ def extend_round(round_id):
             if r.end_date:
                 r.end_date += (extension_hours * 3600)
 
+        bump_data_version()
+
         db.session.commit()
         flash(f'{round_obj.name} extended by {extension_hours} hours', 'success')
 
@@ -534,6 +429,8 @@ def reset_tournament():
             song.max_round_reached = 0
             song.seed_number = None
 
+        bump_data_version()
+
         db.session.commit()
         flash('Tournament reset successfully! You can now rebuild the bracket.', 'success')
     except Exception as e:
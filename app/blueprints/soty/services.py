@@ -1,14 +1,23 @@
 """Song of the Year tournament services"""
+import hashlib
+import hmac
 import json
 import os
-import math
+import secrets
 import time
 import logging
-from flask import session, redirect, url_for, flash
+import threading
+from collections import defaultdict
+from datetime import datetime
+from flask import current_app, session, redirect, url_for, flash, request, make_response, Response
 from functools import wraps
+from flask_wtf.csrf import generate_csrf
+from sqlalchemy import func
+from sqlalchemy.orm import joinedload
 from app import db
-from app.blueprints.soty.models import Song, Round, Matchup
-from .soty_songs import SOTY_SONGS
+from app.utils.metrics import record_cache, record_votes
+from app.blueprints.soty import bracket_engine
+from app.blueprints.soty.models import Song, Round, Matchup, Vote, TournamentState
 
 logger = logging.getLogger(__name__)
 
@@ -17,28 +26,97 @@ logger = logging.getLogger(__name__)
 # USER AUTHENTICATION (PIN-based)
 # ==============================================================================
 
+class UserDirectory:
+    """
+    In-process cache of users.json.
+
+    The file is parsed once per worker and re-read only when its mtime
+    changes, so authenticated requests don't pay for disk I/O and JSON
+    decoding. Lookups by user_id and PIN are plain dict reads.
+
+    PINs are never kept in memory in clear text: the PIN index is keyed by
+    an HMAC-SHA256 digest under a per-process random key, and the cached
+    user dicts have account_segment (the PIN) removed.
+    """
+
+    def __init__(self, users_file):
+        self.users_file = users_file
+        self._mtime = None
+        self._users = {}
+        self._users_by_pin = {}
+        self._pin_key = secrets.token_bytes(32)
+        self._lock = threading.Lock()
+
+    def _hash_pin(self, pin):
+        """Keyed digest of a PIN (used as the PIN index key)"""
+        return hmac.new(self._pin_key, str(pin).encode('utf-8'), hashlib.sha256).digest()
+
+    def _refresh(self):
+        """Reload the file if it changed since the last load"""
+        mtime = os.stat(self.users_file).st_mtime_ns
+        record_cache('users_json', mtime == self._mtime)
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            with open(self.users_file, 'r') as f:
+                users = json.load(f)
+            # Build complete indexes before publishing them: readers past the
+            # mtime check use self._users without taking the lock
+            users_by_id = {}
+            users_by_pin = {}
+            for user in users:
+                pin = user.pop('account_segment')
+                users_by_id[user['user_id']] = user
+                users_by_pin[self._hash_pin(pin)] = user
+            self._users, self._users_by_pin = users_by_id, users_by_pin
+            self._mtime = mtime
+            logger.info(f"Loaded {len(users)} SOTY users from {self.users_file}")
+
+    @property
+    def version(self):
+        """Changes whenever users.json is reloaded (file mtime)"""
+        self._refresh()
+        return self._mtime
+
+    @property
+    def users(self):
+        """Dict of user_id -> user (treat as read-only)"""
+        self._refresh()
+        return self._users
+
+    def get(self, user_id):
+        """Return user dict for user_id, or None"""
+        self._refresh()
+        return self._users.get(user_id)
+
+    def find_by_pin(self, pin):
+        """Return user dict for PIN, or None"""
+        self._refresh()
+        if not pin:
+            return None
+        return self._users_by_pin.get(self._hash_pin(pin))
+
+
+user_directory = UserDirectory(os.path.join(os.path.dirname(__file__), 'users.json'))
+
+
 def load_users():
-    """Load users from .users.json file"""
-    users_file = os.path.join(os.path.dirname(__file__), 'users.json')
-    with open(users_file, 'r') as f:
-        users = json.load(f)
-    return {user['user_id']: user for user in users}
+    """Return all users keyed by user_id (cached, see UserDirectory)"""
+    return user_directory.users
 
 
 def verify_pin(pin):
     """Verify PIN and return user data if valid"""
-    users = load_users()
-    for user_id, user in users.items():
-        if user['account_segment'] == pin:
-            return user
-    return None
+    return user_directory.find_by_pin(pin)
 
 
 def get_current_user():
     """Get current user from session"""
     if 'user_id' in session:
-        users = load_users()
-        return users.get(session['user_id'])
+        return user_directory.get(session['user_id'])
     return None
 
 
@@ -52,7 +130,7 @@ def login_required(f):
     """Decorator to require login for routes"""
     @wraps(f)
     def decorated_function(*args, **kwargs):
-        if 'user_id' not in session:
+        if get_current_user() is None:
             flash('Please log in to access this page', 'warning')
             return redirect(url_for('soty.login'))
         return f(*args, **kwargs)
@@ -71,33 +149,656 @@ def admin_required(f):
 
 
 # ==============================================================================
-# SONG DATA (Hardcoded - user will provide)
+# DATA VERSION (conditional GETs)
 # ==============================================================================
 
-def load_songs_into_db():
-    """Load hardcoded songs into database (idempotent)"""
-    for song_data in SOTY_SONGS:
-        # Check if song already exists
-        existing = Song.query.filter_by(
-            spotify_track_id=song_data['spotify_track_id']
-        ).first()
+def get_data_version():
+    """Current tournament data version (0 before the first write)"""
+    return db.session.query(TournamentState.data_version).filter_by(id=1).scalar() or 0
+
+
+def bump_data_version():
+    """
+    Increment the tournament data version.
+
+    Call before committing any write that changes what /soty/ or
+    /soty/bracket render (votes, finalize, extend, tie resolution, reset,
+    song loads) so the change commits atomically with the new version.
+    A single upsert, so concurrent first bumps can't both insert the row.
+    """
+    state = TournamentState.__table__
+    stmt = _dialect_insert(state).values(id=1, data_version=1)
+    db.session.execute(stmt.on_conflict_do_update(
+        index_elements=[state.c.id],
+        set_={'data_version': state.c.data_version + 1}
+    ))
+
+
+def _csrf_tag():
+    """Short hash of the session's CSRF token (pages embed a token derived from it)"""
+    generate_csrf()  # Creates the session token on a first visit
+    token = session.get(current_app.config.get('WTF_CSRF_FIELD_NAME', 'csrf_token'), '')
+    return hashlib.sha256(token.encode('utf-8')).hexdigest()[:8]
+
+
+def _page_etag(view_name):
+    """
+    ETag for a SOTY page: data version + viewer + session CSRF token +
+    users file + closed deadlines
+    """
+    now = int(time.time())
+    closed_rounds = sum(
+        1 for (end_date,) in db.session.query(Round.end_date).filter(Round.status == 'active')
+        if end_date and now > end_date
+    )
+    return (
+        f"{view_name}-v{get_data_version()}-u{session.get('user_id', 0)}-s{_csrf_tag()}"
+        f"-d{user_directory.version}-c{closed_rounds}"
+    )
+
+
+def etag_cached(view_name):
+    """
+    Decorator adding an ETag to a page and answering conditional GETs with
+    304 Not Modified, skipping the render entirely. Pages with pending
+    flash messages are always rendered.
+    """
+    def decorator(f):
+        @wraps(f)
+        def decorated_function(*args, **kwargs):
+            etag = _page_etag(view_name)
+            hit = request.if_none_match.contains(etag) and not session.get('_flashes')
+            record_cache(f'etag_{view_name}', hit)
+            if hit:
+                response = Response(status=304)
+                response.set_etag(etag)
+                return response
+
+            response = make_response(f(*args, **kwargs))
+            response.set_etag(etag)
+            response.headers['Cache-Control'] = 'private, no-cache'
+            return response
+        return decorated_function
+    return decorator
 
-        if not existing:
-            song = Song(
-                submitter_id=song_data['submitter_id'],
-                spotify_track_id=song_data['spotify_track_id'],
-                apple_music_id=song_data['apple_music_id'],
-                title=song_data['title'],
-                artist=song_data['artist'],
-                album=song_data.get('album'),
-                release_date=song_data.get('release_date'),
-                popularity=song_data.get('popularity'),
-                artwork_url=song_data.get('artwork_url')
-            )
-            db.session.add(song)
 
+# ==============================================================================
+# SONG DATA (catalog files in data/, see catalog.py)
+# ==============================================================================
+
+# Catalog columns copied from song entries (spotify_track_id is the natural key)
+SONG_CATALOG_FIELDS = (
+    'submitter_id', 'apple_music_id', 'title', 'artist', 'album',
+    'release_date', 'popularity', 'artwork_url'
+)
+SONG_LOAD_CHUNK_SIZE = 500
+
+
+def _song_mapping(song_data):
+    mapping = {field: song_data.get(field) for field in SONG_CATALOG_FIELDS}
+    mapping['spotify_track_id'] = song_data['spotify_track_id']
+    return mapping
+
+
+def load_songs_into_db(songs=None, chunk_size=SONG_LOAD_CHUNK_SIZE, season=None):
+    """
+    Bulk-load song entries into the database (idempotent).
+
+    Existing rows are fetched in one query keyed by spotify_track_id; new
+    songs are inserted and changed songs updated in chunks of `chunk_size`.
+    Tournament columns (seed, alive, rounds reached) are never touched.
+
+    Args:
+        songs: Iterable of song dicts (defaults to the season's catalog file)
+        chunk_size: Rows per INSERT/UPDATE executemany batch
+        season: Catalog season when songs is None (defaults to SOTY_SEASON)
+
+    Returns:
+        Dict with inserted/updated/unchanged counts
+    """
+    if songs is None:
+        # Imported here so web workers never load the catalog module
+        from app.blueprints.soty.catalog import iter_catalog
+        songs = iter_catalog(season or current_app.config['SOTY_SEASON'])
+
+    # Last entry wins if the catalog lists a track twice
+    incoming = {}
+    for song_data in songs:
+        incoming[song_data['spotify_track_id']] = _song_mapping(song_data)
+
+    columns = [Song.id, Song.spotify_track_id] + [getattr(Song, f) for f in SONG_CATALOG_FIELDS]
+    existing = {
+        row.spotify_track_id: row
+        for row in db.session.execute(db.select(*columns)).all()
+    }
+
+    to_insert, to_update = [], []
+    for track_id, mapping in incoming.items():
+        row = existing.get(track_id)
+        if row is None:
+            to_insert.append(mapping)
+            continue
+        changes = {
+            field: mapping[field]
+            for field in SONG_CATALOG_FIELDS
+            if getattr(row, field) != mapping[field]
+        }
+        if changes:
+            changes['id'] = row.id
+            to_update.append(changes)
+
+    for i in range(0, len(to_insert), chunk_size):
+        db.session.execute(db.insert(Song), to_insert[i:i + chunk_size])
+    for i in range(0, len(to_update), chunk_size):
+        db.session.execute(db.update(Song), to_update[i:i + chunk_size])
+
+    counts = {
+        'inserted': len(to_insert),
+        'updated': len(to_update),
+        'unchanged': len(incoming) - len(to_insert) - len(to_update),
+    }
+    if to_insert or to_update:
+        bump_data_version()
     db.session.commit()
-    print(f"Loaded {len(SOTY_SONGS)} songs into database")
+
+    logger.info(
+        f"Loaded {len(incoming)} songs: {counts['inserted']} inserted, "
+        f"{counts['updated']} updated, {counts['unchanged']} unchanged"
+    )
+    return counts
+
+
+# ==============================================================================
+# VOTE TALLIES (denormalized counts on Matchup)
+# ==============================================================================
+
+def tally_delta(matchup, song_id, previous_song_id=None):
+    """
+    Return the (song1, song2) tally change for a new or moved vote.
+
+    Args:
+        matchup: Matchup the vote belongs to
+        song_id: Song now voted for
+        previous_song_id: Song the vote was moved away from (None for a new vote)
+    """
+    delta = [0, 0]
+    delta[0 if song_id == matchup.song1_id else 1] += 1
+    if previous_song_id is not None:
+        delta[0 if previous_song_id == matchup.song1_id else 1] -= 1
+    return tuple(delta)
+
+
+def apply_tally_deltas(deltas):
+    """
+    Apply tally changes to stored matchup counts.
+
+    Uses in-database increments (col = col + n) in a single executemany
+    UPDATE so concurrent writers never overwrite each other. Caller commits
+    together with the Vote rows.
+
+    Args:
+        deltas: Dict of matchup_id -> (song1 delta, song2 delta)
+    """
+    params = [
+        {'matchup_id': matchup_id, 'song1_delta': d1, 'song2_delta': d2}
+        for matchup_id, (d1, d2) in deltas.items()
+        if d1 or d2
+    ]
+    if not params:
+        return
+
+    stmt = db.update(Matchup.__table__).where(
+        Matchup.__table__.c.id == db.bindparam('matchup_id')
+    ).values(
+        song1_votes=Matchup.__table__.c.song1_votes + db.bindparam('song1_delta'),
+        song2_votes=Matchup.__table__.c.song2_votes + db.bindparam('song2_delta')
+    )
+    db.session.execute(stmt, params)
+
+
+def reconcile_vote_tallies():
+    """
+    Rebuild every matchup's stored tallies from Vote rows.
+
+    Returns:
+        Number of matchups whose tallies were corrected
+    """
+    counts = defaultdict(int)
+    for matchup_id, song_id, count in db.session.query(
+        Vote.matchup_id, Vote.song_id, func.count(Vote.id)
+    ).group_by(Vote.matchup_id, Vote.song_id):
+        counts[(matchup_id, song_id)] = count
+
+    corrections = []
+    for matchup in Matchup.query.all():
+        song1_votes = counts[(matchup.id, matchup.song1_id)] if matchup.song1_id else 0
+        song2_votes = counts[(matchup.id, matchup.song2_id)] if matchup.song2_id else 0
+        if (matchup.song1_votes, matchup.song2_votes) != (song1_votes, song2_votes):
+            corrections.append({
+                'id': matchup.id,
+                'song1_votes': song1_votes,
+                'song2_votes': song2_votes
+            })
+
+    if corrections:
+        db.session.execute(db.update(Matchup), corrections)
+    db.session.commit()
+    return len(corrections)
+
+
+# ==============================================================================
+# VOTING
+# ==============================================================================
+
+VOTE_INSERTED = 'inserted'
+VOTE_CHANGED = 'changed'
+VOTE_UNCHANGED = 'unchanged'
+
+VOTE_OUTCOME_KEYS = {
+    VOTE_INSERTED: 'recorded',
+    VOTE_CHANGED: 'updated',
+    VOTE_UNCHANGED: 'unchanged'
+}
+
+
+def _dialect_insert(table):
+    """Return an INSERT construct that supports ON CONFLICT for the bound dialect"""
+    dialect = db.session.get_bind().dialect.name
+    if dialect == 'sqlite':
+        from sqlalchemy.dialects.sqlite import insert
+    elif dialect == 'postgresql':
+        from sqlalchemy.dialects.postgresql import insert
+    else:
+        raise NotImplementedError(f"Upserts are not supported on {dialect}")
+    return insert(table)
+
+
+def upsert_votes(user_id, votes_by_matchup, matchups):
+    """
+    Write a user's votes with a single INSERT ... ON CONFLICT DO UPDATE.
+
+    Rows that already hold the same song are left alone (the conflict
+    update is guarded by song_id != excluded.song_id), so RETURNING only
+    yields inserted rows (is_vote_changed false) and changed rows
+    (is_vote_changed true). Stored tallies are adjusted to match. Caller
+    validates the selections and commits.
+
+    Args:
+        user_id: Voting user's id
+        votes_by_matchup: Dict of matchup_id -> song_id
+        matchups: Dict of matchup_id -> Matchup (for tally columns)
+
+    Returns:
+        Dict of matchup_id -> VOTE_INSERTED / VOTE_CHANGED / VOTE_UNCHANGED
+    """
+    votes = Vote.__table__
+    now = datetime.utcnow()
+    stmt = _dialect_insert(votes).values([
+        {
+            'user_id': user_id,
+            'matchup_id': matchup_id,
+            'song_id': song_id,
+            'is_vote_changed': False,
+            'created_at': now,
+            'updated_at': now
+        }
+        for matchup_id, song_id in votes_by_matchup.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[votes.c.user_id, votes.c.matchup_id],
+        set_={
+            'song_id': stmt.excluded.song_id,
+            'is_vote_changed': True,
+            'updated_at': now
+        },
+        where=votes.c.song_id != stmt.excluded.song_id
+    ).returning(votes.c.matchup_id, votes.c.is_vote_changed)
+
+    outcomes = {matchup_id: VOTE_UNCHANGED for matchup_id in votes_by_matchup}
+    deltas = {}
+    for matchup_id, is_vote_changed in db.session.execute(stmt):
+        matchup = matchups[matchup_id]
+        song_id = votes_by_matchup[matchup_id]
+        if is_vote_changed:
+            previous_song_id = matchup.song2_id if song_id == matchup.song1_id else matchup.song1_id
+            deltas[matchup_id] = tally_delta(matchup, song_id, previous_song_id=previous_song_id)
+            outcomes[matchup_id] = VOTE_CHANGED
+        else:
+            deltas[matchup_id] = tally_delta(matchup, song_id)
+            outcomes[matchup_id] = VOTE_INSERTED
+
+    apply_tally_deltas(deltas)
+    return outcomes
+
+
+def submit_round_votes(user_id, round_id, selections):
+    """
+    Record a batch of votes for one round in a single transaction.
+
+    All matchups and their round are validated with one joined query, then
+    every vote is written with one upsert (see upsert_votes) and committed
+    together with the tally updates.
+
+    Args:
+        user_id: Voting user's id
+        round_id: Round every selection must belong to
+        selections: Iterable of (matchup_id, song_id) pairs (last one wins per matchup)
+
+    Returns:
+        dict with 'recorded', 'updated' and 'unchanged' counts
+
+    Raises:
+        ValueError: If any selection is invalid or the round is not open for voting
+    """
+    votes_by_matchup = {}
+    for matchup_id, song_id in selections:
+        votes_by_matchup[int(matchup_id)] = int(song_id)
+
+    if not votes_by_matchup:
+        raise ValueError('No votes submitted')
+
+    rows = db.session.query(Matchup, Round).join(
+        Round, Round.id == Matchup.round_id
+    ).filter(
+        Matchup.id.in_(votes_by_matchup.keys())
+    ).all()
+
+    if len(rows) != len(votes_by_matchup):
+        raise ValueError('Unknown matchup')
+
+    now = int(time.time())
+    matchups = {}
+    for matchup, round_obj in rows:
+        if round_obj.id != round_id:
+            raise ValueError('Matchup is not in this round')
+        if round_obj.status != 'active':
+            raise ValueError('Round is not active')
+        if round_obj.end_date and now > round_obj.end_date:
+            raise ValueError('Voting deadline passed')
+        if votes_by_matchup[matchup.id] not in [matchup.song1_id, matchup.song2_id]:
+            raise ValueError('Invalid song for matchup')
+        matchups[matchup.id] = matchup
+
+    try:
+        outcomes = upsert_votes(user_id, votes_by_matchup, matchups)
+        bump_data_version()
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+    vote_notifier.notify()
+    record_votes(outcomes)
+
+    result = {'recorded': 0, 'updated': 0, 'unchanged': 0}
+    for outcome in outcomes.values():
+        result[VOTE_OUTCOME_KEYS[outcome]] += 1
+    return result
+
+
+# ==============================================================================
+# BRACKET READ MODEL (/soty/bracket view data)
+# ==============================================================================
+
+def _voter_display_name(user):
+    """Short display name used in voter lists ("First L.")"""
+    return f"{user['first_name']} {user['last_name'][0]}."
+
+
+def _votes_per_user(round_ids):
+    """Votes cast per user in the given rounds: {(round_id, user_id): count}"""
+    if not round_ids:
+        return {}
+    return {
+        (round_id, user_id): count
+        for round_id, user_id, count in db.session.query(
+            Matchup.round_id, Vote.user_id, func.count(Vote.id)
+        ).join(
+            Matchup, Matchup.id == Vote.matchup_id
+        ).filter(
+            Matchup.round_id.in_(round_ids)
+        ).group_by(Matchup.round_id, Vote.user_id)
+    }
+
+
+def _split_voters(round_id, total_matchups, votes_per_user, users):
+    """Return (finished, unfinished) display names for a round"""
+    finished_voters = []
+    unfinished_voters = []
+    for user_id, user in users.items():
+        user_display_name = _voter_display_name(user)
+        if votes_per_user.get((round_id, user_id), 0) >= total_matchups:
+            finished_voters.append(user_display_name)
+        else:
+            unfinished_voters.append(user_display_name)
+    return finished_voters, unfinished_voters
+
+
+def build_bracket_view(current_user, users):
+    """
+    Build the rounds_data structure rendered by bracket.html.
+
+    Everything is loaded up front in a fixed number of queries (rounds,
+    matchups with their songs and stored tallies, the user's own votes,
+    voter rows for revealed rounds, per-user vote counts and bye songs), then
+    assembled in memory. Query count does not grow with bracket size.
+
+    Args:
+        current_user: User dict from the session (or None)
+        users: Dict of user_id -> user dict
+
+    Returns:
+        List of per-round dicts consumed by the bracket template
+    """
+    rounds = Round.query.order_by(Round.round_number).all()
+    if not rounds:
+        return []
+
+    matchups = Matchup.query.options(
+        joinedload(Matchup.song1),
+        joinedload(Matchup.song2)
+    ).order_by(Matchup.round_id, Matchup.position_in_round).all()
+
+    matchups_by_round = defaultdict(list)
+    for matchup in matchups:
+        matchups_by_round[matchup.round_id].append(matchup)
+
+    # Current user's votes: {matchup_id: song_id}
+    user_votes = {}
+    if current_user:
+        user_votes = dict(db.session.query(Vote.matchup_id, Vote.song_id).filter(
+            Vote.user_id == current_user['user_id']
+        ))
+
+    # Voter names are only revealed for completed / tiebreaker rounds
+    revealed_round_ids = [r.id for r in rounds if r.status in ['completed', 'tiebreaker']]
+    voters = defaultdict(list)
+    if revealed_round_ids:
+        voter_rows = db.session.query(Vote.matchup_id, Vote.song_id, Vote.user_id).join(
+            Matchup, Matchup.id == Vote.matchup_id
+        ).filter(
+            Matchup.round_id.in_(revealed_round_ids)
+        ).order_by(Vote.id)
+        for matchup_id, song_id, user_id in voter_rows:
+            user = users.get(user_id)
+            if user:
+                voters[(matchup_id, song_id)].append(_voter_display_name(user))
+
+    # Votes cast per user in rounds that are still collecting votes
+    open_round_ids = [r.id for r in rounds if r.status in ['active', 'tiebreaker']]
+    votes_per_user = _votes_per_user(open_round_ids)
+
+    # Bye songs (best seeds skip Round 1)
+    bye_songs = []
+    if any(r.round_number == 1 for r in rounds):
+        num_songs = db.session.query(func.count(Song.id)).scalar()
+        if num_songs > 0:
+            num_byes = bracket_engine.num_byes(num_songs)
+            if num_byes > 0:
+                bye_songs = Song.query.filter(
+                    Song.seed_number <= num_byes
+                ).order_by(Song.seed_number).all()
+
+    now = int(time.time())
+    rounds_data = []
+    for round_obj in rounds:
+        round_matchups = matchups_by_round[round_obj.id]
+        is_revealed = round_obj.id in revealed_round_ids
+
+        matchups_data = []
+        for matchup in round_matchups:
+            show_voters = is_revealed and matchup.song1_id and matchup.song2_id
+            matchups_data.append({
+                'matchup': matchup,
+                'song1': matchup.song1,
+                'song2': matchup.song2,
+                'song1_votes': matchup.get_vote_count(matchup.song1_id),
+                'song2_votes': matchup.get_vote_count(matchup.song2_id),
+                'song1_voters': voters.get((matchup.id, matchup.song1_id), []) if show_voters else [],
+                'song2_voters': voters.get((matchup.id, matchup.song2_id), []) if show_voters else [],
+                'user_vote': user_votes.get(matchup.id),
+                'is_tied': matchup.is_tied,
+                'tie_resolved_by_admin': matchup.tie_resolved_by_admin
+            })
+
+        is_voting_open = (
+            round_obj.status == 'active' and
+            (not round_obj.end_date or now <= round_obj.end_date)
+        )
+
+        finished_voters = []
+        unfinished_voters = []
+        if round_obj.id in open_round_ids:
+            finished_voters, unfinished_voters = _split_voters(
+                round_obj.id, len(round_matchups), votes_per_user, users
+            )
+
+        rounds_data.append({
+            'round': round_obj,
+            'matchups': matchups_data,
+            'bye_songs': bye_songs if round_obj.round_number == 1 else [],
+            'is_active': round_obj.status == 'active',
+            'is_voting_open': is_voting_open,
+            'finished_voters': finished_voters,
+            'unfinished_voters': unfinished_voters
+        })
+
+    return rounds_data
+
+
+# ==============================================================================
+# LIVE UPDATES (/soty/bracket/stream)
+# ==============================================================================
+
+class VoteNotifier:
+    """
+    Wakes live bracket streams in this worker as soon as a vote commits.
+
+    Streams in other workers don't see these notifications; they pick the
+    change up on their next poll (SOTY_STREAM_POLL_SECONDS).
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._sequence = 0
+
+    @property
+    def sequence(self):
+        return self._sequence
+
+    def notify(self):
+        """Signal that tournament data changed"""
+        with self._condition:
+            self._sequence += 1
+            self._condition.notify_all()
+
+    def wait(self, sequence, timeout):
+        """Block until a notification newer than `sequence` or timeout"""
+        with self._condition:
+            self._condition.wait_for(lambda: self._sequence != sequence, timeout=timeout)
+            return self._sequence
+
+
+vote_notifier = VoteNotifier()
+
+
+class StreamSlots:
+    """
+    Caps concurrent live bracket streams in this worker.
+
+    Every open stream holds a gunicorn thread, so without a cap a few dozen
+    open bracket tabs would take every thread and stall the whole site.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.active = 0
+
+    def acquire(self, limit):
+        """Take a slot; False if `limit` streams are already open"""
+        with self._lock:
+            if self.active >= limit:
+                return False
+            self.active += 1
+            return True
+
+    def release(self):
+        with self._lock:
+            self.active = max(self.active - 1, 0)
+
+
+stream_slots = StreamSlots()
+
+
+def live_bracket_snapshot(users):
+    """
+    Small, cheap snapshot of the parts of the bracket that change while a
+    round is live. Three column-only queries regardless of bracket size.
+
+    Vote counts aren't included: they stay hidden while a round is active,
+    and can't change once it's in tiebreaker.
+
+    Returns:
+        dict with 'rounds' {round_id: status} and
+        'voters' {round_id: {'finished': [...], 'unfinished': [...]}}
+    """
+    statuses = dict(db.session.query(Round.id, Round.status))
+    open_round_ids = [rid for rid, status in statuses.items() if status in ['active', 'tiebreaker']]
+
+    snapshot = {'rounds': statuses, 'voters': {}}
+    if not open_round_ids:
+        return snapshot
+
+    matchup_counts = dict(
+        db.session.query(Matchup.round_id, func.count(Matchup.id))
+        .filter(Matchup.round_id.in_(open_round_ids))
+        .group_by(Matchup.round_id)
+    )
+
+    votes_per_user = _votes_per_user(open_round_ids)
+    for round_id in open_round_ids:
+        finished, unfinished = _split_voters(round_id, matchup_counts.get(round_id, 0), votes_per_user, users)
+        snapshot['voters'][round_id] = {'finished': finished, 'unfinished': unfinished}
+
+    return snapshot
+
+
+def diff_bracket_snapshots(previous, current):
+    """
+    Compare two live snapshots and return the (event, data) deltas to push.
+
+    Events: 'round' (status changed, clients reload) and 'voters'
+    (finished/unfinished lists changed).
+    """
+    events = []
+    for round_id, status in current['rounds'].items():
+        if previous['rounds'].get(round_id) != status:
+            events.append(('round', {'round_id': round_id, 'status': status}))
+
+    for round_id, voters in current['voters'].items():
+        if previous['voters'].get(round_id) != voters:
+            events.append(('voters', {'round_id': round_id, **voters}))
+
+    return events
 
 
 # ==============================================================================
@@ -107,127 +808,259 @@ def load_songs_into_db():
 class SOTYTournamentService:
     """Service for SOTY tournament bracket management"""
 
+    @staticmethod
+    def _song_records():
+        """Load every song as a bracket_engine.SongRecord (one column query)"""
+        return [
+            bracket_engine.SongRecord(
+                song_id, submitter_id, popularity=popularity,
+                order_key=(created_at, song_id), seed=seed_number
+            )
+            for song_id, submitter_id, popularity, created_at, seed_number in db.session.query(
+                Song.id, Song.submitter_id, Song.popularity, Song.created_at, Song.seed_number
+            )
+        ]
+
     @staticmethod
     def seed_songs():
         """Seed all songs by popularity (LOWER = better seed)"""
-        songs = Song.query.all()
-
-        # Normalize NULL popularity to 100 (worst)
-        for song in songs:
-            if song.popularity is None:
-                song.popularity = 100
-
-        # Sort by popularity ascending (lower number = better seed)
-        seeded_songs = sorted(songs, key=lambda s: (s.popularity, s.created_at))
-
-        # Assign seed numbers
-        for idx, song in enumerate(seeded_songs):
-            song.seed_number = idx + 1
-
+        seeded = bracket_engine.seed(SOTYTournamentService._song_records())
+        if seeded:
+            # Normalize NULL popularity to 100 (worst) and store seeds in bulk
+            db.session.execute(db.update(Song), [
+                {
+                    'id': record.id,
+                    'seed_number': record.seed,
+                    'popularity': 100 if record.popularity is None else record.popularity
+                }
+                for record in seeded
+            ])
         db.session.commit()
-        return seeded_songs
+
+        songs_by_id = {song.id: song for song in Song.query.all()}
+        return [songs_by_id[record.id] for record in seeded]
 
     @staticmethod
     def generate_rounds():
         """Generate rounds based on song count"""
         song_count = Song.query.count()
-        if song_count < 2:
+        total_rounds = bracket_engine.num_rounds(song_count)
+        if total_rounds == 0:
             return []
 
-        # Calculate rounds needed for single-elimination bracket
-        num_rounds = math.ceil(math.log2(song_count))
-
-        rounds = []
-        for round_num in range(1, num_rounds + 1):
-            round_name = SOTYTournamentService._get_round_name(round_num, num_rounds)
-
-            round_obj = Round(
+        rounds = [
+            Round(
                 round_number=round_num,
-                name=round_name,
+                name=bracket_engine.round_name(round_num, total_rounds),
                 status='pending'
             )
-            db.session.add(round_obj)
-            rounds.append(round_obj)
-
+            for round_num in range(1, total_rounds + 1)
+        ]
+        db.session.add_all(rounds)
         db.session.commit()
         return rounds
 
     @staticmethod
-    def _get_round_name(round_num, total_rounds):
-        """Generate human-readable round names"""
-        rounds_from_end = total_rounds - round_num
-
-        if rounds_from_end == 0:
-            return "Finals"
-        elif rounds_from_end == 1:
-            return "Semifinals"
-        elif rounds_from_end == 2:
-            return "Quarterfinals"
+    def finalize_round(round_obj):
+        """
+        Finalize a round with set-based queries (two-phase tiebreaker support).
+
+        Phase 1 (active): one grouped aggregate tallies every matchup, ties
+        and winners are decided in memory, then matchups and songs are
+        updated with bulk UPDATE statements. Ties put the round into
+        'tiebreaker'; otherwise it completes and the next round is built.
+
+        Phase 2 (tiebreaker): once every tied matchup has an admin-selected
+        winner, those matchups and their songs are completed in bulk and the
+        next round is built.
+
+        Nothing is committed; the caller commits the whole transition
+        (results, next round matchups and data version) at once.
+
+        Returns:
+            dict with 'status' ('tiebreaker', 'unresolved' or 'completed'),
+            'tied' / 'unresolved' counts and 'next_round' (None when the
+            tournament is over or the round did not complete)
+        """
+        result = {'status': None, 'tied': 0, 'unresolved': 0, 'next_round': None}
+
+        if round_obj.status == 'active':
+            counts = defaultdict(int)
+            for matchup_id, song_id, count in db.session.query(
+                Vote.matchup_id, Vote.song_id, func.count(Vote.id)
+            ).join(
+                Matchup, Matchup.id == Vote.matchup_id
+            ).filter(
+                Matchup.round_id == round_obj.id
+            ).group_by(Vote.matchup_id, Vote.song_id):
+                counts[(matchup_id, song_id)] = count
+
+            matchup_updates = []
+            decided = []
+            for matchup_id, song1_id, song2_id in db.session.query(
+                Matchup.id, Matchup.song1_id, Matchup.song2_id
+            ).filter(Matchup.round_id == round_obj.id):
+                song1_votes = counts[(matchup_id, song1_id)] if song1_id else 0
+                song2_votes = counts[(matchup_id, song2_id)] if song2_id else 0
+                update = {'id': matchup_id, 'song1_votes': song1_votes, 'song2_votes': song2_votes}
+
+                if song1_id and song2_id and song1_votes == song2_votes:
+                    update['is_tied'] = True
+                    result['tied'] += 1
+                else:
+                    winner_id = None
+                    if song1_id and song2_id:
+                        winner_id = song1_id if song1_votes > song2_votes else song2_id
+                    update.update({
+                        'winner_song_id': winner_id,
+                        'tie_resolved_by_admin': False,
+                        'status': 'completed'
+                    })
+                    decided.append((song1_id, song2_id, winner_id))
+                matchup_updates.append(update)
+
+            if matchup_updates:
+                db.session.execute(db.update(Matchup), matchup_updates)
+            SOTYTournamentService._apply_song_results(round_obj.round_number, decided)
+
+            if result['tied']:
+                round_obj.status = 'tiebreaker'
+                round_obj.tiebreaker_end_date = int(time.time() + (48 * 3600))  # 48 hours minimum
+                result['status'] = 'tiebreaker'
+                return result
+
+        elif round_obj.status == 'tiebreaker':
+            tied = db.session.query(
+                Matchup.id, Matchup.song1_id, Matchup.song2_id, Matchup.winner_song_id
+            ).filter(
+                Matchup.round_id == round_obj.id,
+                Matchup.is_tied.is_(True)
+            ).all()
+
+            result['tied'] = len(tied)
+            result['unresolved'] = sum(1 for row in tied if not row.winner_song_id)
+            if result['unresolved']:
+                result['status'] = 'unresolved'
+                return result
+
+            if tied:
+                db.session.execute(
+                    db.update(Matchup),
+                    [{'id': row.id, 'status': 'completed'} for row in tied]
+                )
+            SOTYTournamentService._apply_song_results(
+                round_obj.round_number,
+                [(row.song1_id, row.song2_id, row.winner_song_id) for row in tied]
+            )
+
         else:
-            # Calculate participants in this round
-            participants = 2 ** (total_rounds - round_num + 1)
-            return f"Round of {participants}"
+            raise ValueError('Can only finalize active rounds or resolve tiebreakers')
+
+        # Round complete: build and activate the next round
+        db.session.expire_all()
+        round_obj.status = 'completed'
+        round_obj.end_date = int(time.time())
+        result['status'] = 'completed'
+
+        next_matchups = SOTYTournamentService.build_next_round_matchups(round_obj)
+        if next_matchups is not None:
+            next_round = Round.query.filter_by(
+                round_number=round_obj.round_number + 1
+            ).first()
+            next_round.status = 'active'
+            next_round.start_date = int(time.time())
+            next_round.end_date = int(time.time() + (96 * 3600))
+            result['next_round'] = next_round
+
+        return result
 
     @staticmethod
-    def _optimize_for_submitter_diversity(pairs):
+    def _apply_song_results(round_number, decided):
         """
-        Try to avoid same-submitter matchups by swapping songs between adjacent pairs.
+        Bulk-update songs for decided matchups: every song reached this
+        round, and every song that isn't the winner is eliminated.
 
         Args:
-            pairs: List of [song1, song2] pairs
+            round_number: Round being finalized
+            decided: List of (song1_id, song2_id, winner_song_id) tuples
+        """
+        reached = {song_id for pair in decided for song_id in pair[:2] if song_id}
+        losers = {
+            song_id
+            for song1_id, song2_id, winner_id in decided
+            for song_id in (song1_id, song2_id)
+            if song_id and song_id != winner_id
+        }
 
-        Returns:
-            Optimized list of [song1, song2] pairs
+        if reached:
+            Song.query.filter(Song.id.in_(reached)).update({
+                Song.max_round_reached: db.case(
+                    (Song.max_round_reached < round_number, round_number),
+                    else_=Song.max_round_reached
+                )
+            }, synchronize_session=False)
+        if losers:
+            Song.query.filter(Song.id.in_(losers)).update(
+                {Song.is_alive: False}, synchronize_session=False
+            )
+
+    @staticmethod
+    def _log_pairing(round_obj, matchup_records, report):
+        """Log submitter-diversity results for a newly paired round"""
+        if report.conflicts_removed:
+            logger.info(
+                f"{round_obj.name}: removed {report.conflicts_removed} of "
+                f"{report.conflicts_before} same-submitter matchup(s)"
+            )
+
+        for record in matchup_records:
+            # Log warning if same submitter (unavoidable within the swap distance)
+            if record.song1.submitter_id == record.song2.submitter_id:
+                logger.warning(
+                    f"Unavoidable same-submitter matchup in {round_obj.name}: "
+                    f"Seed {record.song1.seed} (song {record.song1.id}) vs "
+                    f"Seed {record.song2.seed} (song {record.song2.id}) - "
+                    f"Both submitted by user {record.song1.submitter_id}"
+                )
+
+    @staticmethod
+    def _insert_matchups(round_obj, matchup_records):
         """
-        # Deep copy to avoid mutations
-        optimized = [pair.copy() for pair in pairs]
-
-        for i in range(len(optimized)):
-            song1, song2 = optimized[i]
-
-            # If same submitter, try to swap
-            if song1.submitter_id == song2.submitter_id:
-                # Try swapping song2 with song1 of next pair
-                if i + 1 < len(optimized):
-                    next_pair = optimized[i + 1]
-
-                    # Test swap: current becomes (song1, next_pair[0]), next becomes (song2, next_pair[1])
-                    if (song1.submitter_id != next_pair[0].submitter_id and
-                        song2.submitter_id != next_pair[1].submitter_id):
-                        # Swap resolves conflict without creating new ones
-                        optimized[i] = [song1, next_pair[0]]
-                        optimized[i + 1] = [song2, next_pair[1]]
-                        continue
-
-                    # Alternative swap: current becomes (song1, next_pair[1]), next becomes (next_pair[0], song2)
-                    if (song1.submitter_id != next_pair[1].submitter_id and
-                        next_pair[0].submitter_id != song2.submitter_id):
-                        optimized[i] = [song1, next_pair[1]]
-                        optimized[i + 1] = [next_pair[0], song2]
-                        continue
-
-                # Try swapping with previous pair if next didn't work
-                if i > 0:
-                    prev_pair = optimized[i - 1]
-
-                    # Test swap: prev becomes (prev_pair[0], song1), current becomes (prev_pair[1], song2)
-                    if (prev_pair[0].submitter_id != song1.submitter_id and
-                        prev_pair[1].submitter_id != song2.submitter_id):
-                        optimized[i - 1] = [prev_pair[0], song1]
-                        optimized[i] = [prev_pair[1], song2]
-                        continue
-
-        return optimized
+        Persist engine MatchupRecords for a round with one bulk INSERT.
+
+        Doesn't commit: the caller commits it together with the rest of the
+        round change (and the data version bump).
+        """
+        if matchup_records:
+            now = datetime.utcnow()
+            db.session.execute(db.insert(Matchup), [
+                {
+                    'round_id': round_obj.id,
+                    'position_in_round': record.position,
+                    'song1_id': record.song1.id,
+                    'song2_id': record.song2.id,
+                    'status': 'pending',
+                    'created_at': now,
+                    'updated_at': now
+                }
+                for record in matchup_records
+            ])
+        return matchup_records
 
     @staticmethod
     def generate_matchups(seeded_songs):
         """
         Generate ONLY Round 1 matchups for the tournament bracket.
-        Future rounds are built on-demand as rounds are finalized.
+        Future rounds are built on-demand as rounds are finalized. The
+        caller commits.
+
+        Returns:
+            dict with 'round_1_matchups' (bracket_engine.MatchupRecords),
+            'total_matchups' and 'num_byes'
         """
         song_count = len(seeded_songs)
         if song_count < 2:
-            return {'round_1_matchups': [], 'total_matchups': 0, 'num_byes': 0}
+            return {'round_1_matchups': [], 'total_matchups': 0, 'num_byes': 0, 'conflicts_removed': 0}
 
         # Get Round 1 (should already exist from generate_rounds)
         round_1 = Round.query.filter_by(round_number=1).first()
@@ -235,51 +1068,20 @@ class SOTYTournamentService:
         if not round_1:
             raise ValueError("Round 1 does not exist. Call generate_rounds() first.")
 
-        # Calculate bracket size (next power of 2)
-        bracket_size = 2 ** math.ceil(math.log2(song_count))
-        num_byes = bracket_size - song_count
-
-        # Round 1: Create matchups for non-bye songs
-        # Best seeds (lowest seed_numbers) get byes, remaining songs compete in Round 1
-        songs_in_round_1 = seeded_songs[num_byes:]  # Skip best N seeds
-
-        # Step 1: Create initial consecutive pairs (seed 3 vs 4, 5 vs 6, etc.)
-        initial_pairs = []
-        for i in range(0, len(songs_in_round_1), 2):
-            if i + 1 < len(songs_in_round_1):
-                initial_pairs.append([songs_in_round_1[i], songs_in_round_1[i + 1]])
-
-        # Step 2: Optimize for submitter diversity (avoid same-submitter matchups)
-        optimized_pairs = SOTYTournamentService._optimize_for_submitter_diversity(initial_pairs)
-
-        # Step 3: Create matchup objects
-        round_1_matchups = []
-        for i, (song1, song2) in enumerate(optimized_pairs):
-            # Log warning if same submitter (unavoidable)
-            if song1.submitter_id == song2.submitter_id:
-                logger.warning(
-                    f"Unavoidable same-submitter matchup: "
-                    f"Seed {song1.seed_number} ({song1.title}) vs "
-                    f"Seed {song2.seed_number} ({song2.title}) - "
-                    f"Both submitted by user {song1.submitter_id}"
-                )
-
-            matchup = Matchup(
-                round_id=round_1.id,
-                position_in_round=i,
-                song1_id=song1.id,
-                song2_id=song2.id,
-                status='pending'
-            )
-            db.session.add(matchup)
-            round_1_matchups.append(matchup)
+        records = [
+            bracket_engine.SongRecord(song.id, song.submitter_id, seed=song.seed_number)
+            for song in seeded_songs
+        ]
+        bye_songs, round_1_matchups, report = bracket_engine.first_round(records)
+        SOTYTournamentService._log_pairing(round_1, round_1_matchups, report)
 
-        db.session.commit()
+        SOTYTournamentService._insert_matchups(round_1, round_1_matchups)
 
         return {
             'round_1_matchups': round_1_matchups,
             'total_matchups': len(round_1_matchups),
-            'num_byes': num_byes
+            'num_byes': len(bye_songs),
+            'conflicts_removed': report.conflicts_removed
         }
 
     @staticmethod
@@ -300,90 +1102,34 @@ class SOTYTournamentService:
         if not next_round:
             return None  # Tournament complete
 
-        # Get winners from completed round
-        completed_matchups = Matchup.query.filter_by(
-            round_id=completed_round.id
-        ).order_by(Matchup.position_in_round).all()
+        songs = {record.id: record for record in SOTYTournamentService._song_records()}
 
+        # Winners from completed round, in POSITION order (never sort by seed:
+        # neighboring matchups meet in the next round)
         winners = []
-        for matchup in completed_matchups:
-            winner = matchup.get_winner()
+        for winner_song_id, song1_id, song2_id, song1_votes, song2_votes in db.session.query(
+            Matchup.winner_song_id, Matchup.song1_id, Matchup.song2_id,
+            Matchup.song1_votes, Matchup.song2_votes
+        ).filter(
+            Matchup.round_id == completed_round.id
+        ).order_by(Matchup.position_in_round):
+            if winner_song_id:
+                winner = songs.get(winner_song_id)
+            else:
+                winner = bracket_engine.pick_winner(
+                    bracket_engine.MatchupRecord(0, songs.get(song1_id), songs.get(song2_id)),
+                    song1_votes, song2_votes
+                )
             if winner:
                 winners.append(winner)
 
-        # Special case: Round 1 � Round 2 (handle byes)
         if completed_round.round_number == 1:
-            # Get bye songs by seed_number (best seeds got byes)
-            num_songs = Song.query.count()
-            bracket_size = 2 ** math.ceil(math.log2(num_songs))
-            num_byes = bracket_size - num_songs
-
-            bye_songs = Song.query.filter(
-                Song.seed_number <= num_byes
-            ).order_by(Song.seed_number).all()
-
-            return SOTYTournamentService._build_round_2_with_byes(
-                next_round, winners, bye_songs
-            )
-
-        # Normal case: pair winners by POSITION (not seed)
-        # This creates traditional bracket structure where neighboring
-        # matchups face each other in the next round
-        matchups_created = []
-
-        # Winners are already in position order from the query above
-        # Do NOT sort by seed - this would break bracket structure!
-        winners_by_position = winners
-
-        # Pair consecutive positions: 0+1, 2+3, 4+5, etc.
-        for i in range(0, len(winners_by_position), 2):
-            if i + 1 < len(winners_by_position):
-                matchup = Matchup(
-                    round_id=next_round.id,
-                    position_in_round=i // 2,
-                    song1_id=winners_by_position[i].id,
-                    song2_id=winners_by_position[i + 1].id,
-                    status='pending'
-                )
-                db.session.add(matchup)
-                matchups_created.append(matchup)
-
-        db.session.commit()
-        return matchups_created
-
-    @staticmethod
-    def _build_round_2_with_byes(next_round, round_1_winners, bye_songs):
-        """
-        Build Round 2 matchups with bye songs and Round 1 winners.
-        Uses position-based pairing for traditional bracket structure.
-        """
-        matchups_created = []
-
-        # Sort bye songs by seed_number (best to worst)
-        sorted_byes = sorted(bye_songs, key=lambda s: s.seed_number)
-
-        # Keep R1 winners in POSITION ORDER from their Round 1 matchups
-        # Do NOT sort by seed - they come from build_next_round_matchups
-        # already ordered by position_in_round
-        winners_by_position = round_1_winners
-
-        # Combine for traditional bracket structure:
-        # Byes fill left side, R1 winners fill right side
-        all_advancing = sorted_byes + winners_by_position
-
-        # Pair consecutive positions: 0+1, 2+3, etc.
-        # This creates traditional bracket where neighbors meet
-        for i in range(0, len(all_advancing), 2):
-            if i + 1 < len(all_advancing):
-                matchup = Matchup(
-                    round_id=next_round.id,
-                    position_in_round=i // 2,
-                    song1_id=all_advancing[i].id,
-                    song2_id=all_advancing[i + 1].id,
-                    status='pending'
-                )
-                db.session.add(matchup)
-                matchups_created.append(matchup)
+            # Round 1 -> Round 2: best seeds got byes
+            byes = bracket_engine.num_byes(len(songs))
+            bye_songs = [s for s in songs.values() if s.seed is not None and s.seed <= byes]
+            matchups, report = bracket_engine.second_round(bye_songs, winners)
+        else:
+            matchups, report = bracket_engine.next_round(winners)
 
-        db.session.commit()
-        return matchups_created
+        SOTYTournamentService._log_pairing(next_round, matchups, report)
+        return SOTYTournamentService._insert_matchups(next_round, matchups)
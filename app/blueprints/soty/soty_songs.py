@@ -1,362 +0,0 @@
-SOTY_SONGS = [
-    {
-        "submitter_id": 2,
-        "spotify_track_id": "1Bmszn7gaym9lx8CGrq2SA",
-        "title": "All The Way (feat. Bailey Zimmerman)",
-        "artist": "BigXthaPlug, Bailey Zimmerman",
-        "album": "I Hope You're Happy (Deluxe)",
-        "release_date": "2025-11-21",
-        "popularity": 51,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b27337dae0cb3a9fdb6d7838b176",
-        "isrc_number": "QZLL92584883",
-        "apple_music_id": "1802459710",
-    },
-    {
-        "submitter_id": 6,
-        "spotify_track_id": "06vnM67RcfQcc7oPQRA9tP",
-        "title": "Diet Pepsi (Live at Sirius XMU)",
-        "artist": "Blondshell",
-        "album": "Diet Pepsi (Live at Sirius XMU)",
-        "release_date": "2025-06-12",
-        "popularity": 48,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2734a4543bdf5413e3f480d6966",
-        "isrc_number": "USBQU2500182",
-        "apple_music_id": "1818467226",
-    },
-    {
-        "submitter_id": 9,
-        "spotify_track_id": "45hNb2Uha7uFTSpTWVDGt4",
-        "title": "Where The City Can't See",
-        "artist": "Blood Cultures",
-        "album": "Skate Story: Vol. I",
-        "release_date": "2025-12-08",
-        "popularity": 48,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2734081cbb113d169edb8448d74",
-        "isrc_number": "CA5KR2586674",
-        "apple_music_id": "1833119831",
-    },
-    {
-        "submitter_id": 3,
-        "spotify_track_id": "4XosapYiYaXGcxc83p3DD9",
-        "title": "Everything Is Peaceful Love",
-        "artist": "Bon Iver",
-        "album": "SABLE, fABLE",
-        "release_date": "2025-04-11",
-        "popularity": 61,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b27330d93b9cce660d4f56770efb",
-        "isrc_number": "US38Y2445002",
-        "apple_music_id": "1791161236",
-    },
-    {
-        "submitter_id": 4,
-        "spotify_track_id": "5CKp1RqaCeUYDGqo14KMfU",
-        "title": "Options",
-        "artist": "Cameron Whitcomb",
-        "album": "Options",
-        "release_date": "2025-03-07",
-        "popularity": 65,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2733cbd393f432658be0d93dacd",
-        "isrc_number": "USAT22501076",
-        "apple_music_id": "1800569626",
-    },
-    {
-        "submitter_id": 4,
-        "spotify_track_id": "3cZajhyr8LmtPfHZ9296tj",
-        "title": "No Broke Boys",
-        "artist": "Disco Lines, Tinashe",
-        "album": "No Broke Boys",
-        "release_date": "2025-06-06",
-        "popularity": 93,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2735dcede7ece7b2cb72cee4eee",
-        "isrc_number": "USAT22504362",
-        "apple_music_id": "1818761158",
-    },
-    {
-        "submitter_id": 3,
-        "spotify_track_id": "5jRKYf6UqyjIFf8dagJ9pT",
-        "title": "The Love On High",
-        "artist": "Electric Guest",
-        "album": "10K",
-        "release_date": "2025-10-10",
-        "popularity": 35,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273cebc08b020866eb9942b8f9e",
-        "isrc_number": "QMDA62570051",
-        "apple_music_id": "1827309202",
-    },
-    {
-        "submitter_id": 5,
-        "spotify_track_id": "1lbNgoJ5iMrMluCyhI4OQP",
-        "title": "Victory Lap",
-        "artist": "Fred again.., Skepta, Plaqueboymax",
-        "album": "Victory Lap",
-        "release_date": "2025-06-18",
-        "popularity": 84,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273ed96e511d87235ac3e767382",
-        "isrc_number": "GBAHS2500558",
-        "apple_music_id": "1836177113",
-    },
-    {
-        "submitter_id": 3,
-        "spotify_track_id": "2262bWmqomIaJXwCRHr13j",
-        "title": "Sailor Song",
-        "artist": "Gigi Perez",
-        "album": "Sailor Song",
-        "release_date": "2024-07-26",
-        "popularity": 88,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273e6065f209e0a01986206bd53",
-        "isrc_number": "USHM92438095",
-        "apple_music_id": "1770187510",
-    },
-    {
-        "submitter_id": 4,
-        "spotify_track_id": "1fLTi1wA2FPONA5SAIoKJX",
-        "title": "Home",
-        "artist": "Good Neighbours",
-        "album": "Blue Sky Mentality",
-        "release_date": "2025-10-03",
-        "popularity": 74,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b27344a3683d06ee71a5c63bcb4d",
-        "isrc_number": "GBUM72400322",
-        "apple_music_id": "1726004708",
-    },
-    {
-        "submitter_id": 2,
-        "spotify_track_id": "7t0ohvf7w4e8VacR124wbA",
-        "title": "doing my best",
-        "artist": "Hazlett",
-        "album": "last night you said you missed me",
-        "release_date": "2025-09-12",
-        "popularity": 71,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273403906926a4bb7f3aec4748a",
-        "isrc_number": "SE5262500102",
-        "apple_music_id": "1789694732",
-    },
-    {
-        "submitter_id": 5,
-        "spotify_track_id": "1QnFKAPgZ7GI9sYITPuYyL",
-        "title": "If You Know Me",
-        "artist": "Hudson Freeman",
-        "album": "If You Know Me / Wild Horses",
-        "release_date": "2025-11-14",
-        "popularity": 63,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2730de9abdbb90099d470dfad16",
-        "isrc_number": "QMFMF2534993",
-        "apple_music_id": "1846026269",
-    },
-    {
-        "submitter_id": 1,
-        "spotify_track_id": "2bWlEirBgnK78PY6ITEcZG",
-        "title": "Using You",
-        "artist": "Jack Van Cleaf",
-        "album": "JVC",
-        "release_date": "2025-05-09",
-        "popularity": 34,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b27301076506b7b37d857c6a9677",
-        "isrc_number": "USDMG2585805",
-        "apple_music_id": "1790934905",
-    },
-    {
-        "submitter_id": 2,
-        "spotify_track_id": "3diMgXk3RxGChNwsAVqyIL",
-        "title": "Burn Me",
-        "artist": "Jonah Kagen, Sam Barber",
-        "album": "Burn Me",
-        "release_date": "2025-05-16",
-        "popularity": 59,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273f268e2e6ef2e54b47f3e4c6d",
-        "isrc_number": "USAR12500127",
-        "apple_music_id": "1811873211",
-    },
-    {
-        "submitter_id": 6,
-        "spotify_track_id": "6XA6bozZwlowStujsKQoIY",
-        "title": "Home - Tom Sharkett Edit",
-        "artist": "LCD Soundsystem, Tom Sharkett",
-        "album": "Home (Tom Sharkett Edit)",
-        "release_date": "2025-06-20",
-        "popularity": 41,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273693168bc9b8afb67e1f5d311",
-        "isrc_number": "GBAYE2500601",
-        "apple_music_id": "1820883301",
-    },
-    {
-        "submitter_id": 6,
-        "spotify_track_id": "73vfMXcXa6iY1E3lpf2fZO",
-        "title": "Pussy Palace",
-        "artist": "Lily Allen",
-        "album": "West End Girl",
-        "release_date": "2025-10-24",
-        "popularity": 79,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2734eb9559de1a99d358e47794b",
-        "isrc_number": "GB5KW2501372",
-        "apple_music_id": "1846342309",
-    },
-    {
-        "submitter_id": 10,
-        "spotify_track_id": "1cQQB9z7fNQQ2VzSkslt7Y",
-        "title": "Current Affairs",
-        "artist": "Lorde",
-        "album": "Virgin",
-        "release_date": "2025-06-27",
-        "popularity": 69,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b27323d41bf736920a032e222a78",
-        "isrc_number": "NZUM72500025",
-        "apple_music_id": "1810905315",
-    },
-    {
-        "submitter_id": 7,
-        "spotify_track_id": "2SGj1WdNaTwW00cz9GO1AO",
-        "title": "Colorado, TX",
-        "artist": "Mah Moud",
-        "album": "Colorado, TX",
-        "release_date": "2025-07-10",
-        "popularity": 29,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2735ab081818888404b0298c316",
-        "isrc_number": "AUGBT2501766",
-        "apple_music_id": "1822709218",
-    },
-    {
-        "submitter_id": 9,
-        "spotify_track_id": "3OQk21nMrEPnc5KXePcv6E",
-        "title": "All I Need",
-        "artist": "Maribou State, Andreya Triana",
-        "album": "Hallucinating Love",
-        "release_date": "2025-01-31",
-        "popularity": 63,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2739b7212753b91d1bb6ce3e27e",
-        "isrc_number": "GBCFB2300770",
-        "apple_music_id": "1716588299",
-    },
-    {
-        "submitter_id": 1,
-        "spotify_track_id": "3a73t7XIrNt6i3G4f3hw9E",
-        "title": "Mean Streak",
-        "artist": "Next of Kin",
-        "album": "Homemaker",
-        "release_date": "2025-05-09",
-        "popularity": 12,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b27369a790371e3f121992b0c2c5",
-        "isrc_number": "TCAJC2409833",
-        "apple_music_id": "1785740381",
-    },
-    {
-        "submitter_id": 7,
-        "spotify_track_id": "2P362P669T4HGZQeFVucgO",
-        "title": "We Didn’t Know We Were Ready (feat. Niamh Regan & Ye Vagabonds)",
-        "artist": "Ólafur Arnalds, Talos, Niamh Regan, Ye Vagabonds",
-        "album": "A Dawning",
-        "release_date": "2025-07-11",
-        "popularity": 46,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273a6a91e5acd57c548af8af674",
-        "isrc_number": "GBBBA2500001",
-        "apple_music_id": "1811135606",
-    },
-    {
-        "submitter_id": 8,
-        "spotify_track_id": "5gGqgnain6yTxQF6UJagqL",
-        "title": "Philomene",
-        "artist": "Pedro Lima, Os Leononses",
-        "album": "Philomene",
-        "release_date": "2025-04-22",
-        "popularity": 8,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273b221f8b300fc556de4eb87f7",
-        "isrc_number": "DEG932401624",
-        "apple_music_id": "1806091136",
-    },
-    {
-        "submitter_id": 5,
-        "spotify_track_id": "7DTE4ib3z3j2syoUnRogPu",
-        "title": "Breathing the Same Air",
-        "artist": "Petey USA",
-        "album": "Breathing the Same Air",
-        "release_date": "2025-06-11",
-        "popularity": 32,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273e497705d55174a6d58076df0",
-        "isrc_number": "USUG12502687",
-        "apple_music_id": "1818421904",
-    },
-    {
-        "submitter_id": 9,
-        "spotify_track_id": "6ATGoNeKZih1AhZ8Ossy1H",
-        "title": "One",
-        "artist": "Richy Mitch & The Coal Miners",
-        "album": "No Silent Monks",
-        "release_date": "2025-07-18",
-        "popularity": 43,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273cdf6fda19ebb8a828e3da595",
-        "isrc_number": "QM24S2503382",
-        "apple_music_id": "1818610193",
-    },
-    {
-        "submitter_id": 7,
-        "spotify_track_id": "2TugrDKkd55mfVOMVZsfO8",
-        "title": "who’s your boyfriend",
-        "artist": "Royel Otis",
-        "album": "hickey",
-        "release_date": "2025-08-21",
-        "popularity": 74,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b27349fab21f824cbecbec65299b",
-        "isrc_number": "USUG12503064",
-        "apple_music_id": "1820543514",
-    },
-    {
-        "submitter_id": 10,
-        "spotify_track_id": "7qSaRUz9tOTtjzzifPL2Jv",
-        "title": "Feelings Gone (feat. London Grammar)",
-        "artist": "SG Lewis, London Grammar",
-        "album": "Anemoia",
-        "release_date": "2025-09-05",
-        "popularity": 51,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273aa27d91a0a454d2311713534",
-        "isrc_number": "GBUM72503542",
-        "apple_music_id": "1820217698",
-    },
-    {
-        "submitter_id": 8,
-        "spotify_track_id": "3M61o9wFaLaCqixyKx8DC2",
-        "title": "No Joy",
-        "artist": "The Beths",
-        "album": "Straight Line Was A Lie",
-        "release_date": "2025-08-29",
-        "popularity": 47,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273e424e18a3aae3eb22b1159da",
-        "isrc_number": "USEP42520004",
-        "apple_music_id": "1817137578",
-    },
-    {
-        "submitter_id": 10,
-        "spotify_track_id": "0k9JIBszlCqCa4SpXI353F",
-        "title": "BIRDS",
-        "artist": "Turnstile",
-        "album": "SEEIN’ STARS / BIRDS",
-        "release_date": "2025-04-30",
-        "popularity": 56,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b2730415d8e544c8a6640836067e",
-        "isrc_number": "NLA322500073",
-        "apple_music_id": "1805821732",
-    },
-    {
-        "submitter_id": 1,
-        "spotify_track_id": "5dUCixiCL0CcIUdlgUl1ct",
-        "title": "Oneida",
-        "artist": "Tyler Childers",
-        "album": "Snipe Hunter",
-        "release_date": "2025-07-25",
-        "popularity": 66,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273e47f3451435776271b3d43da",
-        "isrc_number": "USRC12500849",
-        "apple_music_id": "1818394045",
-    },
-    {
-        "submitter_id": 8,
-        "spotify_track_id": "5RYBjITAd8YJ24ugbTU4Yr",
-        "title": "Chicago Summer",
-        "artist": "Vulfmon, Evangeline, Woody Goss",
-        "album": "Deg",
-        "release_date": "2025-10-20",
-        "popularity": 43,
-        "artwork_url": "https://i.scdn.co/image/ab67616d0000b273185b779570241a3f524f0e55",
-        "isrc_number": "QZTB32562713",
-        "apple_music_id": "1846478598",
-    },
-]
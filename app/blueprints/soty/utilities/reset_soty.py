@@ -6,13 +6,14 @@ Usage:
     python reset_soty.py              # Delete data and reload songs
     python reset_soty.py --schema     # Recreate tables + reload songs
     python reset_soty.py --migrate    # Run migrations + reload songs
+    python reset_soty.py --season 2026  # Load another season's catalog
 """
 import sys
 import argparse
 import os
 from app import create_app, db
 from app.blueprints.soty.models import Song, Round, Matchup, Vote
-from app.blueprints.soty.services import load_songs_into_db
+from app.blueprints.soty.services import load_songs_into_db, bump_data_version
 
 
 def reset_schema():
@@ -76,6 +77,7 @@ def reset_data():
         Round.query.delete()
         Song.query.delete()
 
+        bump_data_version()
         db.session.commit()
         print("✅ Existing SOTY data deleted")
     except Exception as e:
@@ -84,12 +86,16 @@ def reset_data():
         raise
 
 
-def load_songs():
-    """Load songs from soty_songs.py"""
-    print("\n📦 Loading songs from soty_songs.py...")
+def load_songs(season):
+    """Load songs from the season's catalog file"""
+    print(f"\n📦 Loading songs from the {season} catalog...")
 
     try:
-        load_songs_into_db()
+        counts = load_songs_into_db(season=season)
+        print(
+            f"  {counts['inserted']} inserted, {counts['updated']} updated, "
+            f"{counts['unchanged']} unchanged"
+        )
 
         # Count and display songs
         song_count = Song.query.count()
@@ -137,6 +143,11 @@ Examples:
         help='Only reload song data (skip schema changes)'
     )
 
+    parser.add_argument(
+        '--season',
+        help='Catalog season to load (default: SOTY_SEASON config)'
+    )
+
     args = parser.parse_args()
 
 
@@ -168,7 +179,7 @@ Examples:
                 reset_data()
 
             # Load songs
-            song_count = load_songs()
+            song_count = load_songs(args.season or app.config['SOTY_SEASON'])
 
             print("\n" + "=" * 60)
             print(f"✨ Reset complete! {song_count} songs ready for tournament")
@@ -1,124 +1,332 @@
-"""Spotify API service for fetching song metadata"""
+#!/usr/bin/env python3
+"""
+Fetch SOTY song metadata from Spotify and song.link
 
-import spotipy
+Track metadata comes from Spotify's batch tracks endpoint (50 ids per call);
+Apple Music ids come from song.link, looked up concurrently on a bounded
+thread pool. Rate-limited (429) responses are retried with backoff, honoring
+Retry-After, and every response is cached on disk by track id so a refresh
+only hits the network for new tracks.
+
+Usage:
+    python spotify_data.py                                  # Refresh the latest season
+    python spotify_data.py --season 2026 --input tracks.json  # Build a new season
+    python spotify_data.py --refresh                        # Ignore cached responses
+
+Credentials are read from SPOTIFY_CLIENT_ID / SPOTIFY_CLIENT_SECRET.
+"""
+import argparse
+import json
+import logging
+import os
+import sys
+import threading
 import time
-from spotipy.oauth2 import SpotifyClientCredentials
+from concurrent.futures import ThreadPoolExecutor
+
 import requests
+import spotipy
+from requests.adapters import HTTPAdapter
+from spotipy.oauth2 import SpotifyClientCredentials
 
+logger = logging.getLogger(__name__)
 
-SOTY_SONGS = [
-    "1Bmszn7gaym9lx8CGrq2SA",
-    "06vnM67RcfQcc7oPQRA9tP",
-    "45hNb2Uha7uFTSpTWVDGt4",
-    "4XosapYiYaXGcxc83p3DD9",
-    "5CKp1RqaCeUYDGqo14KMfU",
-    "3cZajhyr8LmtPfHZ9296tj",
-    "5jRKYf6UqyjIFf8dagJ9pT",
-    "1lbNgoJ5iMrMluCyhI4OQP",
-    "2262bWmqomIaJXwCRHr13j",
-    "1fLTi1wA2FPONA5SAIoKJX",
-    "7t0ohvf7w4e8VacR124wbA",
-    "1QnFKAPgZ7GI9sYITPuYyL",
-    "2bWlEirBgnK78PY6ITEcZG",
-    "3diMgXk3RxGChNwsAVqyIL",
-    "6XA6bozZwlowStujsKQoIY",
-    "73vfMXcXa6iY1E3lpf2fZO",
-    "1cQQB9z7fNQQ2VzSkslt7Y",
-    "2SGj1WdNaTwW00cz9GO1AO",
-    "3OQk21nMrEPnc5KXePcv6E",
-    "3a73t7XIrNt6i3G4f3hw9E",
-    "2P362P669T4HGZQeFVucgO",
-    "5gGqgnain6yTxQF6UJagqL",
-    "7DTE4ib3z3j2syoUnRogPu",
-    "6ATGoNeKZih1AhZ8Ossy1H",
-    "2TugrDKkd55mfVOMVZsfO8",
-    "7qSaRUz9tOTtjzzifPL2Jv",
-    "3M61o9wFaLaCqixyKx8DC2",
-    "0k9JIBszlCqCa4SpXI353F",
-    "5dUCixiCL0CcIUdlgUl1ct",
-    "5RYBjITAd8YJ24ugbTU4Yr",
-
-]
-
-
-class SpotifyService:
-    """Service for interacting with Spotify API"""
-
-    def __init__(self, client_id, client_secret):
-        """Initialize Spotify client with credentials"""
-        self.sp = spotipy.Spotify(
-            auth_manager=SpotifyClientCredentials(
-                client_id=client_id, client_secret=client_secret
-            )
-        )
+SONGLINK_URL = 'https://api.song.link/v1-alpha.1/links'
+SPOTIFY_BATCH_SIZE = 50
+DEFAULT_MAX_WORKERS = 8
+DEFAULT_MAX_RETRIES = 5
+DEFAULT_BACKOFF_SECONDS = 1.0
+NO_APPLE_MUSIC_ID = 'NO_ID'
+
+DEFAULT_CACHE_DIR = os.path.abspath(os.path.join(
+    os.path.dirname(__file__), '..', '..', '..', '..', 'instance', 'spotify_cache'
+))
+
+
+class RateLimited(Exception):
+    """A 429 response, with the server's Retry-After (seconds) if given"""
+
+    def __init__(self, retry_after=None):
+        super().__init__(f"Rate limited (Retry-After: {retry_after})")
+        self.retry_after = retry_after
+
+
+def _retry_after_seconds(headers):
+    try:
+        return float(headers.get('Retry-After'))
+    except (TypeError, ValueError):
+        return None
+
+
+def with_backoff(fn, max_retries=DEFAULT_MAX_RETRIES, backoff=DEFAULT_BACKOFF_SECONDS, sleep=time.sleep):
+    """
+    Call fn(), retrying on RateLimited with exponential backoff.
+
+    The server's Retry-After wins over the computed delay when present.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return fn()
+        except RateLimited as e:
+            if attempt == max_retries:
+                raise
+            delay = e.retry_after if e.retry_after is not None else backoff * (2 ** attempt)
+            logger.warning(f"Rate limited, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_retries})")
+            sleep(delay)
+
+
+def spotify_client(**kwargs):
+    """
+    spotipy.Spotify on a plain requests session.
+
+    spotipy's default session retries through urllib3 and, once retries run
+    out, reports any 429 or 5xx as a 429 without headers. A plain session
+    raises the real status with its headers, so Retry-After reaches
+    with_backoff and a 5xx isn't mistaken for a rate limit.
+    """
+    return spotipy.Spotify(requests_session=requests.Session(), **kwargs)
+
+
+def track_metadata(track):
+    """Catalog fields from a Spotify track object"""
+    images = track['album'].get('images') or []
+    return {
+        'title': track['name'],
+        'artist': ', '.join(artist['name'] for artist in track['artists']),
+        'album': track['album']['name'],
+        'release_date': track['album'].get('release_date'),
+        'popularity': track.get('popularity'),
+        'artwork_url': images[0]['url'] if images else None,
+        'isrc_number': track.get('external_ids', {}).get('isrc'),
+    }
+
+
+class ResponseCache:
+    """On-disk JSON cache with one file per track id"""
+
+    def __init__(self, cache_dir):
+        self.cache_dir = cache_dir
+        os.makedirs(cache_dir, exist_ok=True)
 
-    def get_track_metadata(self, track_id):
-        """Fetch song metadata from Spotify URL
+    def _path(self, track_id):
+        return os.path.join(self.cache_dir, f'{track_id}.json')
 
+    def get(self, track_id):
+        try:
+            with open(self._path(track_id), encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def update(self, track_id, **fields):
+        entry = self.get(track_id)
+        entry.update(fields)
+        # Write-then-rename so an interrupted run never leaves a torn file
+        tmp_path = f'{self._path(track_id)}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(entry, f)
+        os.replace(tmp_path, self._path(track_id))
+
+
+class SpotifyCatalogFetcher:
+    """Batch, concurrent and cached metadata fetcher for SOTY tracks"""
+
+    def __init__(self, spotify=None, songlink_url=SONGLINK_URL, cache_dir=DEFAULT_CACHE_DIR,
+                 max_workers=DEFAULT_MAX_WORKERS, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff=DEFAULT_BACKOFF_SECONDS, refresh=False, sleep=time.sleep):
+        """
         Args:
-            url: Spotify track URL
+            spotify: spotipy.Spotify client (defaults to client credentials
+                from SPOTIFY_CLIENT_ID / SPOTIFY_CLIENT_SECRET)
+            songlink_url: song.link links endpoint
+            cache_dir: Directory for cached responses
+            max_workers: Concurrent song.link lookups
+            max_retries: Retries per request on 429
+            backoff: Base delay (seconds) when no Retry-After is sent
+            refresh: Ignore cached responses (they are still rewritten)
+            sleep: Callable used to wait between retries
+        """
+        self.spotify = spotify or self._spotify_from_env()
+        self.songlink_url = songlink_url
+        self.cache = ResponseCache(cache_dir)
+        self.max_workers = max_workers
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.refresh = refresh
+        self.sleep = sleep
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+    @staticmethod
+    def _spotify_from_env():
+        client_id = os.environ.get('SPOTIFY_CLIENT_ID')
+        client_secret = os.environ.get('SPOTIFY_CLIENT_SECRET')
+        if not client_id or not client_secret:
+            raise ValueError("SPOTIFY_CLIENT_ID and SPOTIFY_CLIENT_SECRET must be set")
+        # Retries are handled here (with Retry-After) rather than inside spotipy
+        return spotify_client(
+            auth_manager=SpotifyClientCredentials(client_id=client_id, client_secret=client_secret)
+        )
+
+    def _backoff(self, fn):
+        return with_backoff(fn, max_retries=self.max_retries, backoff=self.backoff, sleep=self.sleep)
+
+    # ------------------------------------------------------------------
+    # Spotify
+    # ------------------------------------------------------------------
+
+    def _fetch_track_batch(self, track_ids):
+        def call():
+            try:
+                return self.spotify.tracks(track_ids)
+            except spotipy.SpotifyException as e:
+                if e.http_status == 429:
+                    raise RateLimited(_retry_after_seconds(e.headers or {}))
+                raise
+
+        response = self._backoff(call)
+        return [track for track in response['tracks'] if track]
+
+    def fetch_tracks(self, track_ids):
+        """
+        Spotify metadata for track_ids, 50 per request (cached).
 
         Returns:
-            dict: Song metadata including title, artist, album, etc.
+            Dict of track id -> metadata (unknown tracks are omitted)
+        """
+        metadata = {}
+        missing = []
+        for track_id in track_ids:
+            cached = None if self.refresh else self.cache.get(track_id).get('spotify')
+            if cached:
+                metadata[track_id] = cached
+            else:
+                missing.append(track_id)
+
+        for i in range(0, len(missing), SPOTIFY_BATCH_SIZE):
+            for track in self._fetch_track_batch(missing[i:i + SPOTIFY_BATCH_SIZE]):
+                metadata[track['id']] = track_metadata(track)
+                self.cache.update(track['id'], spotify=metadata[track['id']])
+
+        return metadata
+
+    # ------------------------------------------------------------------
+    # song.link
+    # ------------------------------------------------------------------
+
+    def _fetch_apple_music_id(self, track_id):
+        def call():
+            response = self.session.get(
+                self.songlink_url,
+                params={'url': f'https://open.spotify.com/track/{track_id}'},
+                timeout=15
+            )
+            if response.status_code == 429:
+                raise RateLimited(_retry_after_seconds(response.headers))
+            response.raise_for_status()
+            return response.json()
+
+        links = self._backoff(call).get('linksByPlatform', {})
+        entity_id = links.get('appleMusic', {}).get('entityUniqueId')
+        if not entity_id:
+            return NO_APPLE_MUSIC_ID
+        return entity_id.replace('ITUNES_SONG::', '')
+
+    def apple_music_id(self, track_id):
+        """Apple Music id for a Spotify track via song.link (cached)"""
+        if not self.refresh:
+            cached = self.cache.get(track_id).get('apple_music_id')
+            if cached:
+                return cached
+
+        apple_music_id = self._fetch_apple_music_id(track_id)
+        self.cache.update(track_id, apple_music_id=apple_music_id)
+        return apple_music_id
+
+    def fetch_apple_music_ids(self, track_ids):
+        """Apple Music ids for track_ids, looked up on a bounded thread pool"""
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            return dict(zip(track_ids, pool.map(self.apple_music_id, track_ids)))
+
+    # ------------------------------------------------------------------
+    # Catalog
+    # ------------------------------------------------------------------
 
-        Raises:
-            ValueError: If URL is invalid or track not found
+    def build_catalog(self, entries):
         """
+        Fill in catalog entries with fresh metadata.
+
+        Args:
+            entries: List of dicts with at least spotify_track_id and submitter_id
+
+        Returns:
+            List of complete song entries, in input order (tracks Spotify
+            does not know are skipped with a warning)
+        """
+        track_ids = list(dict.fromkeys(entry['spotify_track_id'] for entry in entries))
+        metadata = self.fetch_tracks(track_ids)
+        apple_music_ids = self.fetch_apple_music_ids([t for t in track_ids if t in metadata])
+
+        songs = []
+        for entry in entries:
+            track_id = entry['spotify_track_id']
+            if track_id not in metadata:
+                logger.warning(f"Spotify track not found: {track_id}")
+                continue
+            songs.append({
+                'submitter_id': entry['submitter_id'],
+                'spotify_track_id': track_id,
+                **metadata[track_id],
+                'apple_music_id': apple_music_ids[track_id],
+            })
+        return songs
+
+
+def write_catalog(songs, path):
+    """Write song entries as JSON Lines, the catalog format (see catalog.py)"""
+    tmp_path = f'{path}.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for song in songs:
+            f.write(json.dumps(song, ensure_ascii=False) + '\n')
+    os.replace(tmp_path, path)
+
+
+def main(argv=None):
+    from app.blueprints.soty.catalog import available_seasons, catalog_path, load_catalog
+
+    seasons = available_seasons()
+    parser = argparse.ArgumentParser(description='Fetch SOTY song metadata from Spotify and song.link')
+    parser.add_argument('--season', default=seasons[-1] if seasons else None, help='Catalog season to write (default: latest)')
+    parser.add_argument('--input', help="JSON list of {spotify_track_id, submitter_id} (default: the season's catalog)")
+    parser.add_argument('--output', help="JSONL file to write (default: the season's catalog)")
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR, help='Response cache directory')
+    parser.add_argument('--workers', type=int, default=DEFAULT_MAX_WORKERS, help='Concurrent song.link lookups')
+    parser.add_argument('--refresh', action='store_true', help='Ignore cached responses')
+    args = parser.parse_args(argv)
+
+    if not args.season and not (args.input and args.output):
+        parser.error('--season is required when no catalog exists yet')
+
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s %(message)s')
+
+    if args.input:
+        with open(args.input, encoding='utf-8') as f:
+            entries = json.load(f)
+    else:
+        entries = load_catalog(args.season)
+    output = args.output or catalog_path(args.season)
+
+    started = time.perf_counter()
+    fetcher = SpotifyCatalogFetcher(cache_dir=args.cache_dir, max_workers=args.workers, refresh=args.refresh)
+    songs = fetcher.build_catalog(entries)
+    write_catalog(songs, output)
+
+    print(f"Wrote {len(songs)} songs to {output} in {time.perf_counter() - started:.1f}s")
+    return 0 if len(songs) == len(entries) else 1
 
-        try:
-            track = self.sp.track(track_id)
-        except Exception as e:
-            raise ValueError(f"Could not fetch track from Spotify: {str(e)}")
-
-        return {
-            "title": track["name"],
-            "artist": ", ".join([artist["name"] for artist in track["artists"]]),
-            "album": track["album"]["name"],
-            "release_date": track["album"].get("release_date"),
-            "release_date_precision": track["album"].get("release_date_precision"),
-            "popularity": track.get("popularity"),
-            "isrc_number": track.get("external_ids", {}).get("isrc"),
-            "duration_seconds": track["duration_ms"] // 1000,
-            "thumbnail_url": (
-                track["album"]["images"][0]["url"] if track["album"]["images"] else None
-            ),
-            "spotify_track_id": track_id,
-            "isrc_number": track.get("external_ids", {}).get("isrc"),
-            "apple_music_id": None,
-        }
-
-
-song_data = []
-
-
-Spot = SpotifyService(
-    client_id="1779ae39983343bfb63afdbfc61ce997",
-    client_secret="686c123e4d744113a0e2a14a506ddd35",
-)
-
-for track_id in SOTY_SONGS:
-
-    metadata = Spot.get_track_metadata(track_id=track_id)
-    
-    apple_music_id = requests.get(
-        f"https://api.song.link/v1-alpha.1/links?url=open.spotify.com/track/{track_id}"
-        ).json()["linksByPlatform"].get('appleMusic', {}).get('entityUniqueId', 'NO_ID')
-    
-    apple_music_id = apple_music_id.replace("ITUNES_SONG::", "") if apple_music_id != 'NO_ID' else 'NO_ID'
-    
-    song_data.append(
-        {
-            "spotify_track_id": metadata["spotify_track_id"],
-            "title": metadata["title"],
-            "artist": metadata["artist"],
-            "album": metadata["album"],
-            "release_date": metadata["release_date"],
-            "popularity": metadata["popularity"],
-            "artwork_url": metadata["thumbnail_url"],
-            "isrc_number": metadata["isrc_number"],
-            "apple_music_id": apple_music_id,
-        }
-    )
-
-print(song_data)
 
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,28 @@
+"""Database engine setup helpers"""
+from sqlalchemy import event
+
+
+def configure_sqlite(app, db):
+    """
+    Apply SQLITE_PRAGMAS to every new SQLite connection.
+
+    Runs once per DBAPI connection (pooled connections keep their settings).
+    Engines for other dialects are left untouched.
+    """
+    pragmas = app.config.get('SQLITE_PRAGMAS') or {}
+    if not pragmas:
+        return
+
+    with app.app_context():
+        engines = [engine for engine in db.engines.values() if engine.dialect.name == 'sqlite']
+
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        try:
+            for name, value in pragmas.items():
+                cursor.execute(f'PRAGMA {name}={value}')
+        finally:
+            cursor.close()
+
+    for engine in engines:
+        event.listen(engine, 'connect', set_sqlite_pragmas)
@@ -0,0 +1,294 @@
+"""
+Responsive image derivatives for static assets
+
+`flask images build` resizes the source images under app/static (IMAGE_SOURCES
+globs) to several widths in AVIF, WebP and a JPEG/PNG fallback, names each
+file by a hash of its source and settings, and writes a manifest. Templates call
+responsive_image() to emit a <picture> with srcset/sizes from the manifest,
+falling back to the original file for images that haven't been built.
+"""
+import glob
+import hashlib
+import io
+import json
+import os
+
+import click
+from markupsafe import Markup, escape
+from flask import current_app, url_for
+
+DEFAULT_WIDTHS = (160, 320, 640, 960, 1280, 1920)
+# Preferred first: <source> order is the browser's order of preference
+MODERN_FORMATS = ('avif', 'webp')
+MIME_TYPES = {'avif': 'image/avif', 'webp': 'image/webp', 'jpeg': 'image/jpeg', 'png': 'image/png'}
+EXTENSIONS = {'avif': 'avif', 'webp': 'webp', 'jpeg': 'jpg', 'png': 'png'}
+# AVIF looks as good as JPEG/WebP at a lower quality setting
+SAVE_OPTIONS = {
+    'avif': lambda quality: {'quality': max(quality - 20, 1)},
+    'webp': lambda quality: {'quality': quality, 'method': 6},
+    'jpeg': lambda quality: {'quality': quality, 'optimize': True, 'progressive': True},
+    'png': lambda quality: {'optimize': True},
+}
+
+
+def _target_widths(original_width, widths):
+    """Requested widths below the original, plus the original (capped at the largest)"""
+    largest = min(original_width, max(widths))
+    return sorted({w for w in widths if w < largest} | {largest})
+
+
+def _variant_name(stem, source_hash, width, fmt, quality):
+    # Hash of the source bytes plus encoding settings: a changed source (or
+    # setting) gets a new URL, an unchanged one maps to the existing file
+    digest = hashlib.sha256(f'{source_hash}:{width}:{fmt}:{quality}'.encode()).hexdigest()[:10]
+    return f'{stem}.{width}w.{digest}.{EXTENSIONS[fmt]}'
+
+
+def _encode(image, fmt, quality):
+    buffer = io.BytesIO()
+    image.save(buffer, format=fmt.upper(), **SAVE_OPTIONS[fmt](quality))
+    return buffer.getvalue()
+
+
+def _write_atomic(path, data, mode='wb'):
+    """Write to a temp file beside path, then rename it into place, so readers
+    (and a build killed halfway) never see a partial file"""
+    tmp_path = f'{path}.{os.getpid()}.tmp'
+    try:
+        with open(tmp_path, mode) as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def build_derivatives(static_dir, sources, output_dir='images/derived', widths=DEFAULT_WIDTHS,
+                      quality=80, formats=None, log=print):
+    """
+    Write resized derivatives of each source image and return the manifest.
+
+    Files are named <stem>.<width>w.<hash>.<ext>, the hash covering the
+    source bytes and encoding settings, so they can be cached forever and
+    re-running the build only encodes what changed.
+
+    Args:
+        static_dir: Static folder the sources and output_dir are relative to
+        sources: Source image paths relative to static_dir
+        output_dir: Derivative directory relative to static_dir
+        widths: Target widths in pixels (never upscaled)
+        quality: Encoder quality for lossy formats
+        formats: Modern formats to produce (default: AVIF if this Pillow
+            supports it, and WebP); a JPEG or PNG fallback is always made
+        log: Callable for progress messages
+
+    Returns:
+        Manifest dict: {source path: {'width', 'height', 'fallback', 'variants':
+        {format: [{'width', 'file'}]}}}
+    """
+    from PIL import Image, ImageOps, features
+
+    if formats is None:
+        formats = [fmt for fmt in MODERN_FORMATS if features.check(fmt)]
+        if 'avif' not in formats:
+            log('AVIF not supported by this Pillow build; skipping AVIF derivatives')
+
+    out_root = os.path.join(static_dir, output_dir)
+    os.makedirs(out_root, exist_ok=True)
+    manifest = {}
+
+    for source in sources:
+        with open(os.path.join(static_dir, source), 'rb') as f:
+            data = f.read()
+        source_hash = hashlib.sha256(data).hexdigest()
+        with Image.open(io.BytesIO(data)) as image:
+            image = ImageOps.exif_transpose(image)
+            has_alpha = image.mode in ('RGBA', 'LA') or (image.mode == 'P' and 'transparency' in image.info)
+            image = image.convert('RGBA' if has_alpha else 'RGB')
+
+        fallback = 'png' if has_alpha else 'jpeg'
+        stem = os.path.splitext(os.path.basename(source))[0]
+        entry = {'width': image.width, 'height': image.height, 'fallback': fallback, 'variants': {}}
+        written = 0
+
+        for width in _target_widths(image.width, widths):
+            resized = None
+            for fmt in (*formats, fallback):
+                filename = _variant_name(stem, source_hash, width, fmt, quality)
+                path = os.path.join(out_root, filename)
+                if not os.path.exists(path):
+                    if resized is None:
+                        height = round(image.height * width / image.width)
+                        resized = image if width == image.width else image.resize((width, height), Image.LANCZOS)
+                    _write_atomic(path, _encode(resized, fmt, quality))
+                    written += 1
+                entry['variants'].setdefault(fmt, []).append(
+                    {'width': width, 'file': f'{output_dir}/{filename}'}
+                )
+
+        manifest[source] = entry
+        log(f'{source}: {len(entry["variants"][fallback])} widths x {len(formats) + 1} formats, {written} written')
+
+    return manifest
+
+
+def prune_derivatives(static_dir, manifest, output_dir='images/derived'):
+    """Delete derivative files the manifest no longer references; returns how many"""
+    keep = {
+        os.path.basename(variant['file'])
+        for entry in manifest.values()
+        for variants in entry['variants'].values()
+        for variant in variants
+    }
+    removed = 0
+    for path in glob.glob(os.path.join(static_dir, output_dir, '*')):
+        name = os.path.basename(path)
+        if name != 'manifest.json' and not name.endswith('.tmp') and name not in keep:
+            os.remove(path)
+            removed += 1
+    return removed
+
+
+def find_sources(static_dir, patterns, exclude_dir='images/derived'):
+    """Source image paths (relative to static_dir) matching the glob patterns"""
+    found = set()
+    for pattern in patterns:
+        for path in glob.glob(os.path.join(static_dir, pattern), recursive=True):
+            relative = os.path.relpath(path, static_dir).replace(os.sep, '/')
+            if not relative.startswith(exclude_dir + '/'):
+                found.add(relative)
+    return sorted(found)
+
+
+# ==============================================================================
+# TEMPLATE HELPER
+# ==============================================================================
+
+class ImageManifest:
+    """manifest.json, reloaded when the file changes (e.g. after a rebuild)"""
+
+    def __init__(self, path):
+        self.path = path
+        self._mtime = None
+        self._entries = {}
+
+    def get(self, source):
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            return None
+        if mtime != self._mtime:
+            # Unreadable or invalid JSON counts as not built; retried next call
+            try:
+                with open(self.path) as f:
+                    self._entries = json.load(f)
+            except (OSError, ValueError):
+                self._entries = {}
+                return None
+            self._mtime = mtime
+        return self._entries.get(source)
+
+
+def _srcset(variants):
+    return ', '.join(f"{url_for('static', filename=v['file'])} {v['width']}w" for v in variants)
+
+
+def responsive_image(source, alt='', sizes='100vw', lazy=True, **attrs):
+    """
+    <picture> for a static image, with AVIF/WebP sources and a fallback <img>.
+
+    Args:
+        source: Path relative to the static folder, e.g. 'images/yard/dull_knife.png'
+        alt: Alt text
+        sizes: The `sizes` attribute (rendered slot width per breakpoint)
+        lazy: Add loading="lazy" (pass False for above-the-fold images)
+        **attrs: Extra <img> attributes (class_ for class)
+
+    Returns:
+        Markup; a plain <img> of the original if the image hasn't been built
+    """
+    manifest = current_app.extensions['image_manifest']
+    entry = manifest.get(source)
+
+    img_attrs = {'alt': alt}
+    img_attrs.update({key.rstrip('_').replace('_', '-'): value for key, value in attrs.items()})
+    if lazy:
+        img_attrs.setdefault('loading', 'lazy')
+    img_attrs.setdefault('decoding', 'async')
+
+    if entry is None:
+        img_attrs = {'src': url_for('static', filename=source), **img_attrs}
+        return Markup(f'<img {_attributes(img_attrs)}>')
+
+    fallback = entry['variants'][entry['fallback']]
+    img_attrs = {
+        'src': url_for('static', filename=fallback[-1]['file']),
+        'srcset': _srcset(fallback),
+        'sizes': sizes,
+        'width': entry['width'],
+        'height': entry['height'],
+        **img_attrs,
+    }
+    sources = [
+        f'<source type="{MIME_TYPES[fmt]}" srcset="{escape(_srcset(variants))}" sizes="{escape(sizes)}">'
+        for fmt, variants in entry['variants'].items()
+        if fmt != entry['fallback']
+    ]
+    return Markup('<picture>' + ''.join(sources) + f'<img {_attributes(img_attrs)}></picture>')
+
+
+def _attributes(attrs):
+    return ' '.join(f'{name}="{escape(value)}"' for name, value in attrs.items())
+
+
+# ==============================================================================
+# CLI + APP SETUP
+# ==============================================================================
+
+@click.group('images', help='Build responsive image derivatives.')
+def images_cli():
+    pass
+
+
+@images_cli.command('build')
+@click.option('--widths', help='Comma-separated widths (default: IMAGE_WIDTHS)')
+@click.option('--quality', type=int, help='Lossy encoder quality (default: IMAGE_QUALITY)')
+@click.option('--no-avif', is_flag=True, help='Skip AVIF (slowest to encode)')
+@click.option('--prune/--no-prune', default=True, help='Delete derivatives no longer referenced')
+def build_command(widths, quality, no_avif, prune):
+    """Resize IMAGE_SOURCES and write the manifest."""
+    from PIL import features
+
+    config = current_app.config
+    static_dir = current_app.static_folder
+    output_dir = config['IMAGE_OUTPUT_DIR']
+    widths = [int(w) for w in widths.split(',')] if widths else config['IMAGE_WIDTHS']
+    formats = None
+    if no_avif:
+        formats = [fmt for fmt in MODERN_FORMATS if fmt != 'avif' and features.check(fmt)]
+
+    sources = find_sources(static_dir, config['IMAGE_SOURCES'], exclude_dir=output_dir)
+    if not sources:
+        raise click.ClickException('No source images match IMAGE_SOURCES')
+
+    manifest = build_derivatives(
+        static_dir, sources, output_dir=output_dir, widths=widths,
+        quality=quality or config['IMAGE_QUALITY'], formats=formats, log=click.echo
+    )
+    manifest_path = os.path.join(static_dir, output_dir, 'manifest.json')
+    _write_atomic(manifest_path, json.dumps(manifest, indent=2, sort_keys=True) + '\n', mode='w')
+
+    if prune:
+        removed = prune_derivatives(static_dir, manifest, output_dir)
+        if removed:
+            click.echo(f'Removed {removed} stale derivatives')
+    click.echo(f'Wrote {manifest_path} ({len(manifest)} images)')
+
+
+def init_images(app):
+    """Register the responsive_image() template global and `flask images`"""
+    manifest_path = os.path.join(app.static_folder, app.config['IMAGE_OUTPUT_DIR'], 'manifest.json')
+    app.extensions['image_manifest'] = ImageManifest(manifest_path)
+    app.add_template_global(responsive_image)
+    app.cli.add_command(images_cli)
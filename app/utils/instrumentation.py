@@ -0,0 +1,137 @@
+"""Per-request SQL instrumentation (query count, DB time, N+1 detection)"""
+import heapq
+import logging
+import time
+from collections import Counter
+
+from flask import current_app, g, has_app_context, request
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Longest statement text kept in logs
+_STATEMENT_LOG_CHARS = 200
+
+
+class RequestQueryStats:
+    """SQL statements issued while handling one request"""
+
+    def __init__(self, slowest_kept):
+        self.count = 0
+        self.db_seconds = 0.0
+        self.started = time.perf_counter()
+        self.slowest_kept = slowest_kept
+        self.slowest = []  # min-heap of (seconds, statement)
+        self.statements = Counter()
+
+    def record(self, statement, seconds):
+        self.count += 1
+        self.db_seconds += seconds
+        self.statements[statement] += 1
+        if len(self.slowest) < self.slowest_kept:
+            heapq.heappush(self.slowest, (seconds, statement))
+        elif self.slowest and seconds > self.slowest[0][0]:
+            heapq.heapreplace(self.slowest, (seconds, statement))
+
+    def slowest_statements(self):
+        """(seconds, statement) pairs, slowest first"""
+        return sorted(self.slowest, reverse=True)
+
+    def repeated_statements(self, threshold):
+        """(statement, times) pairs issued at least `threshold` times"""
+        return [(stmt, n) for stmt, n in self.statements.most_common() if n >= threshold]
+
+
+def _current_stats():
+    return g.get('sql_stats') if has_app_context() else None
+
+
+def _shorten(statement):
+    statement = ' '.join(statement.split())
+    if len(statement) > _STATEMENT_LOG_CHARS:
+        return statement[:_STATEMENT_LOG_CHARS] + '...'
+    return statement
+
+
+def init_instrumentation(app, db):
+    """
+    Count and time SQL statements per request.
+
+    Adds a Server-Timing header (db and app durations), logs one structured
+    line per request and warns when a statement repeats at least
+    SQL_NPLUS1_THRESHOLD times in a single request (a loop issuing one query
+    per row). Disabled when SQL_INSTRUMENTATION is false.
+    """
+    if not app.config.get('SQL_INSTRUMENTATION', True):
+        return
+
+    with app.app_context():
+        engines = list(db.engines.values())
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if _current_stats() is not None:
+            conn.info.setdefault('query_start_time', []).append(time.perf_counter())
+
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start_time')
+        if not starts:
+            return
+        started = starts.pop()
+        stats = _current_stats()
+        if stats is not None:
+            stats.record(statement, time.perf_counter() - started)
+
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        conn = exception_context.connection
+        if conn is not None and conn.info.get('query_start_time'):
+            conn.info['query_start_time'].pop()
+
+    for engine in engines:
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        event.listen(engine, 'after_cursor_execute', after_cursor_execute)
+        event.listen(engine, 'handle_error', handle_error)
+
+    @app.before_request
+    def start_query_stats():
+        g.sql_stats = RequestQueryStats(current_app.config.get('SQL_SLOWEST_STATEMENTS', 3))
+
+    @app.after_request
+    def report_query_stats(response):
+        stats = _current_stats()
+        if stats is None or request.endpoint == 'static':
+            return response
+
+        total_ms = (time.perf_counter() - stats.started) * 1000
+        db_ms = stats.db_seconds * 1000
+        response.headers.add(
+            'Server-Timing',
+            f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'
+        )
+
+        logger.info(
+            f"{request.method} {request.path} status={response.status_code} "
+            f"duration_ms={total_ms:.1f} db_queries={stats.count} db_ms={db_ms:.1f}",
+            extra={
+                'method': request.method,
+                'path': request.path,
+                'status': response.status_code,
+                'duration_ms': round(total_ms, 1),
+                'db_queries': stats.count,
+                'db_ms': round(db_ms, 1),
+            }
+        )
+        for seconds, statement in stats.slowest_statements():
+            logger.debug(f"  slow query {seconds * 1000:.1f}ms: {_shorten(statement)}")
+
+        threshold = current_app.config.get('SQL_NPLUS1_THRESHOLD', 10)
+        for statement, times in stats.repeated_statements(threshold):
+            logger.warning(
+                f"Possible N+1 in {request.endpoint}: statement ran {times}x in one request: "
+                f"{_shorten(statement)}"
+            )
+        return response
+
+    @app.teardown_request
+    def clear_query_stats(exc):
+        g.pop('sql_stats', None)
@@ -0,0 +1,150 @@
+"""
+Structured, non-blocking application logging
+
+Request threads only put records on an in-memory queue (QueueHandler); a
+single QueueListener thread formats them as JSON lines and appends them to
+the log file. Rotation is left to logrotate: every gunicorn worker appends to
+the same file, and rotating it from inside several processes would race.
+Request context (request id, user id, endpoint) is attached to each record in
+the request thread, before it is queued.
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import uuid
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, WatchedFileHandler
+
+from flask import g, has_request_context, request, session
+from flask.logging import default_handler
+
+# Attributes every LogRecord has; anything else was passed via `extra`
+_RECORD_ATTRS = set(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+_CONTEXT_FIELDS = ('request_id', 'user_id', 'endpoint')
+
+
+class RequestContextFilter(logging.Filter):
+    """Attach request id, user id and endpoint to records logged during a request"""
+
+    def filter(self, record):
+        if has_request_context():
+            record.request_id = g.get('request_id')
+            record.user_id = session.get('user_id')
+            record.endpoint = request.endpoint
+        return True
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record):
+        entry = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        for field in _CONTEXT_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                entry[field] = value
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRS and key not in _CONTEXT_FIELDS and key not in entry:
+                entry[key] = value
+
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exception'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class StructuredQueueHandler(QueueHandler):
+    """
+    QueueHandler that keeps records structured.
+
+    The stock prepare() bakes the traceback into the message text; here the
+    message is merged with its args and the traceback kept in exc_text, so
+    the listener's JsonFormatter can emit them as separate fields.
+    """
+
+    def prepare(self, record):
+        record = logging.makeLogRecord(vars(record))
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class LogListener(QueueListener):
+    """QueueListener whose stop() is safe to call more than once (atexit + tests)"""
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+
+
+def _assign_request_id():
+    # Reuse an id set by the proxy (nginx $request_id) so log lines correlate
+    g.request_id = request.headers.get('X-Request-ID') or uuid.uuid4().hex
+
+
+def _echo_request_id(response):
+    request_id = g.get('request_id')
+    if request_id:
+        response.headers.setdefault('X-Request-ID', request_id)
+    return response
+
+
+def start_queue_logging(app):
+    """
+    Send app logs through a queue to a JSON-lines file.
+
+    Uses LOG_DIR, LOG_FILE and LOG_LEVEL. The file is reopened whenever
+    logrotate moves it, so rotation is safe with several worker processes.
+
+    Returns:
+        The started QueueListener (also in app.extensions['log_listener'])
+    """
+    log_dir = app.config.get('LOG_DIR', 'logs')
+    os.makedirs(log_dir, exist_ok=True)
+
+    file_handler = WatchedFileHandler(
+        os.path.join(log_dir, app.config.get('LOG_FILE', 'powers-land.log')),
+        encoding='utf-8'
+    )
+    file_handler.setFormatter(JsonFormatter())
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = StructuredQueueHandler(log_queue)
+    queue_handler.addFilter(RequestContextFilter())
+
+    listener = LogListener(log_queue, file_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    level = getattr(logging, str(app.config.get('LOG_LEVEL', 'INFO')).upper())
+    # Flask's default handler writes to stderr synchronously; the queue replaces it
+    app.logger.removeHandler(default_handler)
+    app.logger.addHandler(queue_handler)
+    app.logger.setLevel(level)
+    app.extensions['log_listener'] = listener
+    app.extensions['log_handler'] = queue_handler
+    return listener
+
+
+def init_logging(app):
+    """
+    Tag every request with an id (X-Request-ID) and, outside debug and
+    testing, start the queued JSON file logging.
+    """
+    app.before_request(_assign_request_id)
+    app.after_request(_echo_request_id)
+
+    if not app.debug and not app.testing:
+        start_queue_logging(app)
+        app.logger.info('powers-land startup')
@@ -0,0 +1,308 @@
+"""
+In-process metrics registry with Prometheus text exposition
+
+Each worker keeps counters and histograms in memory and, when METRICS_DIR
+is set, snapshots them to METRICS_DIR/<pid>.json (at most every
+METRICS_FLUSH_SECONDS and at exit). /metrics sums the snapshots of every
+worker, so any gunicorn worker can answer a scrape. Only counters and
+histograms are kept, so summing across workers is always correct; files
+left by exited workers keep their totals (clear the directory on deploy to
+reset them).
+"""
+import atexit
+import glob
+import hmac
+import json
+import os
+import threading
+import time
+
+from flask import abort, current_app, g, request, Response
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_value(value):
+    return str(value) if isinstance(value, int) else repr(float(value))
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, registry, name, help_text, labelnames=()):
+        self.registry = registry
+        self.name = name
+        self.help = help_text
+        self.labelnames = tuple(labelnames)
+        self.values = {}
+
+    def _key(self, labels):
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def _format_labels(self, key, extra=()):
+        pairs = list(zip(self.labelnames, key)) + list(extra)
+        if not pairs:
+            return ''
+        escaped = (
+            (name, value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n'))
+            for name, value in pairs
+        )
+        return '{' + ','.join(f'{name}="{value}"' for name, value in escaped) + '}'
+
+
+class Counter(_Metric):
+    """Monotonic counter"""
+    kind = 'counter'
+
+    def inc(self, amount=1, **labels):
+        key = self._key(labels)
+        with self.registry.lock:
+            self.values[key] = self.values.get(key, 0) + amount
+
+    def merge(self, values, key, value):
+        values[key] = values.get(key, 0) + value
+
+    def exposition(self, values):
+        for key, value in sorted(values.items()):
+            yield f'{self.name}{self._format_labels(key)} {_format_value(value)}'
+
+
+class Histogram(_Metric):
+    """Bucketed observations (stored per bucket, exposed cumulatively)"""
+    kind = 'histogram'
+
+    def __init__(self, registry, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(registry, name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value, **labels):
+        key = self._key(labels)
+        index = next((i for i, bound in enumerate(self.buckets) if value <= bound), len(self.buckets))
+        with self.registry.lock:
+            counts, total, count = self.values.get(key) or ([0] * (len(self.buckets) + 1), 0.0, 0)
+            # New list each time so snapshots never see a half-updated one
+            counts = list(counts)
+            counts[index] += 1
+            self.values[key] = (counts, total + value, count + 1)
+
+    def merge(self, values, key, value):
+        counts, total, count = value
+        if key in values:
+            merged_counts, merged_total, merged_count = values[key]
+            counts = [a + b for a, b in zip(merged_counts, counts)]
+            total += merged_total
+            count += merged_count
+        values[key] = (list(counts), total, count)
+
+    def exposition(self, values):
+        for key, (counts, total, count) in sorted(values.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float('inf'),), counts):
+                cumulative += bucket_count
+                le = '+Inf' if bound == float('inf') else f'{bound:g}'
+                yield f'{self.name}_bucket{self._format_labels(key, [("le", le)])} {cumulative}'
+            yield f'{self.name}_sum{self._format_labels(key)} {_format_value(total)}'
+            yield f'{self.name}_count{self._format_labels(key)} {count}'
+
+
+class MetricsRegistry:
+    """Named metrics for this process, with optional per-pid snapshots"""
+
+    def __init__(self):
+        self.metrics = {}
+        self.lock = threading.Lock()
+        self.directory = None
+        self.flush_seconds = 5.0
+        self._last_flush = 0.0
+
+    def counter(self, name, help_text, labelnames=()):
+        return self._register(Counter(self, name, help_text, labelnames))
+
+    def histogram(self, name, help_text, labelnames=(), buckets=DEFAULT_BUCKETS):
+        return self._register(Histogram(self, name, help_text, labelnames, buckets))
+
+    def _register(self, metric):
+        if metric.name in self.metrics:
+            raise ValueError(f"Metric {metric.name} already registered")
+        self.metrics[metric.name] = metric
+        return metric
+
+    def reset(self):
+        """Drop all recorded values (tests)"""
+        with self.lock:
+            for metric in self.metrics.values():
+                metric.values = {}
+
+    # ------------------------------------------------------------------
+    # Multi-process snapshots
+    # ------------------------------------------------------------------
+
+    def _snapshot_path(self, pid=None):
+        return os.path.join(self.directory, f'{pid or os.getpid()}.json')
+
+    def snapshot(self):
+        """JSON-serializable copy of this process's values"""
+        with self.lock:
+            return {
+                name: [[list(key), value] for key, value in metric.values.items()]
+                for name, metric in self.metrics.items()
+                if metric.values
+            }
+
+    def flush(self, force=False):
+        """Write this process's snapshot if METRICS_DIR is set (throttled)"""
+        if not self.directory:
+            return
+        now = time.monotonic()
+        if not force and now - self._last_flush < self.flush_seconds:
+            return
+        self._last_flush = now
+
+        path = self._snapshot_path()
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(self.snapshot(), f)
+        os.replace(tmp_path, path)
+
+    def collect(self):
+        """
+        Values summed across every worker's snapshot, with this process's
+        live values in place of its own (possibly stale) file.
+
+        Returns:
+            Dict of metric name -> {label key tuple: value}
+        """
+        snapshots = [self.snapshot()]
+        if self.directory:
+            own_path = self._snapshot_path()
+            for path in glob.glob(os.path.join(self.directory, '*.json')):
+                if path == own_path:
+                    continue
+                try:
+                    with open(path) as f:
+                        snapshots.append(json.load(f))
+                except (OSError, ValueError):
+                    continue  # Being replaced by its worker right now
+
+        merged = {name: {} for name in self.metrics}
+        for snapshot in snapshots:
+            for name, samples in snapshot.items():
+                metric = self.metrics.get(name)
+                if metric is None:
+                    continue
+                for key, value in samples:
+                    metric.merge(merged[name], tuple(key), value)
+        return merged
+
+    def exposition(self):
+        """Prometheus text format (version 0.0.4) for all workers"""
+        lines = []
+        for name, values in self.collect().items():
+            metric = self.metrics[name]
+            lines.append(f'# HELP {name} {metric.help}')
+            lines.append(f'# TYPE {name} {metric.kind}')
+            lines.extend(metric.exposition(values))
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+
+REQUEST_LATENCY = registry.histogram(
+    'http_request_duration_seconds', 'Request latency', ['blueprint', 'endpoint', 'method']
+)
+REQUESTS = registry.counter(
+    'http_requests_total', 'Requests handled', ['blueprint', 'endpoint', 'status']
+)
+RATELIMIT_REJECTIONS = registry.counter(
+    'ratelimit_rejections_total', 'Requests rejected by the rate limiter (429)', ['endpoint']
+)
+DB_SECONDS = registry.counter(
+    'db_query_seconds_total', 'Time spent in SQL statements', ['endpoint']
+)
+DB_QUERIES = registry.counter(
+    'db_queries_total', 'SQL statements executed', ['endpoint']
+)
+VOTES = registry.counter(
+    'soty_votes_total', 'SOTY votes written', ['outcome']
+)
+CACHE_REQUESTS = registry.counter(
+    'cache_requests_total', 'Cache lookups by result (hit/miss)', ['cache', 'result']
+)
+
+
+def record_cache(cache, hit):
+    """Count a cache lookup for hit-ratio metrics"""
+    CACHE_REQUESTS.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def record_votes(outcomes):
+    """Count committed votes from an upsert_votes() outcome dict"""
+    for outcome in outcomes.values():
+        VOTES.inc(outcome=outcome)
+
+
+def _metrics_authorized():
+    token = current_app.config.get('METRICS_TOKEN')
+    auth = request.headers.get('Authorization', '')
+    if token and auth.startswith('Bearer ') and hmac.compare_digest(auth[7:].encode(), token.encode()):
+        return True
+
+    from app.blueprints.soty.services import is_admin
+    return is_admin()
+
+
+def metrics_view():
+    """Prometheus scrape endpoint (SOTY admin session or METRICS_TOKEN bearer)"""
+    if not _metrics_authorized():
+        abort(403)
+    return Response(registry.exposition(), mimetype='text/plain; version=0.0.4')
+
+
+def init_metrics(app, limiter=None):
+    """
+    Record request metrics and serve them at /metrics.
+
+    Request latency, status and DB time (from the SQL instrumentation) are
+    recorded after every request. Snapshots go to METRICS_DIR when set.
+    """
+    directory = app.config.get('METRICS_DIR')
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+        registry.directory = directory
+        registry.flush_seconds = app.config.get('METRICS_FLUSH_SECONDS', 5.0)
+        atexit.register(registry.flush, force=True)
+
+    @app.before_request
+    def start_request_timer():
+        g.metrics_started = time.perf_counter()
+
+    @app.after_request
+    def record_request_metrics(response):
+        # Unset when an earlier before_request hook (e.g. the limiter) aborted
+        started = g.pop('metrics_started', None)
+        endpoint = request.endpoint
+        if endpoint in (None, 'static', 'metrics'):
+            return response
+
+        blueprint = request.blueprint or 'app'
+        if started is not None:
+            REQUEST_LATENCY.observe(
+                time.perf_counter() - started, blueprint=blueprint, endpoint=endpoint, method=request.method
+            )
+        REQUESTS.inc(blueprint=blueprint, endpoint=endpoint, status=response.status_code)
+        if response.status_code == 429:
+            RATELIMIT_REJECTIONS.inc(endpoint=endpoint)
+
+        stats = g.get('sql_stats')
+        if stats is not None:
+            DB_SECONDS.inc(stats.db_seconds, endpoint=endpoint)
+            DB_QUERIES.inc(stats.count, endpoint=endpoint)
+
+        registry.flush()
+        return response
+
+    app.add_url_rule('/metrics', 'metrics', metrics_view)
+    if limiter is not None:
+        limiter.exempt(metrics_view)
@@ -0,0 +1,108 @@
+"""SQLite storage backend for Flask-Limiter (shared across workers on one host)"""
+import os
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
+from limits.storage import Storage
+
+
+class SQLiteStorage(Storage):
+    """
+    Fixed-window rate limit storage backed by a SQLite file.
+
+    Every gunicorn worker opens the same file, so limits are counted once per
+    host instead of once per worker. Counters are updated with a single
+    upsert statement, which SQLite serializes across processes.
+
+    Usage:
+        RATELIMIT_STORAGE_URI = 'sqlite:////var/www/powers-land/instance/ratelimits.db'
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    # Purge expired keys roughly once every N increments
+    CLEANUP_INTERVAL = 1000
+
+    def __init__(self, uri, wrap_exceptions=False, timeout=5.0, **options):
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+        path = urlparse(uri).path
+        self.path = path[1:] if path.startswith('/') else path
+        self.timeout = float(timeout)
+        self._local = threading.local()
+        self._incr_calls = 0
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._connection().execute(
+            'CREATE TABLE IF NOT EXISTS ratelimits ('
+            '  key TEXT PRIMARY KEY,'
+            '  count INTEGER NOT NULL,'
+            '  expiry REAL NOT NULL'
+            ')'
+        )
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        """One connection per thread (and per process after fork)"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def incr(self, key, expiry, amount=1):
+        now = time.time()
+        conn = self._connection()
+        row = conn.execute(
+            'INSERT INTO ratelimits (key, count, expiry) VALUES (?, ?, ?) '
+            'ON CONFLICT(key) DO UPDATE SET '
+            '  count = CASE WHEN ratelimits.expiry <= ? THEN excluded.count '
+            '               ELSE ratelimits.count + excluded.count END, '
+            '  expiry = CASE WHEN ratelimits.expiry <= ? THEN excluded.expiry '
+            '                ELSE ratelimits.expiry END '
+            'RETURNING count',
+            (key, amount, now + expiry, now, now)
+        ).fetchone()
+
+        self._incr_calls += 1
+        if self._incr_calls % self.CLEANUP_INTERVAL == 0:
+            conn.execute('DELETE FROM ratelimits WHERE expiry <= ?', (now,))
+
+        return row[0]
+
+    def get(self, key):
+        row = self._connection().execute(
+            'SELECT count FROM ratelimits WHERE key = ? AND expiry > ?',
+            (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._connection().execute(
+            'SELECT expiry FROM ratelimits WHERE key = ? AND expiry > ?',
+            (key, now)
+        ).fetchone()
+        return row[0] if row else now
+
+    def check(self):
+        try:
+            self._connection().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        return self._connection().execute('DELETE FROM ratelimits').rowcount
+
+    def clear(self, key):
+        self._connection().execute('DELETE FROM ratelimits WHERE key = ?', (key,))
@@ -8,6 +8,19 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'dev-secret-key-change-in-production'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+    # Applied to every new SQLite connection (see app/utils/database.py).
+    # WAL lets readers proceed while a vote commit holds the write lock, and
+    # busy_timeout makes writers wait for the lock instead of failing with
+    # "database is locked" (the only lock-wait setting; no driver timeout).
+    SQLITE_PRAGMAS = {
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'busy_timeout': int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000)),
+        'cache_size': -16000,  # negative = KiB (16 MB)
+        'mmap_size': 134217728,  # 128 MB
+        'temp_store': 'MEMORY',
+    }
+
     # Session configuration
     PERMANENT_SESSION_LIFETIME = timedelta(days=30)
     SESSION_COOKIE_SECURE = False
@@ -18,11 +31,62 @@ class Config:
     WTF_CSRF_ENABLED = True
     WTF_CSRF_TIME_LIMIT = None
 
+    # Live bracket stream (/soty/bracket/stream). Each open stream holds a
+    # worker thread, so keep MAX_PER_WORKER well under gunicorn's --threads;
+    # extra clients get 503 + Retry-After and fall back to reloading
+    SOTY_STREAM_POLL_SECONDS = 1.0
+    SOTY_STREAM_MAX_SECONDS = 300
+    SOTY_STREAM_MAX_PER_WORKER = 3
+    SOTY_STREAM_RETRY_AFTER_SECONDS = 30
+
+    # Landscaping plant search (/landscaping/plants)
+    PLANTS_PER_PAGE = 24
+    FACET_CACHE_TTL_SECONDS = 60  # facet counts also reset on any Plant write
+
+    # Care log timeline (/landscaping/plants/<id>/care and its JSON API)
+    CARE_LOGS_PER_PAGE = 50
+    CARE_LOGS_MAX_PER_PAGE = 200
+
+    # Responsive image derivatives (`flask images build`), paths relative to app/static
+    IMAGE_SOURCES = ('images/**/*.jpeg', 'images/**/*.jpg', 'images/**/*.png')
+    IMAGE_OUTPUT_DIR = 'images/derived'
+    IMAGE_WIDTHS = (160, 320, 640, 960, 1280, 1920)
+    IMAGE_QUALITY = 80
+
+    # Song catalog season loaded by load_songs_into_db (data/songs_<season>.jsonl)
+    SOTY_SEASON = os.environ.get('SOTY_SEASON') or '2025'
+
+    # Rate limit storage (Flask-Limiter). Supported URIs:
+    #   memory://                          per-worker counters (default)
+    #   sqlite:////path/to/ratelimits.db   shared by all workers on this host
+    #   redis://host:6379/0                shared across hosts
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI') or 'memory://'
+
+    # Logging (production): JSON lines written by a background thread. All
+    # gunicorn workers append to one file; logrotate rotates it (see
+    # terraform/user-data.sh) and each worker reopens it when it moves
+    LOG_DIR = os.environ.get('LOG_DIR') or 'logs'
+    LOG_FILE = 'powers-land.log'
+    LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
+
+    # Per-request SQL instrumentation (Server-Timing header + one log line per request)
+    SQL_INSTRUMENTATION = True
+    SQL_SLOWEST_STATEMENTS = 3  # slowest statements logged (DEBUG) per request
+    SQL_NPLUS1_THRESHOLD = int(os.environ.get('SQL_NPLUS1_THRESHOLD', 10))  # warn when one statement repeats this often
+
+    # Metrics (/metrics). Workers snapshot to METRICS_DIR so any worker can
+    # answer a scrape; without it each worker reports only its own numbers.
+    # Scrapers authenticate with "Authorization: Bearer <METRICS_TOKEN>".
+    METRICS_DIR = os.environ.get('METRICS_DIR')
+    METRICS_FLUSH_SECONDS = 5.0
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+
 class DevelopmentConfig(Config):
     """Development configuration"""
     DEBUG = True
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, os.environ.get('DEV_DATABASE_URL'))
-    SQLALCHEMY_ECHO = True
+    # Full statement echo is opt-in; per-request counts come from SQL instrumentation
+    SQLALCHEMY_ECHO = os.environ.get('SQLALCHEMY_ECHO') == '1'
 
 class TestingConfig(Config):
     """Testing configuration"""
@@ -35,6 +99,21 @@ class ProductionConfig(Config):
     DEBUG = False
     SQLALCHEMY_DATABASE_URI = 'sqlite:///' + os.path.join(basedir, os.environ.get('PROD_DATABASE_URL'))
 
+    # Connection pool per gunicorn worker
+    SQLALCHEMY_ENGINE_OPTIONS = {
+        'pool_size': int(os.environ.get('SQLALCHEMY_POOL_SIZE', 5)),
+        'max_overflow': int(os.environ.get('SQLALCHEMY_MAX_OVERFLOW', 10)),
+        'pool_timeout': 30,
+        'pool_recycle': 3600,
+        'pool_pre_ping': True,
+    }
+
+    METRICS_DIR = os.environ.get('METRICS_DIR') or os.path.join(basedir, 'instance', 'metrics')
+
+    # Share rate limits across gunicorn workers unless a URI is provided
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI') or \
+        'sqlite:///' + os.path.join(basedir, 'instance', 'ratelimits.db')
+
     # Production security settings
     SESSION_COOKIE_SECURE = True
     SESSION_COOKIE_HTTPONLY = True
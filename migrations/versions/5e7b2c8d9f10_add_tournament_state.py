@@ -0,0 +1,29 @@
+"""Add tournament state (data version for ETags)
+
+Revision ID: 5e7b2c8d9f10
+Revises: a3c9e1f4b2d7
+Create Date: 2026-10-17 11:03:52.402117
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '5e7b2c8d9f10'
+down_revision = 'a3c9e1f4b2d7'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    state = op.create_table('soty_tournament_state',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('data_version', sa.Integer(), server_default='0', nullable=False),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.bulk_insert(state, [{'id': 1, 'data_version': 0}])
+
+
+def downgrade():
+    op.drop_table('soty_tournament_state')
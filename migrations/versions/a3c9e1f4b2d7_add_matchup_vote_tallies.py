@@ -0,0 +1,43 @@
+"""Add denormalized matchup vote tallies
+
+Revision ID: a3c9e1f4b2d7
+Revises: fd11a1d8f07f
+Create Date: 2026-10-17 09:12:40.118204
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'a3c9e1f4b2d7'
+down_revision = 'fd11a1d8f07f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('soty_matchups', schema=None) as batch_op:
+        batch_op.add_column(sa.Column('song1_votes', sa.Integer(), server_default='0', nullable=False))
+        batch_op.add_column(sa.Column('song2_votes', sa.Integer(), server_default='0', nullable=False))
+
+    # Backfill tallies from existing votes
+    op.execute("""
+        UPDATE soty_matchups SET
+            song1_votes = (
+                SELECT COUNT(*) FROM soty_votes
+                WHERE soty_votes.matchup_id = soty_matchups.id
+                  AND soty_votes.song_id = soty_matchups.song1_id
+            ),
+            song2_votes = (
+                SELECT COUNT(*) FROM soty_votes
+                WHERE soty_votes.matchup_id = soty_matchups.id
+                  AND soty_votes.song_id = soty_matchups.song2_id
+            )
+    """)
+
+
+def downgrade():
+    with op.batch_alter_table('soty_matchups', schema=None) as batch_op:
+        batch_op.drop_column('song2_votes')
+        batch_op.drop_column('song1_votes')
@@ -0,0 +1,60 @@
+"""Add plants full-text search (SQLite FTS5 + sync triggers)
+
+Revision ID: b7d4e2a91c3f
+Revises: 5e7b2c8d9f10
+Create Date: 2026-10-17 14:20:11.518204
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'b7d4e2a91c3f'
+down_revision = '5e7b2c8d9f10'
+branch_labels = None
+depends_on = None
+
+COLUMNS = 'common_name, scientific_name, care_instructions, notes, wildlife_value, bloom_color'
+NEW_VALUES = 'new.common_name, new.scientific_name, new.care_instructions, new.notes, new.wildlife_value, new.bloom_color'
+OLD_VALUES = 'old.common_name, old.scientific_name, old.care_instructions, old.notes, old.wildlife_value, old.bloom_color'
+
+
+def upgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute(f"""
+        CREATE VIRTUAL TABLE IF NOT EXISTS plants_fts USING fts5(
+            {COLUMNS},
+            content='plants', content_rowid='id',
+            tokenize='porter unicode61 remove_diacritics 2'
+        )
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS plants_fts_ai AFTER INSERT ON plants BEGIN
+            INSERT INTO plants_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS plants_fts_ad AFTER DELETE ON plants BEGIN
+            INSERT INTO plants_fts(plants_fts, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES});
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER IF NOT EXISTS plants_fts_au AFTER UPDATE OF {COLUMNS} ON plants BEGIN
+            INSERT INTO plants_fts(plants_fts, rowid, {COLUMNS}) VALUES ('delete', old.id, {OLD_VALUES});
+            INSERT INTO plants_fts(rowid, {COLUMNS}) VALUES (new.id, {NEW_VALUES});
+        END
+    """)
+    # Index plants that already exist
+    op.execute("INSERT INTO plants_fts(plants_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name != 'sqlite':
+        return
+
+    op.execute('DROP TRIGGER IF EXISTS plants_fts_au')
+    op.execute('DROP TRIGGER IF EXISTS plants_fts_ad')
+    op.execute('DROP TRIGGER IF EXISTS plants_fts_ai')
+    op.execute('DROP TABLE IF EXISTS plants_fts')
@@ -0,0 +1,31 @@
+"""Add plant facet indexes
+
+Revision ID: c2f8a6d3e914
+Revises: b7d4e2a91c3f
+Create Date: 2026-10-17 15:02:37.904411
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = 'c2f8a6d3e914'
+down_revision = 'b7d4e2a91c3f'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('plants', schema=None) as batch_op:
+        batch_op.create_index('ix_plants_sun_water_type', ['sun_exposure', 'water_needs', 'plant_type'], unique=False)
+        batch_op.create_index('ix_plants_water_needs', ['water_needs'], unique=False)
+        batch_op.create_index('ix_plants_plant_type', ['plant_type'], unique=False)
+        batch_op.create_index('ix_plants_flags', ['drought_tolerant', 'deer_resistant'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('plants', schema=None) as batch_op:
+        batch_op.drop_index('ix_plants_flags')
+        batch_op.drop_index('ix_plants_plant_type')
+        batch_op.drop_index('ix_plants_water_needs')
+        batch_op.drop_index('ix_plants_sun_water_type')
@@ -0,0 +1,56 @@
+"""Add parsed numeric plant height/spread columns
+
+Revision ID: d4a1e7c35b82
+Revises: c2f8a6d3e914
+Create Date: 2026-10-17 16:11:52.270913
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+from app.blueprints.landscaping.sizes import parse_size_range
+
+
+# revision identifiers, used by Alembic.
+revision = 'd4a1e7c35b82'
+down_revision = 'c2f8a6d3e914'
+branch_labels = None
+depends_on = None
+
+SIZE_COLUMNS = ('height_min_in', 'height_max_in', 'spread_min_in', 'spread_max_in')
+
+
+def upgrade():
+    with op.batch_alter_table('plants', schema=None) as batch_op:
+        for name in SIZE_COLUMNS:
+            batch_op.add_column(sa.Column(name, sa.Float(), nullable=True))
+            batch_op.create_index(batch_op.f(f'ix_plants_{name}'), [name], unique=False)
+
+    # Backfill from the free-text ranges
+    plants = sa.table(
+        'plants',
+        sa.column('id', sa.Integer),
+        sa.column('height_range', sa.String),
+        sa.column('spread_range', sa.String),
+        *(sa.column(name, sa.Float) for name in SIZE_COLUMNS)
+    )
+    conn = op.get_bind()
+    rows = conn.execute(sa.select(plants.c.id, plants.c.height_range, plants.c.spread_range)).all()
+    for plant_id, height_range, spread_range in rows:
+        height_min, height_max = parse_size_range(height_range)
+        spread_min, spread_max = parse_size_range(spread_range)
+        if height_max is None and spread_max is None:
+            continue
+        conn.execute(
+            plants.update().where(plants.c.id == plant_id).values(
+                height_min_in=height_min, height_max_in=height_max,
+                spread_min_in=spread_min, spread_max_in=spread_max
+            )
+        )
+
+
+def downgrade():
+    with op.batch_alter_table('plants', schema=None) as batch_op:
+        for name in reversed(SIZE_COLUMNS):
+            batch_op.drop_index(batch_op.f(f'ix_plants_{name}'))
+            batch_op.drop_column(name)
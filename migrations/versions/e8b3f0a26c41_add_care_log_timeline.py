@@ -0,0 +1,54 @@
+"""Add care log timeline index and plant care summaries
+
+Revision ID: e8b3f0a26c41
+Revises: d4a1e7c35b82
+Create Date: 2026-10-17 17:03:18.640257
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'e8b3f0a26c41'
+down_revision = 'd4a1e7c35b82'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    with op.batch_alter_table('care_logs', schema=None) as batch_op:
+        batch_op.create_index('ix_care_logs_plant_date', ['plant_id', 'log_date', 'id'], unique=False)
+
+    op.create_table('plant_care_summaries',
+    sa.Column('plant_id', sa.Integer(), nullable=False),
+    sa.Column('log_count', sa.Integer(), nullable=False),
+    sa.Column('first_log_date', sa.Date(), nullable=True),
+    sa.Column('last_log_date', sa.Date(), nullable=True),
+    sa.Column('last_watered', sa.Date(), nullable=True),
+    sa.Column('last_pruned', sa.Date(), nullable=True),
+    sa.Column('last_fertilized', sa.Date(), nullable=True),
+    sa.ForeignKeyConstraint(['plant_id'], ['plants.id'], ),
+    sa.PrimaryKeyConstraint('plant_id')
+    )
+
+    # Backfill summaries from existing logs
+    op.execute("""
+        INSERT INTO plant_care_summaries (
+            plant_id, log_count, first_log_date, last_log_date,
+            last_watered, last_pruned, last_fertilized
+        )
+        SELECT
+            plant_id, COUNT(*), MIN(log_date), MAX(log_date),
+            MAX(CASE WHEN lower(activity_type) LIKE 'water%' THEN log_date END),
+            MAX(CASE WHEN lower(activity_type) LIKE 'prun%' THEN log_date END),
+            MAX(CASE WHEN lower(activity_type) LIKE 'fertiliz%' THEN log_date END)
+        FROM care_logs
+        GROUP BY plant_id
+    """)
+
+
+def downgrade():
+    op.drop_table('plant_care_summaries')
+    with op.batch_alter_table('care_logs', schema=None) as batch_op:
+        batch_op.drop_index('ix_care_logs_plant_date')
@@ -70,8 +70,27 @@ pip install -r requirements.txt
 
 # Run database migrations
 FLASK_APP=wsgi.py flask db upgrade
+
+# Build responsive image derivatives (content-hashed, see app/utils/images.py)
+FLASK_APP=wsgi.py flask images build
 USEREOF
 
+# Rotate the app log outside the app: every gunicorn worker appends to the
+# same file and reopens it after rotation (WatchedFileHandler)
+cat > /etc/logrotate.d/powers-land << 'LOGROTATEEOF'
+/var/www/powers-land/logs/*.log {
+    su powers-land www-data
+    daily
+    maxsize 10M
+    rotate 10
+    missingok
+    notifempty
+    compress
+    delaycompress
+    create 0640 powers-land www-data
+}
+LOGROTATEEOF
+
 # Create Gunicorn systemd service
 cat > /etc/systemd/system/powers-land.service << 'EOF'
 [Unit]
@@ -85,7 +104,11 @@ WorkingDirectory=/var/www/powers-land
 Environment="PATH=/var/www/powers-land/venv/bin"
 EnvironmentFile=/var/www/powers-land/.env
 RuntimeDirectory=powers-land
-ExecStart=/var/www/powers-land/venv/bin/gunicorn --workers 3 --bind unix:/run/powers-land/powers-land.sock --umask 007 wsgi:application
+# Start each boot with fresh per-worker metrics snapshots
+ExecStartPre=/bin/rm -rf /var/www/powers-land/instance/metrics
+# Live bracket streams hold a thread each; SOTY_STREAM_MAX_PER_WORKER (3) keeps
+# at least 5 of each worker's 8 threads free for regular requests
+ExecStart=/var/www/powers-land/venv/bin/gunicorn --workers 3 --worker-class gthread --threads 8 --bind unix:/run/powers-land/powers-land.sock --umask 007 wsgi:application
 
 [Install]
 WantedBy=multi-user.target
@@ -103,6 +126,27 @@ server {
         proxy_set_header X-Real-IP $remote_addr;
         proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
         proxy_set_header X-Forwarded-Proto $scheme;
+        proxy_set_header X-Request-ID $request_id;
+    }
+
+    # Live bracket updates (Server-Sent Events): no buffering, long-lived
+    location /soty/bracket/stream {
+        proxy_pass http://unix:/run/powers-land/powers-land.sock;
+        proxy_set_header Host $host;
+        proxy_set_header X-Real-IP $remote_addr;
+        proxy_set_header X-Forwarded-For $proxy_add_x_forwarded_for;
+        proxy_set_header X-Forwarded-Proto $scheme;
+        proxy_set_header X-Request-ID $request_id;
+        proxy_http_version 1.1;
+        proxy_set_header Connection '';
+        proxy_buffering off;
+        proxy_read_timeout 330s;
+    }
+
+    # Content-hashed image derivatives never change under the same name
+    location /static/images/derived {
+        alias /var/www/powers-land/app/static/images/derived;
+        add_header Cache-Control "public, max-age=31536000, immutable";
     }
 
     location /static {
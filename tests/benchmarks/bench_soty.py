@@ -0,0 +1,267 @@
+#!/usr/bin/env python3
+"""
+SOTY tournament load benchmark
+
+Seeds N songs and M users into a temporary SQLite database, builds the
+bracket through SOTYTournamentService, then drives the real routes with
+concurrent Flask test clients (one per user):
+
+    bracket       GET  /soty/bracket            every user, before voting
+    vote          POST /soty/vote               every user x every Round 1 matchup
+    vote_batch    POST /soty/vote/batch         every user re-submits the round
+    bracket_voted GET  /soty/bracket            every user, after voting
+    finalize      POST /soty/admin/round/<id>/finalize
+
+Per endpoint it records p50/p95/max latency, SQL statements per request,
+errors and throughput, and writes the results as JSON so runs can be
+compared before and after a change.
+
+Usage (from the repo root):
+    python -m tests.benchmarks.bench_soty --songs 128 --users 40 --workers 8 --output bench.json
+"""
+import argparse
+import json
+import os
+import random
+import shutil
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from sqlalchemy import event
+
+from app import create_app, db
+from config import config, TestingConfig
+
+
+class Recorder:
+    """Collects per-request latency and SQL statement counts by endpoint"""
+
+    def __init__(self):
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self.samples = {}
+        self.wall_seconds = {}
+
+    def before_cursor_execute(self, *args):
+        self._local.queries = getattr(self._local, 'queries', 0) + 1
+
+    def timed(self, endpoint, fn):
+        """Run fn() and record its latency, statement count and success"""
+        self._local.queries = 0
+        started = time.perf_counter()
+        try:
+            ok = fn()
+        except Exception:
+            ok = False
+        elapsed = time.perf_counter() - started
+        with self._lock:
+            self.samples.setdefault(endpoint, []).append((elapsed, self._local.queries, ok))
+
+    def phase(self, endpoint, jobs, workers):
+        """Run jobs (callables) on a thread pool and record the phase's wall time"""
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            list(pool.map(lambda job: job(), jobs))
+        self.wall_seconds[endpoint] = self.wall_seconds.get(endpoint, 0) + time.perf_counter() - started
+
+    def summary(self):
+        results = {}
+        for endpoint, samples in self.samples.items():
+            latencies = sorted(s[0] for s in samples)
+            queries = [s[1] for s in samples]
+            wall = self.wall_seconds.get(endpoint)
+            results[endpoint] = {
+                'requests': len(samples),
+                'errors': sum(1 for s in samples if not s[2]),
+                'p50_ms': round(percentile(latencies, 50) * 1000, 2),
+                'p95_ms': round(percentile(latencies, 95) * 1000, 2),
+                'max_ms': round(latencies[-1] * 1000, 2),
+                'mean_queries': round(statistics.mean(queries), 2),
+                'max_queries': max(queries),
+                'throughput_rps': round(len(samples) / wall, 1) if wall else None,
+            }
+        return results
+
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, -(-pct * len(sorted_values) // 100))
+    return sorted_values[int(rank) - 1]
+
+
+def make_users(count):
+    return [
+        {
+            'user_id': user_id,
+            'admin': user_id == 1,
+            'first_name': f'User{user_id}',
+            'last_name': 'Bench',
+            'account_segment': f'{user_id:04d}',
+            'can_vote': True,
+            'music_service': 'spotify',
+        }
+        for user_id in range(1, count + 1)
+    ]
+
+
+def make_songs(count, submitters):
+    return [
+        {
+            'submitter_id': (i % submitters) + 1,
+            'spotify_track_id': f'bench{i:05d}',
+            'apple_music_id': f'apple{i:05d}',
+            'title': f'Song {i}',
+            'artist': f'Artist {i % 97}',
+            'popularity': random.randint(0, 100),
+        }
+        for i in range(count)
+    ]
+
+
+def run_benchmark(songs=64, users=20, workers=8, seed=0):
+    """
+    Run the full scenario in a throwaway database.
+
+    Returns:
+        Dict with the run parameters, setup timings and per-endpoint results
+    """
+    from app.blueprints.soty import services
+    from app.blueprints.soty.models import Matchup, Round
+
+    random.seed(seed)
+    tmp_dir = tempfile.mkdtemp(prefix='soty-bench-')
+    users_file = os.path.join(tmp_dir, 'users.json')
+    with open(users_file, 'w') as f:
+        json.dump(make_users(users), f)
+
+    config['benchmark'] = type('BenchmarkConfig', (TestingConfig,), {
+        'SQLALCHEMY_DATABASE_URI': 'sqlite:///' + os.path.join(tmp_dir, 'bench.db'),
+        'RATELIMIT_ENABLED': False,
+    })
+    original_users_file = services.user_directory.users_file
+    services.user_directory.users_file = users_file
+    recorder = Recorder()
+
+    try:
+        app = create_app('benchmark')
+        with app.app_context():
+            db.create_all()
+            event.listen(db.engine, 'before_cursor_execute', recorder.before_cursor_execute)
+
+            # Setup: load catalog and build the bracket through the service
+            started = time.perf_counter()
+            services.load_songs_into_db(make_songs(songs, submitters=users))
+            load_seconds = time.perf_counter() - started
+
+            started = time.perf_counter()
+            seeded = services.SOTYTournamentService.seed_songs()
+            services.SOTYTournamentService.generate_rounds()
+            services.SOTYTournamentService.generate_matchups(seeded)
+            round_1 = Round.query.filter_by(round_number=1).one()
+            round_1.status = 'active'
+            round_1.start_date = int(time.time())
+            round_1.end_date = int(time.time() + 3600)
+            db.session.commit()
+            build_seconds = time.perf_counter() - started
+
+            round_id = round_1.id
+            matchups = [(m.id, m.song1_id, m.song2_id) for m in Matchup.query.filter_by(round_id=round_id)]
+            db.session.remove()
+
+            clients = {}
+            for user_id in range(1, users + 1):
+                client = app.test_client()
+                with client.session_transaction() as sess:
+                    sess['user_id'] = user_id
+                clients[user_id] = client
+
+            def view_bracket(endpoint):
+                return [
+                    lambda c=client: recorder.timed(endpoint, lambda: c.get('/soty/bracket').status_code == 200)
+                    for client in clients.values()
+                ]
+
+            def post_vote(client, matchup_id, song_id):
+                response = client.post('/soty/vote', data={'matchup_id': matchup_id, 'song_id': song_id})
+                return response.status_code == 200
+
+            def post_batch(client, votes):
+                response = client.post('/soty/vote/batch', json={'round_id': round_id, 'votes': votes})
+                return response.status_code == 200
+
+            recorder.phase('bracket', view_bracket('bracket'), workers)
+
+            vote_jobs = [
+                lambda c=client, m=matchup: recorder.timed(
+                    'vote', lambda: post_vote(c, m[0], random.choice(m[1:]))
+                )
+                for client in clients.values()
+                for matchup in matchups
+            ]
+            random.shuffle(vote_jobs)
+            recorder.phase('vote', vote_jobs, workers)
+
+            batch_jobs = [
+                lambda c=client: recorder.timed('vote_batch', lambda: post_batch(c, [
+                    {'matchup_id': m[0], 'song_id': random.choice(m[1:])} for m in matchups
+                ]))
+                for client in clients.values()
+            ]
+            recorder.phase('vote_batch', batch_jobs, workers)
+
+            recorder.phase('bracket_voted', view_bracket('bracket_voted'), workers)
+
+            admin = clients[1]
+            recorder.phase('finalize', [lambda: recorder.timed(
+                'finalize', lambda: admin.post(f'/soty/admin/round/{round_id}/finalize').status_code == 302
+            )], 1)
+
+            event.remove(db.engine, 'before_cursor_execute', recorder.before_cursor_execute)
+            db.session.remove()
+            db.engine.dispose()
+    finally:
+        services.user_directory.users_file = original_users_file
+        config.pop('benchmark', None)
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+    return {
+        'params': {'songs': songs, 'users': users, 'workers': workers, 'seed': seed},
+        'python': sys.version.split()[0],
+        'setup': {
+            'load_songs_ms': round(load_seconds * 1000, 2),
+            'build_bracket_ms': round(build_seconds * 1000, 2),
+            'round_1_matchups': len(matchups),
+        },
+        'endpoints': recorder.summary(),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='SOTY tournament load benchmark')
+    parser.add_argument('--songs', type=int, default=64, help='Songs in the bracket')
+    parser.add_argument('--users', type=int, default=20, help='Voting users')
+    parser.add_argument('--workers', type=int, default=8, help='Concurrent client threads')
+    parser.add_argument('--seed', type=int, default=0, help='Random seed for popularity and votes')
+    parser.add_argument('--output', help='Write JSON results here (default: stdout)')
+    args = parser.parse_args(argv)
+
+    results = run_benchmark(songs=args.songs, users=args.users, workers=args.workers, seed=args.seed)
+    results['timestamp'] = int(time.time())
+
+    output = json.dumps(results, indent=2)
+    if args.output:
+        with open(args.output, 'w') as f:
+            f.write(output + '\n')
+        print(f"Wrote results to {args.output}")
+    else:
+        print(output)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,22 @@
+import json
+from tests.benchmarks import bench_soty
+
+
+def test_benchmark_smoke(tmp_path):
+    output = tmp_path / 'bench.json'
+    bench_soty.main(['--songs', '8', '--users', '3', '--workers', '2', '--output', str(output)])
+
+    results = json.loads(output.read_text())
+    assert results['setup']['round_1_matchups'] == 4
+    endpoints = results['endpoints']
+    assert set(endpoints) == {'bracket', 'vote', 'vote_batch', 'bracket_voted', 'finalize'}
+    assert endpoints['vote']['requests'] == 12
+    assert all(e['errors'] == 0 for e in endpoints.values())
+    assert endpoints['bracket']['p95_ms'] >= endpoints['bracket']['p50_ms'] > 0
+
+
+def test_percentile_nearest_rank():
+    values = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10]
+    assert bench_soty.percentile(values, 50) == 5
+    assert bench_soty.percentile(values, 95) == 10
+    assert bench_soty.percentile([], 50) == 0.0
@@ -0,0 +1,58 @@
+import logging
+from app import db
+from app.blueprints.soty.models import Song
+from app.utils.instrumentation import RequestQueryStats
+
+
+def add_songs(count):
+    for i in range(count):
+        db.session.add(Song(submitter_id=1, spotify_track_id=f't{i}', title=f'Song {i}', artist='Artist'))
+    db.session.commit()
+
+
+def test_server_timing_header_reports_queries(app, client, caplog):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 1
+
+    with caplog.at_level(logging.INFO, logger='app.utils.instrumentation'):
+        response = client.get('/soty/bracket')
+
+    timing = response.headers['Server-Timing']
+    assert timing.startswith('db;dur=')
+    assert 'queries"' in timing and 'app;dur=' in timing
+
+    record = next(r for r in caplog.records if 'GET /soty/bracket' in r.getMessage())
+    assert record.db_queries > 0
+    assert f'db_queries={record.db_queries}' in record.getMessage()
+
+
+def test_repeated_statement_logs_nplus1_warning(app, client, caplog):
+    add_songs(4)
+    app.config['SQL_NPLUS1_THRESHOLD'] = 3
+
+    def per_row_lookups():
+        ids = [song.id for song in Song.query.all()]
+        return ','.join(db.session.get(Song, song_id, populate_existing=True).title for song_id in ids)
+    app.add_url_rule('/_test/n-plus-1', 'n_plus_1', per_row_lookups)
+
+    with caplog.at_level(logging.WARNING, logger='app.utils.instrumentation'):
+        response = client.get('/_test/n-plus-1')
+
+    assert response.status_code == 200
+    warnings = [r.getMessage() for r in caplog.records if r.levelno == logging.WARNING]
+    assert any('Possible N+1 in n_plus_1: statement ran 4x' in w for w in warnings)
+
+
+def test_no_stats_outside_requests(app):
+    add_songs(2)
+    assert Song.query.count() == 2  # listeners are no-ops without a request
+
+
+def test_stats_keep_only_the_slowest_statements():
+    stats = RequestQueryStats(slowest_kept=2)
+    for seconds, statement in [(0.1, 'a'), (0.5, 'b'), (0.2, 'c'), (0.05, 'a')]:
+        stats.record(statement, seconds)
+
+    assert stats.count == 4
+    assert [s for _, s in stats.slowest_statements()] == ['b', 'c']
+    assert stats.repeated_statements(2) == [('a', 2)]
@@ -0,0 +1,413 @@
+import pytest
+from datetime import date, timedelta
+from app import db
+from app.blueprints.landscaping.models import CareLog, Plant, PlantCareSummary
+from sqlalchemy import event
+from app.blueprints.landscaping.services import (
+    care_log_timeline, care_summary, facet_cache, facet_counts, filter_plants_by_criteria, fts_query,
+    search_plants
+)
+
+
+def add_plants():
+    plants = [
+        Plant(common_name="Turk's Cap", scientific_name='Malvaviscus arboreus', bloom_color='Red',
+              wildlife_value='Hummingbirds and butterflies', care_instructions='Prune in late winter'),
+        Plant(common_name='Red Yucca', scientific_name='Hesperaloe parviflora', bloom_color='Coral red',
+              wildlife_value='Hummingbirds', care_instructions='Remove spent bloom stalks'),
+        Plant(common_name='Inland Sea Oats', scientific_name='Chasmanthium latifolium',
+              notes='Spreads in shade; good under live oaks'),
+        Plant(common_name='Mealy Blue Sage', scientific_name='Salvia farinacea', bloom_color='Blue',
+              notes='Red flowers nearby make a nice contrast'),
+    ]
+    db.session.add_all(plants)
+    db.session.commit()
+    return plants
+
+
+@pytest.mark.parametrize('query, expected', [
+    ('turks cap', '"turks" "cap"*'),
+    ('red OR "x" NEAR(', '"red" "OR" "x" "NEAR"*'),
+    ('  ', None),
+])
+def test_fts_query_quotes_terms(query, expected):
+    assert fts_query(query) == expected
+
+
+def test_search_ranks_name_and_trait_matches_first(app):
+    add_plants()
+    results = search_plants('red')
+
+    names = [p.common_name for p in results.items]
+    # Name/bloom color matches outrank a mention in the notes
+    assert names[-1] == 'Mealy Blue Sage'
+    assert set(names[:2]) == {"Turk's Cap", 'Red Yucca'}
+
+
+def test_search_uses_stemming_and_prefixes(app):
+    add_plants()
+    assert {p.common_name for p in search_plants('hummingbird').items} == {"Turk's Cap", 'Red Yucca'}
+    assert [p.common_name for p in search_plants('malvav').items] == ["Turk's Cap"]
+
+
+def test_index_follows_updates_and_deletes(app):
+    turks_cap, red_yucca, *_ = add_plants()
+    turks_cap.wildlife_value = 'Bees'
+    db.session.delete(red_yucca)
+    db.session.commit()
+
+    assert search_plants('hummingbird').total == 0
+    assert [p.common_name for p in search_plants('bees').items] == ["Turk's Cap"]
+
+
+def test_empty_query_lists_all_plants_paginated(app):
+    add_plants()
+    page = search_plants('', page=2, per_page=3)
+    assert page.total == 4
+    assert [p.common_name for p in page.items] == ["Turk's Cap"]
+
+
+def test_plants_page(app, client):
+    add_plants()
+    response = client.get('/landscaping/plants?q=hummingbirds')
+    assert response.status_code == 200
+    assert b'2 results for' in response.data
+    assert b'Red Yucca' in response.data
+    assert b'Inland Sea Oats' not in response.data
+
+    response = client.get('/landscaping/plants?q=%22unbalanced')
+    assert response.status_code == 200
+
+
+def add_faceted_plants():
+    plants = [
+        Plant(common_name='Blackfoot Daisy', sun_exposure='Full Sun', water_needs='Low', plant_type='Perennial',
+              drought_tolerant=True, deer_resistant=True),
+        Plant(common_name='Cedar Sage', sun_exposure='Shade', water_needs='Low', plant_type='Perennial',
+              drought_tolerant=True, deer_resistant=False),
+        Plant(common_name='Texas Mountain Laurel', sun_exposure='Full Sun', water_needs='Low', plant_type='Shrub',
+              drought_tolerant=True, deer_resistant=True),
+        Plant(common_name='Cardinal Flower', sun_exposure='Part Shade', water_needs='High', plant_type='Perennial',
+              drought_tolerant=False, deer_resistant=False),
+    ]
+    db.session.add_all(plants)
+    db.session.commit()
+    return plants
+
+
+def test_filter_plants_by_criteria(app):
+    add_faceted_plants()
+
+    page = filter_plants_by_criteria(sun_exposure=['Full Sun', 'Shade'], plant_type='Perennial')
+    assert [p.common_name for p in page.items] == ['Blackfoot Daisy', 'Cedar Sage']
+
+    page = filter_plants_by_criteria(water_needs='Low', deer_resistant=True)
+    assert [p.common_name for p in page.items] == ['Blackfoot Daisy', 'Texas Mountain Laurel']
+
+    page = filter_plants_by_criteria(query='laurel', water_needs='Low')
+    assert [p.common_name for p in page.items] == ['Texas Mountain Laurel']
+
+
+def test_facet_counts_ignore_their_own_filter(app):
+    add_faceted_plants()
+    counts = facet_counts(sun_exposure=['Full Sun'])
+
+    # Other sun options stay countable while Full Sun is selected...
+    assert counts['sun_exposure'] == {'Full Sun': 2, 'Part Shade': 1, 'Shade': 1}
+    # ...while the other facets are narrowed to full-sun plants
+    assert counts['plant_type'] == {'Perennial': 1, 'Shrub': 1}
+    assert counts['water_needs'] == {'Low': 2}
+    assert counts['drought_tolerant'] == 2
+    assert counts['deer_resistant'] == 2
+
+
+def test_facet_counts_use_one_statement_and_cache(app):
+    add_faceted_plants()
+    statements = []
+
+    def count_statement(*args):
+        statements.append(args[2])
+
+    event.listen(db.engine, 'before_cursor_execute', count_statement)
+    try:
+        first = facet_counts(water_needs='Low')
+        assert len(statements) == 1
+        assert facet_counts(water_needs=['Low']) == first
+        assert len(statements) == 1
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', count_statement)
+
+
+def test_facet_cache_invalidated_by_plant_writes(app):
+    plants = add_faceted_plants()
+    assert facet_counts()['plant_type'] == {'Perennial': 3, 'Shrub': 1}
+
+    generation = facet_cache.generation
+    plants[0].plant_type = 'Groundcover'
+    db.session.commit()
+    assert facet_cache.generation > generation
+    assert facet_counts()['plant_type'] == {'Groundcover': 1, 'Perennial': 2, 'Shrub': 1}
+
+    db.session.execute(db.delete(Plant).where(Plant.plant_type == 'Shrub'))
+    db.session.commit()
+    assert facet_counts()['plant_type'] == {'Groundcover': 1, 'Perennial': 2}
+
+
+def test_facet_cache_waits_for_commit(app):
+    plants = add_faceted_plants()
+    assert facet_counts()['plant_type'] == {'Perennial': 3, 'Shrub': 1}
+
+    generation = facet_cache.generation
+    plants[0].plant_type = 'Groundcover'
+    db.session.flush()
+    assert facet_cache.generation == generation
+    # This session sees its own flushed change, but doesn't cache it...
+    assert facet_counts()['plant_type'] == {'Groundcover': 1, 'Perennial': 2, 'Shrub': 1}
+
+    # ...so rolling back leaves the cache with committed counts only
+    db.session.rollback()
+    assert facet_cache.generation == generation
+    assert facet_counts()['plant_type'] == {'Perennial': 3, 'Shrub': 1}
+
+
+def test_plants_page_with_filters(app, client):
+    add_faceted_plants()
+    response = client.get('/landscaping/plants?water_needs=Low&deer_resistant=1')
+    assert response.status_code == 200
+    assert b'2 plants' in response.data
+    assert b'Cardinal Flower' not in response.data
+    assert b'name="deer_resistant" value="1" checked' in response.data
+
+    # Pagination links carry the current filters
+    app.config['PLANTS_PER_PAGE'] = 1
+    response = client.get('/landscaping/plants?water_needs=Low&deer_resistant=1')
+    assert b'page=2&amp;water_needs=Low&amp;deer_resistant=1' in response.data
+
+
+def add_sized_plants():
+    plants = [
+        Plant(common_name='Horseherb', height_range='4-6 in', spread_range='2-3 ft'),
+        Plant(common_name='Lindheimer Muhly', height_range='3-5 ft', spread_range='3-4 ft'),
+        Plant(common_name='Gregg Dalea', height_range='1 ft', spread_range='3-4 ft'),
+        Plant(common_name='Mystery Seedling', height_range='Varies'),
+    ]
+    db.session.add_all(plants)
+    db.session.commit()
+    return plants
+
+
+def test_size_columns_follow_range_strings(app):
+    horseherb, *_ = add_sized_plants()
+    assert (horseherb.height_min_in, horseherb.height_max_in) == (4.0, 6.0)
+
+    horseherb.height_range = '6-12 in'
+    db.session.commit()
+    assert (horseherb.height_min_in, horseherb.height_max_in) == (6.0, 12.0)
+
+
+def test_bulk_updates_reparse_size_columns(app):
+    horseherb, muhly, dalea, _ = add_sized_plants()
+
+    db.session.execute(db.update(Plant).where(Plant.common_name == 'Horseherb').values(height_range='1-2 ft'))
+    db.session.execute(db.update(Plant), [{'id': muhly.id, 'spread_range': '18 in'}])
+    db.session.commit()
+
+    assert (horseherb.height_min_in, horseherb.height_max_in) == (12.0, 24.0)
+    assert (muhly.spread_min_in, muhly.spread_max_in) == (18.0, 18.0)
+    assert (dalea.height_min_in, dalea.height_max_in) == (12.0, 12.0)  # untouched
+    page = filter_plants_by_criteria(max_spread=24)
+    assert [p.common_name for p in page.items] == ['Lindheimer Muhly']
+
+
+def test_filter_plants_by_size(app):
+    add_sized_plants()
+
+    page = filter_plants_by_criteria(max_height=36)
+    assert [p.common_name for p in page.items] == ['Gregg Dalea', 'Horseherb']
+
+    page = filter_plants_by_criteria(min_height=12, max_spread=48)
+    assert [p.common_name for p in page.items] == ['Gregg Dalea', 'Lindheimer Muhly']
+
+    assert facet_counts(max_height=36)['drought_tolerant'] == 0
+    with pytest.raises(ValueError):
+        filter_plants_by_criteria(max_height='short')
+
+
+def test_plants_page_size_filters_in_feet(app, client):
+    add_sized_plants()
+    response = client.get('/landscaping/plants?max_height=3')
+    assert response.status_code == 200
+    assert b'2 plants' in response.data
+    assert b'Lindheimer Muhly' not in response.data
+    assert b'name="max_height" min="0" step="0.5"' in response.data
+
+    # Non-numeric input is ignored rather than an error
+    response = client.get('/landscaping/plants?max_height=tall')
+    assert response.status_code == 200
+    assert b'4 plants' in response.data
+
+
+def add_care_logs(plant, count, start=date(2024, 1, 1)):
+    activities = ['Watering', 'Pruning', 'Fertilizing', 'Mulching']
+    logs = [
+        CareLog(plant=plant, log_date=start + timedelta(days=i // 2), activity_type=activities[i % 4])
+        for i in range(count)
+    ]
+    db.session.add_all(logs)
+    db.session.commit()
+    return logs
+
+
+def test_care_log_timeline_keyset_pages(app):
+    plant = Plant(common_name='Turk\'s Cap')
+    other = Plant(common_name='Red Yucca')
+    db.session.add_all([plant, other])
+    logs = add_care_logs(plant, 7)
+    add_care_logs(other, 3)
+
+    expected = sorted(logs, key=lambda log: (log.log_date, log.id), reverse=True)
+    seen, cursor = [], None
+    while True:
+        page, cursor = care_log_timeline(plant.id, cursor=cursor, limit=3)
+        seen.extend(page)
+        if cursor is None:
+            break
+    assert [log.id for log in seen] == [log.id for log in expected]
+
+    # Two logs share each date, so the id tiebreaker matters at page edges
+    page, cursor = care_log_timeline(plant.id, limit=7)
+    assert len(page) == 7 and cursor is None
+
+    with pytest.raises(ValueError):
+        care_log_timeline(plant.id, cursor='yesterday')
+
+
+def test_care_summary_tracks_log_writes(app):
+    plant = Plant(common_name='Cedar Sage')
+    db.session.add(plant)
+    logs = add_care_logs(plant, 4)
+
+    summary = care_summary(plant.id)
+    assert summary.log_count == 4
+    assert (summary.last_watered, summary.last_pruned) == (date(2024, 1, 1), date(2024, 1, 1))
+    assert summary.last_fertilized == date(2024, 1, 2)
+
+    logs[0].log_date = date(2024, 6, 1)
+    db.session.delete(logs[1])
+    db.session.commit()
+    db.session.expire_all()
+    summary = care_summary(plant.id)
+    assert summary.log_count == 3
+    assert summary.last_watered == date(2024, 6, 1)
+    assert summary.last_pruned is None
+
+    # Bulk statements skip the flush but still refresh summaries
+    db.session.execute(db.delete(CareLog).where(CareLog.plant_id == plant.id))
+    db.session.commit()
+    assert care_summary(plant.id) is None
+
+
+def test_bulk_care_log_writes_refresh_only_affected_plants(app):
+    plant, other = Plant(common_name='Cedar Sage'), Plant(common_name='Red Yucca')
+    db.session.add_all([plant, other])
+    add_care_logs(plant, 4)
+    add_care_logs(other, 2)
+
+    # Mark the other plant's summary: a full rebuild would overwrite it
+    db.session.execute(db.update(PlantCareSummary.__table__).where(
+        PlantCareSummary.plant_id == other.id).values(log_count=99))
+    db.session.execute(db.insert(CareLog), [{'plant_id': plant.id, 'log_date': date(2024, 7, 1),
+                                             'activity_type': 'Watering'}])
+    db.session.execute(db.update(CareLog).where(CareLog.plant_id == plant.id, CareLog.activity_type == 'Pruning')
+                       .values(activity_type='Mulching'))
+    db.session.commit()
+    db.session.expire_all()
+
+    summary = care_summary(plant.id)
+    assert summary.log_count == 5
+    assert summary.last_watered == date(2024, 7, 1)
+    assert summary.last_pruned is None
+    assert care_summary(other.id).log_count == 99
+
+
+def test_bulk_update_moving_a_log_refreshes_both_plants(app):
+    plant, other = Plant(common_name='Cedar Sage'), Plant(common_name='Red Yucca')
+    db.session.add_all([plant, other])
+    add_care_logs(plant, 3)
+    add_care_logs(other, 2)
+    watering = db.session.scalars(db.select(CareLog).where(
+        CareLog.plant_id == plant.id, CareLog.activity_type == 'Watering')).first()
+
+    # Plant id set through .values() and a WHERE that doesn't mention plant_id
+    db.session.execute(db.update(CareLog).where(CareLog.id == watering.id).values(plant_id=other.id))
+    db.session.commit()
+    db.session.expire_all()
+
+    assert care_summary(plant.id).log_count == 2
+    assert care_summary(plant.id).last_watered is None
+    assert care_summary(other.id).log_count == 3
+    assert care_summary(other.id).last_watered == watering.log_date
+
+
+def test_bulk_update_with_sql_expression_refreshes_every_plant(app):
+    plant, other = Plant(common_name='Cedar Sage'), Plant(common_name='Red Yucca')
+    db.session.add_all([plant, other])
+    add_care_logs(plant, 3)
+    db.session.flush()
+
+    # The new plant_id is only known to the database
+    db.session.execute(db.update(CareLog).where(CareLog.plant_id == plant.id)
+                       .values(plant_id=CareLog.plant_id + (other.id - plant.id)))
+    db.session.commit()
+
+    assert care_summary(plant.id) is None
+    assert care_summary(other.id).log_count == 3
+
+
+def test_deleting_plant_removes_its_care_logs(app):
+    plant, other, bulk = (Plant(common_name=name) for name in ('Cedar Sage', 'Red Yucca', 'Inland Sea Oats'))
+    db.session.add_all([plant, other, bulk])
+    for p in (plant, other, bulk):
+        add_care_logs(p, 3)
+
+    db.session.delete(plant)
+    db.session.execute(db.delete(Plant).where(Plant.id == bulk.id))
+    db.session.commit()
+
+    assert {log.plant_id for log in db.session.scalars(db.select(CareLog))} == {other.id}
+    assert [s.plant_id for s in db.session.scalars(db.select(PlantCareSummary))] == [other.id]
+
+
+def test_care_logs_api(app, client):
+    plant = Plant(common_name='Gregg Dalea')
+    db.session.add(plant)
+    add_care_logs(plant, 5)
+
+    response = client.get(f'/landscaping/api/plants/{plant.id}/care-logs?limit=3')
+    data = response.get_json()
+    assert response.status_code == 200
+    assert data['summary']['log_count'] == 5
+    assert [log['log_date'] for log in data['logs']] == ['2024-01-03', '2024-01-02', '2024-01-02']
+
+    response = client.get(f'/landscaping/api/plants/{plant.id}/care-logs?cursor={data["next_cursor"]}')
+    data = response.get_json()
+    assert len(data['logs']) == 2
+    assert data['next_cursor'] is None
+
+    response = client.get(f'/landscaping/api/plants/{plant.id}/care-logs?cursor=bogus')
+    assert response.status_code == 400
+    assert client.get('/landscaping/api/plants/999/care-logs').status_code == 404
+
+
+def test_care_timeline_page(app, client):
+    plant = Plant(common_name='Mexican Feathergrass')
+    db.session.add(plant)
+    add_care_logs(plant, 3)
+    app.config['CARE_LOGS_PER_PAGE'] = 2
+
+    response = client.get(f'/landscaping/plants/{plant.id}/care')
+    assert response.status_code == 200
+    assert b'Mexican Feathergrass' in response.data
+    assert b'Last Watered' in response.data
+    assert b'Older Entries' in response.data
+    assert client.get(f'/landscaping/plants/{plant.id}/care?cursor=bad').status_code == 400
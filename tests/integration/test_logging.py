@@ -0,0 +1,74 @@
+import json
+import logging
+import pytest
+from app.utils.log import JsonFormatter, start_queue_logging
+
+
+@pytest.fixture
+def log_file(app, tmp_path):
+    app.config.update(LOG_DIR=str(tmp_path))
+    listener = start_queue_logging(app)
+    yield tmp_path / app.config['LOG_FILE']
+    app.logger.removeHandler(app.extensions['log_handler'])
+    listener.stop()
+
+
+def read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_request_log_lines_are_json_with_request_context(app, client, log_file):
+    with client.session_transaction() as sess:
+        sess['user_id'] = 3
+
+    response = client.get('/soty/bracket', headers={'X-Request-ID': 'req-123'})
+    assert response.headers['X-Request-ID'] == 'req-123'
+    app.extensions['log_listener'].stop()  # flush the queue
+
+    entry = next(e for e in read_lines(log_file) if e['message'].startswith('GET /soty/bracket'))
+    assert entry['request_id'] == 'req-123'
+    assert entry['user_id'] == 3
+    assert entry['endpoint'] == 'soty.bracket'
+    assert entry['status'] == 200
+    assert entry['duration_ms'] >= entry['db_ms'] >= 0
+    assert entry['level'] == 'INFO'
+
+
+def test_request_id_is_generated_when_missing(client):
+    first = client.get('/').headers['X-Request-ID']
+    second = client.get('/').headers['X-Request-ID']
+    assert first and second and first != second
+
+
+def test_exceptions_are_kept_out_of_the_message(app, log_file):
+    try:
+        raise RuntimeError('boom')
+    except RuntimeError:
+        app.logger.exception('failed %s', 'job')
+    app.extensions['log_listener'].stop()
+
+    entry = read_lines(log_file)[-1]
+    assert entry['message'] == 'failed job'
+    assert 'RuntimeError: boom' in entry['exception']
+
+
+def test_log_file_is_reopened_after_external_rotation(app, log_file):
+    app.logger.info('before rotation')
+    app.extensions['log_listener'].stop()
+    log_file.rename(log_file.with_name(log_file.name + '.1'))  # what logrotate does
+
+    app.extensions['log_listener'].start()
+    app.logger.info('after rotation')
+    app.extensions['log_listener'].stop()
+
+    assert [e['message'] for e in read_lines(log_file)] == ['after rotation']
+    assert read_lines(log_file.with_name(log_file.name + '.1'))[-1]['message'] == 'before rotation'
+
+
+def test_json_formatter_includes_extra_fields():
+    record = logging.makeLogRecord({'name': 'x', 'levelname': 'WARNING', 'msg': 'hi %s', 'args': ('there',)})
+    record.duration_ms = 12.5
+    entry = json.loads(JsonFormatter().format(record))
+    assert entry['message'] == 'hi there'
+    assert entry['duration_ms'] == 12.5
+    assert 'request_id' not in entry
@@ -0,0 +1,71 @@
+import pytest
+from app.utils import metrics
+from app.utils.metrics import MetricsRegistry
+
+
+@pytest.fixture(autouse=True)
+def fresh_registry():
+    metrics.registry.reset()
+    yield
+    metrics.registry.reset()
+
+
+def login(client, user_id):
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+
+
+def test_metrics_requires_admin_or_token(app, client):
+    assert client.get('/metrics').status_code == 403
+
+    login(client, 2)  # not an admin
+    assert client.get('/metrics').status_code == 403
+
+    app.config['METRICS_TOKEN'] = 'scrape-token'
+    response = client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+    assert response.status_code == 200
+    assert response.mimetype == 'text/plain'
+
+
+def test_metrics_report_requests_db_time_and_cache(client):
+    login(client, 1)
+    client.get('/soty/')
+    etag = client.get('/soty/').headers['ETag']
+    client.get('/soty/', headers={'If-None-Match': etag})
+
+    body = client.get('/metrics').get_data(as_text=True)
+
+    assert '# TYPE http_request_duration_seconds histogram' in body
+    assert 'http_request_duration_seconds_count{blueprint="soty",endpoint="soty.index",method="GET"} 3' in body
+    assert 'http_requests_total{blueprint="soty",endpoint="soty.index",status="304"} 1' in body
+    assert 'db_queries_total{endpoint="soty.index"}' in body
+    assert 'cache_requests_total{cache="etag_index",result="hit"} 1' in body
+    assert 'cache_requests_total{cache="etag_index",result="miss"} 2' in body
+
+
+def test_snapshots_are_summed_across_workers(tmp_path):
+    worker_a, worker_b = MetricsRegistry(), MetricsRegistry()
+    for worker in (worker_a, worker_b):
+        worker.directory = str(tmp_path)
+        worker.counter('votes_total', 'Votes', ['outcome'])
+        worker.histogram('latency_seconds', 'Latency', buckets=(0.1, 1.0))
+
+    worker_a.metrics['votes_total'].inc(outcome='inserted')
+    worker_a.metrics['latency_seconds'].observe(0.05)
+    # Simulate another process by writing its snapshot under a different pid
+    worker_b.metrics['votes_total'].inc(2, outcome='inserted')
+    worker_b.metrics['latency_seconds'].observe(0.5)
+    worker_b._snapshot_path = lambda pid=None: str(tmp_path / '99999.json')
+    worker_b.flush(force=True)
+
+    body = worker_a.exposition()
+    assert 'votes_total{outcome="inserted"} 3' in body
+    assert 'latency_seconds_bucket{le="0.1"} 1' in body
+    assert 'latency_seconds_bucket{le="1"} 2' in body
+    assert 'latency_seconds_bucket{le="+Inf"} 2' in body
+    assert 'latency_seconds_count 2' in body
+
+
+def test_unknown_labels_are_rejected():
+    with pytest.raises(ValueError):
+        metrics.VOTES.inc(result='inserted')
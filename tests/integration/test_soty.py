@@ -0,0 +1,380 @@
+import time
+import pytest
+from sqlalchemy import event
+from app import db
+from app.blueprints.soty.models import Song, Round, Matchup, Vote
+from app.blueprints.soty.services import (
+    SOTYTournamentService, build_bracket_view, load_users, load_songs_into_db, reconcile_vote_tallies,
+    submit_round_votes, live_bracket_snapshot, diff_bracket_snapshots, stream_slots, bump_data_version,
+    get_data_version
+)
+
+
+def create_songs(count):
+    """Add `count` songs with distinct popularity and submitters"""
+    songs = []
+    for i in range(count):
+        song = Song(
+            submitter_id=(i % 10) + 1,
+            spotify_track_id=f'track{i:04d}',
+            apple_music_id=f'apple{i:04d}',
+            title=f'Song {i}',
+            artist=f'Artist {i}',
+            popularity=i
+        )
+        db.session.add(song)
+        songs.append(song)
+    db.session.commit()
+    return songs
+
+
+def build_tournament(song_count):
+    """Seed songs, generate rounds and activate Round 1"""
+    create_songs(song_count)
+    seeded = SOTYTournamentService.seed_songs()
+    SOTYTournamentService.generate_rounds()
+    SOTYTournamentService.generate_matchups(seeded)
+    round_1 = Round.query.filter_by(round_number=1).first()
+    round_1.status = 'active'
+    round_1.start_date = int(time.time())
+    round_1.end_date = int(time.time() + 3600)
+    db.session.commit()
+    return round_1
+
+
+def login(client, user_id=1):
+    with client.session_transaction() as sess:
+        sess['user_id'] = user_id
+
+
+def count_queries(fn):
+    """Run fn and return (result, number of SQL statements executed)"""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.engine, 'before_cursor_execute', before_cursor_execute)
+    try:
+        result = fn()
+    finally:
+        event.remove(db.engine, 'before_cursor_execute', before_cursor_execute)
+    return result, len(statements)
+
+
+def song_entry(i, **overrides):
+    entry = {
+        'submitter_id': (i % 10) + 1,
+        'spotify_track_id': f'track{i:04d}',
+        'apple_music_id': f'apple{i:04d}',
+        'title': f'Song {i}',
+        'artist': f'Artist {i}',
+        'popularity': i,
+    }
+    entry.update(overrides)
+    return entry
+
+
+def test_load_songs_is_idempotent_and_updates_changes(app):
+    entries = [song_entry(i) for i in range(25)]
+    assert load_songs_into_db(entries, chunk_size=10) == {'inserted': 25, 'updated': 0, 'unchanged': 0}
+
+    entries[3] = song_entry(3, title='Renamed')
+    entries.append(song_entry(25))
+    counts, queries = count_queries(lambda: load_songs_into_db(entries, chunk_size=10))
+
+    assert counts == {'inserted': 1, 'updated': 1, 'unchanged': 24}
+    assert Song.query.count() == 26
+    assert Song.query.filter_by(spotify_track_id='track0003').one().title == 'Renamed'
+    # One SELECT, one INSERT and one UPDATE batch plus the data version bump
+    assert queries <= 5
+
+
+def test_load_songs_defaults_to_configured_season(app):
+    counts = load_songs_into_db()
+    assert counts['inserted'] == Song.query.count() > 0
+
+    with pytest.raises(ValueError, match='No song catalog'):
+        load_songs_into_db(season='1999')
+
+
+def test_bracket_requires_login(client):
+    response = client.get('/soty/bracket')
+    assert response.status_code == 302
+
+
+def test_bracket_page_renders(app, client):
+    build_tournament(12)
+    login(client)
+    response = client.get('/soty/bracket')
+    assert response.status_code == 200
+    assert b'Byes - Advancing to Round 2' in response.data
+
+
+def test_bracket_view_tallies_and_user_vote(app):
+    round_1 = build_tournament(8)
+    matchup = Matchup.query.filter_by(round_id=round_1.id).first()
+    db.session.add_all([
+        Vote(user_id=1, matchup_id=matchup.id, song_id=matchup.song1_id),
+        Vote(user_id=2, matchup_id=matchup.id, song_id=matchup.song1_id),
+        Vote(user_id=3, matchup_id=matchup.id, song_id=matchup.song2_id),
+    ])
+    db.session.commit()
+    reconcile_vote_tallies()
+
+    users = load_users()
+    rounds_data = build_bracket_view(users[1], users)
+    m = next(m for m in rounds_data[0]['matchups'] if m['matchup'].id == matchup.id)
+
+    assert m['song1_votes'] == 2
+    assert m['song2_votes'] == 1
+    assert m['user_vote'] == matchup.song1_id
+    assert rounds_data[0]['is_voting_open']
+    assert len(rounds_data[0]['unfinished_voters']) == len(users)
+
+
+@pytest.mark.parametrize('song_count', [8, 64])
+def test_bracket_view_query_count_is_constant(app, song_count):
+    build_tournament(song_count)
+    users = load_users()
+    _, queries = count_queries(lambda: build_bracket_view(users[1], users))
+    assert queries <= 8
+
+
+def test_vote_updates_stored_tallies(app, client):
+    round_1 = build_tournament(8)
+    matchup = Matchup.query.filter_by(round_id=round_1.id).first()
+    matchup_id, song1_id, song2_id = matchup.id, matchup.song1_id, matchup.song2_id
+    login(client, user_id=2)
+
+    response = client.post('/soty/vote', data={'matchup_id': matchup_id, 'song_id': song1_id})
+    assert response.get_json()['message'] == 'Vote recorded'
+    matchup = db.session.get(Matchup, matchup_id)
+    assert (matchup.song1_votes, matchup.song2_votes) == (1, 0)
+
+    response = client.post('/soty/vote', data={'matchup_id': matchup_id, 'song_id': song2_id})
+    assert response.get_json()['message'] == 'Vote updated'
+    db.session.refresh(matchup)
+    assert (matchup.song1_votes, matchup.song2_votes) == (0, 1)
+
+
+def test_reconcile_tallies_command(app, runner):
+    round_1 = build_tournament(8)
+    matchup = Matchup.query.filter_by(round_id=round_1.id).first()
+    db.session.add(Vote(user_id=1, matchup_id=matchup.id, song_id=matchup.song2_id))
+    matchup.song1_votes = 5
+    db.session.commit()
+
+    result = runner.invoke(args=['soty', 'reconcile-tallies'])
+    assert '1 matchup(s) corrected' in result.output
+    db.session.refresh(matchup)
+    assert (matchup.song1_votes, matchup.song2_votes) == (0, 1)
+
+
+def test_batch_vote_records_whole_round(app, client):
+    round_1 = build_tournament(8)
+    matchups = Matchup.query.filter_by(round_id=round_1.id).all()
+    login(client, user_id=3)
+
+    votes = [{'matchup_id': m.id, 'song_id': m.song1_id} for m in matchups]
+    response = client.post('/soty/vote/batch', json={'round_id': round_1.id, 'votes': votes})
+    assert response.get_json() == {'success': True, 'recorded': 4, 'updated': 0, 'unchanged': 0}
+
+    votes[0]['song_id'] = matchups[0].song2_id
+    response = client.post('/soty/vote/batch', json={'round_id': round_1.id, 'votes': votes})
+    assert response.get_json() == {'success': True, 'recorded': 0, 'updated': 1, 'unchanged': 3}
+
+    assert Vote.query.filter_by(user_id=3).count() == 4
+    db.session.refresh(matchups[0])
+    assert (matchups[0].song1_votes, matchups[0].song2_votes) == (0, 1)
+
+
+def test_batch_vote_rejects_closed_round(app, client):
+    round_1 = build_tournament(8)
+    round_1.end_date = int(time.time()) - 1
+    db.session.commit()
+    matchup = Matchup.query.filter_by(round_id=round_1.id).first()
+    login(client, user_id=3)
+
+    response = client.post('/soty/vote/batch', json={
+        'round_id': round_1.id,
+        'votes': [{'matchup_id': matchup.id, 'song_id': matchup.song1_id}]
+    })
+    assert response.status_code == 400
+    assert response.get_json()['error'] == 'Voting deadline passed'
+    assert Vote.query.count() == 0
+
+
+def test_repeat_vote_is_left_alone(app, client):
+    round_1 = build_tournament(8)
+    matchup = Matchup.query.filter_by(round_id=round_1.id).first()
+    matchup_id, song1_id = matchup.id, matchup.song1_id
+    login(client, user_id=4)
+
+    client.post('/soty/vote', data={'matchup_id': matchup_id, 'song_id': song1_id})
+    response = client.post('/soty/vote', data={'matchup_id': matchup_id, 'song_id': song1_id})
+    assert response.get_json()['message'] == 'Vote already recorded'
+
+    vote = Vote.query.filter_by(user_id=4, matchup_id=matchup_id).one()
+    assert vote.is_vote_changed is False
+    assert db.session.get(Matchup, matchup_id).song1_votes == 1
+
+
+def test_vote_unknown_matchup_returns_404(app, client):
+    build_tournament(8)
+    login(client)
+    response = client.post('/soty/vote', data={'matchup_id': 9999, 'song_id': 1})
+    assert response.status_code == 404
+
+
+def test_bracket_stream_pushes_voter_changes(app, client):
+    round_1 = build_tournament(8)
+    users = load_users()
+    before = live_bracket_snapshot(users)
+
+    matchups = Matchup.query.filter_by(round_id=round_1.id).all()
+    submit_round_votes(2, round_1.id, [(m.id, m.song1_id) for m in matchups])
+    after = live_bracket_snapshot(users)
+
+    events = diff_bracket_snapshots(before, after)
+    assert [event for event, _ in events] == ['voters']
+    assert 'Andrew R.' in events[0][1]['finished']
+    assert 'tallies' not in after  # Vote counts are never streamed
+
+
+def test_bracket_stream_endpoint(app, client):
+    app.config['SOTY_STREAM_MAX_SECONDS'] = 0
+    build_tournament(8)
+    login(client)
+    response = client.get('/soty/bracket/stream')
+    assert response.mimetype == 'text/event-stream'
+    assert response.get_data(as_text=True).startswith('retry: 2000')
+    response.close()
+
+
+def test_bracket_stream_rejects_clients_over_worker_cap(app, client):
+    app.config['SOTY_STREAM_MAX_SECONDS'] = 0
+    build_tournament(8)
+    login(client)
+
+    app.config['SOTY_STREAM_MAX_PER_WORKER'] = 0
+    response = client.get('/soty/bracket/stream')
+    assert response.status_code == 503
+    assert response.headers['Retry-After'] == '30'
+
+    # Closed streams give their slot back
+    app.config['SOTY_STREAM_MAX_PER_WORKER'] = 1
+    for _ in range(2):
+        response = client.get('/soty/bracket/stream')
+        assert response.status_code == 200
+        response.close()  # What the WSGI server does when the stream ends
+    assert stream_slots.active == 0
+
+
+def test_bracket_conditional_get_returns_304_until_data_changes(app, client):
+    round_1 = build_tournament(8)
+    login(client, user_id=2)
+
+    first = client.get('/soty/bracket')
+    etag = first.headers['ETag']
+    assert first.status_code == 200
+
+    cached = client.get('/soty/bracket', headers={'If-None-Match': etag})
+    assert cached.status_code == 304
+
+    matchup = Matchup.query.filter_by(round_id=round_1.id).first()
+    client.post('/soty/vote', data={'matchup_id': matchup.id, 'song_id': matchup.song1_id})
+
+    fresh = client.get('/soty/bracket', headers={'If-None-Match': etag})
+    assert fresh.status_code == 200
+    assert fresh.headers['ETag'] != etag
+
+
+def test_bracket_etag_changes_with_csrf_token(app, client):
+    build_tournament(8)
+    login(client, user_id=2)
+    etag = client.get('/soty/bracket').headers['ETag']
+    assert client.get('/soty/bracket', headers={'If-None-Match': etag}).status_code == 304
+
+    # Same user, new session (logged out and back in): the cached page's token is stale
+    with client.session_transaction() as sess:
+        sess.clear()
+        sess['user_id'] = 2
+    response = client.get('/soty/bracket', headers={'If-None-Match': etag})
+    assert response.status_code == 200
+    assert response.headers['ETag'] != etag
+
+
+def test_bump_data_version_creates_then_increments(app):
+    assert get_data_version() == 0
+    bump_data_version()
+    bump_data_version()
+    db.session.commit()
+    assert get_data_version() == 2
+
+
+def test_index_etag_varies_by_user(app, client):
+    anonymous_etag = client.get('/soty/').headers['ETag']
+    login(client, user_id=2)
+    assert client.get('/soty/', headers={'If-None-Match': anonymous_etag}).status_code == 200
+
+
+def test_finalize_round_advances_winners(app, client):
+    round_1 = build_tournament(8)
+    matchups = Matchup.query.filter_by(round_id=round_1.id).order_by(Matchup.position_in_round).all()
+    winners = [m.song1_id for m in matchups]
+    losers = [m.song2_id for m in matchups]
+    for user_id in (1, 2):
+        submit_round_votes(user_id, round_1.id, [(m.id, m.song1_id) for m in matchups])
+
+    login(client)
+    response = client.post(f'/soty/admin/round/{round_1.id}/finalize')
+    assert response.status_code == 302
+
+    round_1 = db.session.get(Round, round_1.id)
+    assert round_1.status == 'completed'
+    assert all(db.session.get(Matchup, m.id).winner_song_id == m.song1_id for m in matchups)
+    assert all(not db.session.get(Song, song_id).is_alive for song_id in losers)
+    assert all(db.session.get(Song, song_id).max_round_reached == 1 for song_id in winners)
+
+    round_2 = Round.query.filter_by(round_number=2).first()
+    assert round_2.status == 'active'
+    assert round_2.matchups.count() == 2
+
+
+def test_finalize_round_is_one_transaction(app):
+    round_1 = build_tournament(8)
+    matchups = Matchup.query.filter_by(round_id=round_1.id).all()
+    submit_round_votes(1, round_1.id, [(m.id, m.song1_id) for m in matchups])
+
+    result = SOTYTournamentService.finalize_round(round_1)
+    assert result['status'] == 'completed'
+    db.session.rollback()  # e.g. the route failed before its commit
+
+    # Nothing was committed halfway: round 1 is still open, round 2 empty
+    assert db.session.get(Round, round_1.id).status == 'active'
+    assert Matchup.query.filter(Matchup.round_id != round_1.id).count() == 0
+    assert all(m.winner_song_id is None for m in Matchup.query.filter_by(round_id=round_1.id))
+
+
+def test_finalize_round_with_tie_enters_tiebreaker(app, client):
+    round_1 = build_tournament(8)
+    matchups = Matchup.query.filter_by(round_id=round_1.id).order_by(Matchup.position_in_round).all()
+    tied = matchups[0]
+    submit_round_votes(1, round_1.id, [(m.id, m.song1_id) for m in matchups])
+    submit_round_votes(2, round_1.id, [(tied.id, tied.song2_id)])
+    login(client)
+
+    client.post(f'/soty/admin/round/{round_1.id}/finalize')
+    assert db.session.get(Round, round_1.id).status == 'tiebreaker'
+    assert db.session.get(Matchup, tied.id).is_tied
+
+    # Unresolved ties block completion
+    client.post(f'/soty/admin/round/{round_1.id}/finalize')
+    assert db.session.get(Round, round_1.id).status == 'tiebreaker'
+
+    client.post(f'/soty/admin/matchup/{tied.id}/resolve-tie', data={'song_id': tied.song2_id})
+    client.post(f'/soty/admin/round/{round_1.id}/finalize')
+    assert db.session.get(Round, round_1.id).status == 'completed'
+    assert not db.session.get(Song, tied.song1_id).is_alive
+    assert Round.query.filter_by(round_number=2).first().status == 'active'
@@ -0,0 +1,108 @@
+import random
+import pytest
+from app.blueprints.soty import bracket_engine
+from app.blueprints.soty.bracket_engine import SongRecord, MatchupRecord
+
+
+def make_songs(count, submitters=10):
+    return [SongRecord(i + 1, (i % submitters) + 1, popularity=i, order_key=i) for i in range(count)]
+
+
+@pytest.mark.parametrize('count, size, byes, rounds', [
+    (2, 2, 0, 1),
+    (3, 4, 1, 2),
+    (30, 32, 2, 5),
+    (64, 64, 0, 6),
+    (100, 128, 28, 7),
+])
+def test_bracket_shape(count, size, byes, rounds):
+    assert bracket_engine.bracket_size(count) == size
+    assert bracket_engine.num_byes(count) == byes
+    assert bracket_engine.num_rounds(count) == rounds
+
+
+def test_round_names():
+    names = [bracket_engine.round_name(n, 5) for n in range(1, 6)]
+    assert names == ['Round of 32', 'Round of 16', 'Quarterfinals', 'Semifinals', 'Finals']
+
+
+def test_seed_orders_by_popularity_with_null_last():
+    songs = [
+        SongRecord(1, 1, popularity=None, order_key=0),
+        SongRecord(2, 2, popularity=40, order_key=1),
+        SongRecord(3, 3, popularity=10, order_key=2),
+        SongRecord(4, 4, popularity=40, order_key=0),
+    ]
+    seeded = bracket_engine.seed(songs)
+    assert [s.id for s in seeded] == [3, 4, 2, 1]
+    assert [s.seed for s in seeded] == [1, 2, 3, 4]
+
+
+def test_first_round_gives_byes_to_best_seeds():
+    seeded = bracket_engine.seed(make_songs(6))
+    bye_songs, matchups, report = bracket_engine.first_round(seeded)
+
+    assert report.conflicts_before == 0
+    assert [s.seed for s in bye_songs] == [1, 2]
+    assert [(m.song1.seed, m.song2.seed) for m in matchups] == [(3, 4), (5, 6)]
+
+
+def test_second_round_puts_byes_before_round_1_winners():
+    seeded = bracket_engine.seed(make_songs(6))
+    bye_songs, matchups, _ = bracket_engine.first_round(seeded)
+    winners = [m.song2 for m in matchups]
+
+    round_2, _ = bracket_engine.second_round(bye_songs, winners)
+    assert [(m.song1.seed, m.song2.seed) for m in round_2] == [(1, 2), (4, 6)]
+
+
+def test_diversity_optimizer_clears_a_run_of_conflicts():
+    # Three neighboring same-submitter pairs: no single adjacent swap helps
+    # the middle pair, but swapping across the run clears all of them
+    songs = [SongRecord(i, submitter) for i, submitter in enumerate([1, 1, 2, 2, 3, 3, 4, 5])]
+    pairs = bracket_engine.pair_consecutive(songs)
+
+    optimized, report = bracket_engine.optimize_for_submitter_diversity(pairs)
+
+    assert (report.conflicts_before, report.conflicts_after) == (3, 0)
+    assert report.conflicts_removed == 3
+    assert sorted(s.id for pair in optimized for s in pair) == list(range(8))
+    assert [s.id for s in pairs[0]] == [0, 1]
+
+
+def test_diversity_optimizer_respects_max_distance():
+    # The only usable partner for the first pair sits two positions away
+    songs = [SongRecord(i, submitter) for i, submitter in enumerate([1, 1, 1, 2, 3, 4])]
+    pairs = bracket_engine.pair_consecutive(songs)
+
+    _, near = bracket_engine.optimize_for_submitter_diversity(pairs, max_distance=1)
+    _, far = bracket_engine.optimize_for_submitter_diversity(pairs, max_distance=2)
+
+    assert near.conflicts_after == 1
+    assert far.conflicts_after == 0
+
+
+def test_pick_winner_breaks_ties_by_seed():
+    better, worse = SongRecord(1, 1, seed=3), SongRecord(2, 2, seed=7)
+    matchup = MatchupRecord(0, worse, better)
+    assert bracket_engine.pick_winner(matchup, 2, 1) is worse
+    assert bracket_engine.pick_winner(matchup, 1, 1) is better
+
+
+def test_simulate_plays_to_a_single_champion():
+    random.seed(7)
+    rounds = bracket_engine.simulate(make_songs(30))
+
+    assert len(rounds) == 5
+    assert [len(r) for r in rounds] == [14, 8, 4, 2, 1]
+    assert rounds[-1][0].winner is not None
+
+
+def test_simulate_10k_entrants():
+    songs = make_songs(10_000, submitters=50)
+    rounds = bracket_engine.simulate(songs, decide=lambda m: m.song1)
+
+    assert len(rounds) == bracket_engine.num_rounds(10_000)
+    # Single elimination: every entrant but the champion loses exactly once
+    assert sum(len(r) for r in rounds) == 10_000 - 1
+    assert rounds[-1][0].winner.seed == 1
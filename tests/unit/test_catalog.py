@@ -0,0 +1,51 @@
+import json
+import pytest
+from app.blueprints.soty import catalog
+
+
+def entry(i, **overrides):
+    data = {'submitter_id': 1, 'spotify_track_id': f't{i}', 'title': f'Song {i}', 'artist': 'Artist'}
+    data.update(overrides)
+    return data
+
+
+def write_season(directory, season, lines):
+    path = directory / f'songs_{season}.jsonl'
+    path.write_text(''.join(line if isinstance(line, str) else json.dumps(line) + '\n' for line in lines))
+    return path
+
+
+def test_shipped_catalog_is_valid():
+    seasons = catalog.available_seasons()
+    assert '2025' in seasons
+    songs = catalog.load_catalog('2025')
+    assert len(songs) == 30
+
+
+def test_seasons_are_listed_and_loaded_separately(tmp_path):
+    write_season(tmp_path, '2024', [entry(1)])
+    write_season(tmp_path, '2025', [entry(2), '\n', entry(3)])
+    (tmp_path / 'notes.txt').write_text('ignored')
+
+    assert catalog.available_seasons(str(tmp_path)) == ['2024', '2025']
+    assert [s['spotify_track_id'] for s in catalog.iter_catalog('2025', str(tmp_path))] == ['t2', 't3']
+
+
+@pytest.mark.parametrize('bad_line, message', [
+    ('{not json\n', 'songs_2025.jsonl:2'),
+    (entry(2, title=None), 'missing title'),
+    (entry(2, submitter_id='7'), 'submitter_id must be int'),
+    (entry(2, popularity='high'), 'popularity must be int'),
+    (entry(1), 'duplicate track t1'),
+])
+def test_invalid_entries_report_line_number(tmp_path, bad_line, message):
+    write_season(tmp_path, '2025', [entry(1), bad_line])
+    with pytest.raises(ValueError, match=message):
+        catalog.load_catalog('2025', str(tmp_path))
+
+
+def test_unknown_or_malformed_season(tmp_path):
+    with pytest.raises(ValueError, match='No song catalog'):
+        catalog.load_catalog('1999', str(tmp_path))
+    with pytest.raises(ValueError, match='Invalid season'):
+        catalog.catalog_path('../etc')
@@ -0,0 +1,8 @@
+from app import db
+
+
+def test_sqlite_pragmas_applied_to_connections(app):
+    with db.engine.connect() as conn:
+        assert conn.exec_driver_sql('PRAGMA synchronous').scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql('PRAGMA busy_timeout').scalar() == 5000
+        assert conn.exec_driver_sql('PRAGMA temp_store').scalar() == 2  # MEMORY
@@ -0,0 +1,95 @@
+import json
+import pytest
+from PIL import Image
+from app.utils import images
+
+
+@pytest.fixture
+def static_dir(tmp_path):
+    (tmp_path / 'images').mkdir()
+    Image.new('RGB', (800, 400), 'green').save(tmp_path / 'images' / 'photo.jpeg')
+    Image.new('RGBA', (300, 300), (0, 0, 0, 0)).save(tmp_path / 'images' / 'logo.png')
+    return tmp_path
+
+
+def test_target_widths_never_upscale():
+    assert images._target_widths(800, (320, 640, 960)) == [320, 640, 800]
+    assert images._target_widths(2400, (320, 640, 960)) == [320, 640, 960]
+    assert images._target_widths(100, (320, 640)) == [100]
+
+
+def test_build_derivatives(static_dir):
+    sources = images.find_sources(static_dir, ['images/**/*.jpeg', 'images/**/*.png'])
+    assert sources == ['images/logo.png', 'images/photo.jpeg']
+
+    manifest = images.build_derivatives(
+        static_dir, sources, widths=(320, 640), formats=['webp'], log=lambda msg: None
+    )
+    photo = manifest['images/photo.jpeg']
+    assert (photo['width'], photo['height'], photo['fallback']) == (800, 400, 'jpeg')
+    assert [v['width'] for v in photo['variants']['webp']] == [320, 640]
+    assert manifest['images/logo.png']['fallback'] == 'png'  # keeps transparency
+
+    with Image.open(static_dir / photo['variants']['jpeg'][0]['file']) as derived:
+        assert derived.size == (320, 160)
+
+    # Derivatives are never picked up as sources
+    assert images.find_sources(static_dir, ['images/**/*.jpeg']) == ['images/photo.jpeg']
+
+
+def test_rebuild_reuses_names_and_prunes_stale_files(static_dir):
+    build = lambda: images.build_derivatives(
+        static_dir, ['images/photo.jpeg'], widths=(320,), formats=['webp'], log=lambda msg: None
+    )
+    first = build()
+    assert build() == first
+
+    Image.new('RGB', (800, 400), 'red').save(static_dir / 'images' / 'photo.jpeg')
+    second = build()
+    old_file = first['images/photo.jpeg']['variants']['webp'][0]['file']
+    assert second['images/photo.jpeg']['variants']['webp'][0]['file'] != old_file
+
+    assert images.prune_derivatives(static_dir, second) == 2
+    assert not (static_dir / old_file).exists()
+
+
+def test_responsive_image(app, static_dir):
+    manifest = images.build_derivatives(
+        static_dir, ['images/photo.jpeg'], widths=(320, 640), formats=['webp'], log=lambda msg: None
+    )
+    manifest_path = static_dir / 'manifest.json'
+    manifest_path.write_text(json.dumps(manifest))
+    app.extensions['image_manifest'] = images.ImageManifest(str(manifest_path))
+
+    with app.test_request_context():
+        html = images.responsive_image('images/photo.jpeg', alt='A "photo"', sizes='50vw', class_='is-rounded')
+        assert html.startswith('<picture><source type="image/webp"')
+        assert ' 320w, /static/images/derived/photo.640w.' in html
+        assert 'alt="A &#34;photo&#34;"' in html
+        assert 'class="is-rounded"' in html and 'loading="lazy"' in html
+
+        # Not built yet: plain <img> of the original
+        html = images.responsive_image('images/other.png', lazy=False)
+        assert html == '<img src="/static/images/other.png" alt="" decoding="async">'
+
+
+def test_failed_write_leaves_no_partial_file(static_dir, monkeypatch):
+    def broken_replace(src, dst):
+        raise OSError('disk full')
+    monkeypatch.setattr(images.os, 'replace', broken_replace)
+
+    with pytest.raises(OSError):
+        images.build_derivatives(
+            static_dir, ['images/photo.jpeg'], widths=(320,), formats=['webp'], log=lambda msg: None
+        )
+    assert list((static_dir / 'images' / 'derived').iterdir()) == []
+
+
+def test_manifest_being_written_counts_as_not_built(tmp_path):
+    manifest_path = tmp_path / 'manifest.json'
+    manifest_path.write_text('{"images/photo.jpeg": {"wid')
+    manifest = images.ImageManifest(str(manifest_path))
+    assert manifest.get('images/photo.jpeg') is None
+
+    manifest_path.write_text(json.dumps({'images/photo.jpeg': {'width': 800}}))
+    assert manifest.get('images/photo.jpeg') == {'width': 800}
@@ -0,0 +1,33 @@
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import FixedWindowRateLimiter
+from app.utils.ratelimit import SQLiteStorage
+
+
+def test_sqlite_scheme_is_registered(tmp_path):
+    storage = storage_from_string(f"sqlite:///{tmp_path}/limits.db")
+    assert isinstance(storage, SQLiteStorage)
+    assert storage.check()
+
+
+def test_counts_are_shared_between_storage_instances(tmp_path):
+    uri = f"sqlite:///{tmp_path}/limits.db"
+    worker_a = FixedWindowRateLimiter(storage_from_string(uri))
+    worker_b = FixedWindowRateLimiter(storage_from_string(uri))
+    limit = parse("3 per minute")
+
+    assert worker_a.hit(limit, 'login', '127.0.0.1')
+    assert worker_b.hit(limit, 'login', '127.0.0.1')
+    assert worker_a.hit(limit, 'login', '127.0.0.1')
+    assert not worker_b.hit(limit, 'login', '127.0.0.1')
+
+
+def test_clear_and_reset(tmp_path):
+    storage = storage_from_string(f"sqlite:///{tmp_path}/limits.db")
+    storage.incr('a', 60)
+    storage.incr('b', 60, amount=2)
+    assert storage.get('b') == 2
+
+    storage.clear('a')
+    assert storage.get('a') == 0
+    assert storage.reset() == 1
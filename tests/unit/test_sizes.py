@@ -0,0 +1,22 @@
+import pytest
+from app.blueprints.landscaping.sizes import parse_size_range
+
+
+@pytest.mark.parametrize('text, expected', [
+    ('2-3 ft', (24.0, 36.0)),
+    ('2–3 feet', (24.0, 36.0)),
+    ('18 in', (18.0, 18.0)),
+    ('12-18"', (12.0, 18.0)),
+    ("3'", (36.0, 36.0)),
+    ('1 ft - 18 in', (12.0, 18.0)),
+    ('1 to 1.5 ft', (12.0, 18.0)),
+    ('3-2 ft', (24.0, 36.0)),
+    ('up to 4 ft', (0.0, 48.0)),
+    ('30-60 cm', (11.8, 23.6)),
+    ('4-6', (48.0, 72.0)),
+    ('Varies', (None, None)),
+    ('', (None, None)),
+    (None, (None, None)),
+])
+def test_parse_size_range(text, expected):
+    assert parse_size_range(text) == expected
@@ -0,0 +1,182 @@
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+import pytest
+import spotipy
+from app.blueprints.soty.catalog import load_catalog
+from app.blueprints.soty.utilities import spotify_data
+from app.blueprints.soty.utilities.spotify_data import SpotifyCatalogFetcher, RateLimited, spotify_client, with_backoff
+
+
+def fake_track(track_id):
+    return {
+        'id': track_id,
+        'name': f'Title {track_id}',
+        'artists': [{'name': 'Artist A'}, {'name': 'Artist B'}],
+        'album': {'name': 'Album', 'release_date': '2025-01-01', 'images': [{'url': f'https://img/{track_id}'}]},
+        'popularity': 42,
+        'external_ids': {'isrc': f'ISRC{track_id}'},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    """Minimal Spotify tracks + song.link endpoints"""
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status, body, headers=None):
+        payload = json.dumps(body).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(payload)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        server = self.server
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+
+        with server.lock:
+            server.calls.append(url.path.rstrip('/'))
+            throttle = server.throttle_remaining > 0
+            if throttle:
+                server.throttle_remaining -= 1
+        if throttle:
+            status = server.throttle_status
+            return self._send(status, {'error': {'status': status, 'message': 'slow down'}}, server.throttle_headers)
+
+        if url.path.rstrip('/') == '/v1/tracks':
+            ids = query['ids'][0].split(',')
+            server.batch_sizes.append(len(ids))
+            return self._send(200, {'tracks': [None if i == 'missing' else fake_track(i) for i in ids]})
+
+        if url.path == '/links':
+            track_id = query['url'][0].rsplit('/', 1)[-1]
+            platforms = {} if track_id.endswith('0') else {
+                'appleMusic': {'entityUniqueId': f'ITUNES_SONG::am-{track_id}'}
+            }
+            return self._send(200, {'linksByPlatform': platforms})
+
+        self._send(404, {})
+
+
+@pytest.fixture
+def stub_server():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), StubHandler)
+    server.lock = threading.Lock()
+    server.calls = []
+    server.batch_sizes = []
+    server.throttle_remaining = 0
+    server.throttle_status = 429
+    server.throttle_headers = {'Retry-After': '0'}
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def make_fetcher(stub_server, tmp_path):
+    base_url = f'http://127.0.0.1:{stub_server.server_address[1]}'
+
+    def make(**kwargs):
+        spotify = spotify_client(auth='test-token')
+        spotify.prefix = f'{base_url}/v1/'
+        kwargs.setdefault('backoff', 0)
+        return SpotifyCatalogFetcher(
+            spotify=spotify, songlink_url=f'{base_url}/links', cache_dir=str(tmp_path / 'cache'), **kwargs
+        )
+    return make
+
+
+def entries(count):
+    return [{'spotify_track_id': f't{i:03d}', 'submitter_id': (i % 5) + 1} for i in range(count)]
+
+
+def test_build_catalog_batches_spotify_and_maps_fields(stub_server, make_fetcher):
+    songs = make_fetcher().build_catalog(entries(120))
+
+    assert stub_server.batch_sizes == [50, 50, 20]
+    assert len(songs) == 120
+    first, second = songs[0], songs[1]
+    assert first['submitter_id'] == 1
+    assert first['artist'] == 'Artist A, Artist B'
+    assert first['artwork_url'] == 'https://img/t000'
+    assert first['isrc_number'] == 'ISRCt000'
+    assert first['apple_music_id'] == spotify_data.NO_APPLE_MUSIC_ID
+    assert second['apple_music_id'] == 'am-t001'
+
+
+def test_build_catalog_skips_unknown_tracks(make_fetcher):
+    songs = make_fetcher().build_catalog(entries(2) + [{'spotify_track_id': 'missing', 'submitter_id': 1}])
+    assert [s['spotify_track_id'] for s in songs] == ['t000', 't001']
+
+
+def test_second_run_is_served_from_cache(stub_server, make_fetcher):
+    make_fetcher().build_catalog(entries(10))
+    first_run_calls = len(stub_server.calls)
+
+    songs = make_fetcher().build_catalog(entries(10))
+    assert len(songs) == 10
+    assert len(stub_server.calls) == first_run_calls
+
+    make_fetcher(refresh=True).build_catalog(entries(10))
+    assert len(stub_server.calls) == 2 * first_run_calls
+
+
+def test_rate_limited_requests_are_retried(stub_server, make_fetcher):
+    stub_server.throttle_remaining = 3
+    songs = make_fetcher(max_workers=1).build_catalog(entries(3))
+
+    assert len(songs) == 3
+    assert stub_server.calls.count('/v1/tracks') == 4
+
+
+def test_spotify_retry_after_sets_the_wait(stub_server, make_fetcher):
+    stub_server.throttle_remaining = 1
+    stub_server.throttle_headers = {'Retry-After': '2'}
+    delays = []
+    songs = make_fetcher(max_workers=1, backoff=30, sleep=delays.append).build_catalog(entries(1))
+
+    assert len(songs) == 1
+    assert delays == [2.0]
+
+
+def test_spotify_server_error_is_not_a_rate_limit(stub_server, make_fetcher):
+    stub_server.throttle_remaining = 1
+    stub_server.throttle_status = 503
+    stub_server.throttle_headers = {}
+    delays = []
+
+    with pytest.raises(spotipy.SpotifyException) as excinfo:
+        make_fetcher(sleep=delays.append).build_catalog(entries(1))
+    assert excinfo.value.http_status == 503
+    assert delays == []
+    assert stub_server.calls.count('/v1/tracks') == 1
+
+
+def test_with_backoff_honors_retry_after_then_gives_up():
+    delays = []
+
+    def always_limited():
+        raise RateLimited(retry_after=None if len(delays) % 2 else 7)
+
+    with pytest.raises(RateLimited):
+        with_backoff(always_limited, max_retries=3, backoff=0.5, sleep=delays.append)
+    assert delays == [7, 1.0, 7]
+
+
+def test_write_catalog_round_trips(tmp_path):
+    songs = [{'submitter_id': 1, 'spotify_track_id': 't1', 'title': 'Café', 'artist': 'Señor'}]
+    path = tmp_path / 'songs_2025.jsonl'
+
+    spotify_data.write_catalog(songs, str(path))
+
+    assert load_catalog('2025', catalog_dir=str(tmp_path)) == songs
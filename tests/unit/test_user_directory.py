@@ -0,0 +1,83 @@
+import json
+import os
+from app.blueprints.soty.services import UserDirectory
+
+
+def write_users(path, users):
+    path.write_text(json.dumps(users))
+
+
+def test_lookups_by_id_and_pin(tmp_path):
+    users_file = tmp_path / 'users.json'
+    write_users(users_file, [
+        {'user_id': 1, 'first_name': 'Ada', 'last_name': 'Lovelace', 'account_segment': '1111'},
+        {'user_id': 2, 'first_name': 'Alan', 'last_name': 'Turing', 'account_segment': '2222'},
+    ])
+    directory = UserDirectory(str(users_file))
+
+    assert directory.get(1)['first_name'] == 'Ada'
+    assert directory.find_by_pin('2222')['user_id'] == 2
+    assert directory.find_by_pin('9999') is None
+    assert set(directory.users) == {1, 2}
+
+
+def test_reloads_only_when_mtime_changes(tmp_path):
+    users_file = tmp_path / 'users.json'
+    write_users(users_file, [
+        {'user_id': 1, 'first_name': 'Ada', 'last_name': 'Lovelace', 'account_segment': '1111'},
+    ])
+    directory = UserDirectory(str(users_file))
+    first = directory.users
+    assert directory.users is first
+
+    write_users(users_file, [
+        {'user_id': 1, 'first_name': 'Grace', 'last_name': 'Hopper', 'account_segment': '1111'},
+    ])
+    stat = os.stat(users_file)
+    os.utime(users_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    assert directory.get(1)['first_name'] == 'Grace'
+
+
+def test_pin_index_does_not_store_clear_text(tmp_path):
+    users_file = tmp_path / 'users.json'
+    write_users(users_file, [
+        {'user_id': 1, 'first_name': 'Ada', 'last_name': 'Lovelace', 'account_segment': '1111'},
+    ])
+    directory = UserDirectory(str(users_file))
+
+    assert directory.find_by_pin('1111')['user_id'] == 1
+    assert '1111' not in directory._users_by_pin
+    assert 'account_segment' not in directory.get(1)
+    assert 'account_segment' not in directory.find_by_pin('1111')
+    assert directory.find_by_pin(None) is None
+    assert directory.find_by_pin('') is None
+
+
+def test_reload_never_exposes_a_partial_index(tmp_path):
+    users_file = tmp_path / 'users.json'
+    write_users(users_file, [
+        {'user_id': 1, 'first_name': 'Ada', 'last_name': 'Lovelace', 'account_segment': '1111'},
+        {'user_id': 2, 'first_name': 'Alan', 'last_name': 'Turing', 'account_segment': '2222'},
+    ])
+    directory = UserDirectory(str(users_file))
+    directory.users
+
+    write_users(users_file, [
+        {'user_id': 1, 'first_name': 'Grace', 'last_name': 'Hopper', 'account_segment': '1111'},
+        {'user_id': 2, 'first_name': 'Alan', 'last_name': 'Turing', 'account_segment': '2222'},
+    ])
+    stat = os.stat(users_file)
+    os.utime(users_file, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+
+    # What a request thread already past the mtime check sees mid-reload
+    seen = []
+    hash_pin = directory._hash_pin
+
+    def observing_hash_pin(pin):
+        seen.append(set(directory._users))
+        return hash_pin(pin)
+    directory._hash_pin = observing_hash_pin
+
+    assert directory.get(1)['first_name'] == 'Grace'
+    assert seen == [{1, 2}, {1, 2}]